@@ -0,0 +1,145 @@
+import json
+from collections import deque
+from dataclasses import dataclass
+
+
+def _lower(text):
+    """
+    Chữ thường theo từng ký tự: lower() của một ký tự có thể dài hơn 1 code point ('İ' -> 'i̇')
+    nên text được hạ từng ký tự một để còn biết mỗi code point đến từ vị trí nào trong text gốc
+    """
+    return "".join([char.lower() for char in text])
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """Một lần xuất hiện của keyword trong text: text[start:end] == keyword"""
+    keyword: str
+    start: int
+    end: int
+    entry: dict  # group / type / params / description trong keywords.json
+
+    @property
+    def group(self):
+        return self.entry.get("group")
+
+    @property
+    def type(self):
+        return self.entry.get("type")
+
+    @property
+    def params(self):
+        return self.entry.get("params", {})
+
+
+class KeywordMatcher:
+    """
+    Tìm tất cả keyword trong một text bằng automata Aho-Corasick
+    - Xây trie từ tất cả keyword, thêm failure link (BFS), rồi hoàn thiện thành DFA:
+      mỗi trạng thái có sẵn bảng chuyển tiếp đầy đủ nên mỗi ký tự chỉ tốn một lần tra dict
+    - Quét text đúng một lần, không phụ thuộc số lượng keyword
+    - Xây một lần lúc khởi động game rồi dùng lại cho mọi chatbox
+    """
+
+    def __init__(self, keywords: dict, case_sensitive=False):
+        """
+        Args:
+            keywords: dict {keyword: thông tin} (phần "keywords" của Data/keywords.json)
+            case_sensitive: False thì so khớp không phân biệt hoa thường
+        """
+        self.keywords = keywords
+        self.case_sensitive = case_sensitive
+
+        # Trie: goto[state] = {ký tự: state}, state 0 là gốc
+        goto = [{}]
+        self._outputs = [()]  # _outputs[state] = các keyword kết thúc tại state (kể cả qua failure link)
+        self._lengths = {}  # _lengths[keyword] = số code point của keyword sau khi hạ chữ thường
+        for keyword in keywords:
+            word = keyword if case_sensitive else _lower(keyword)
+            if not word:
+                continue
+            self._lengths[keyword] = len(word)
+            state = 0
+            for char in word:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    self._outputs.append(())
+                state = nxt
+            self._outputs[state] += (keyword,)
+
+        # BFS theo độ sâu: fail[s] luôn nông hơn s nên đã được tính xong trước s
+        fail = [0] * len(goto)
+        self._delta = [dict(goto[0])]
+        self._delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Thiếu chuyển tiếp thì đi theo failure link (đã hoàn thiện sẵn ở fail[state])
+            delta = dict(self._delta[fail[state]])
+            for char, nxt in goto[state].items():
+                fail[nxt] = self._delta[fail[state]].get(char, 0)
+                self._outputs[nxt] += self._outputs[fail[nxt]]
+                delta[char] = nxt
+                queue.append(nxt)
+            self._delta[state] = delta
+
+    @classmethod
+    def from_file(cls, path, case_sensitive=False):
+        """Đọc keywords từ file json (dạng {"keywords": {...}}) và xây matcher"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["keywords"], case_sensitive)
+
+    def find_all(self, text):
+        """
+        Tìm mọi lần xuất hiện của các keyword (kể cả chồng lấn nhau), theo thứ tự vị trí kết thúc
+        start / end luôn là vị trí trong text gốc, kể cả khi hạ chữ thường làm thay đổi độ dài
+        """
+        if self.case_sensitive:
+            return self._find_all_exact(text)
+
+        matches = []
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        origins = []  # origins[j] = vị trí trong text gốc của code point thứ j sau khi hạ chữ thường
+        state = 0
+        for i, char in enumerate(text):
+            for lowered in char.lower():
+                state = delta[state].get(lowered, 0)
+                origins.append(i)
+                for keyword in outputs[state]:
+                    start = origins[len(origins) - lengths[keyword]]
+                    matches.append(KeywordMatch(keyword, start, i + 1, self.keywords[keyword]))
+        return matches
+
+    def _find_all_exact(self, text):
+        """find_all khi phân biệt hoa thường: mỗi ký tự đúng một code point nên vị trí tính trực tiếp"""
+        matches = []
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for i, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            for keyword in outputs[state]:
+                matches.append(KeywordMatch(keyword, i + 1 - len(keyword), i + 1, self.keywords[keyword]))
+        return matches
+
+    def find_keywords(self, text):
+        """Các keyword (không trùng lặp) có trong text: {keyword: thông tin}"""
+        return {match.keyword: match.entry for match in self.find_all(text)}
+
+    def contains_any(self, text):
+        """Text có chứa ít nhất một keyword không"""
+        if not self.case_sensitive:
+            text = _lower(text)
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                return True
+        return False
@@ -1,5 +1,4 @@
 import pygame
-import json
 from Codes.Scenes.SceneBase import Scene
 from Codes.Components.Automata.FA import FA
 from Codes.Mechanics.WordGenerator.BannedListGenerator import BannedListGenerator
@@ -34,8 +33,10 @@ class StringAnalyzerScene(Scene):
             self.current_text = self.texts[self.current_text_index]
         self.pattern_pos = (self.screen_width // 2, self.screen_height - 120)
 
-        # keywords
-        self.keywords = self.load_keywords("Data/keywords.json")["keywords"]
+        # keywords: dùng matcher đã xây sẵn lúc khởi động game, tìm keyword cho mọi text trong một lượt
+        self.keyword_matcher = self.game.keyword_matcher
+        self.keywords = self.keyword_matcher.keywords
+        self.text_keywords = [self.keyword_matcher.find_all(text) for text in self.texts]
 
         # Init Timer
         self.timer = Timer(duration=10.0, auto_start=False)
@@ -194,9 +195,11 @@ class StringAnalyzerScene(Scene):
         # Border
         pygame.draw.rect(screen, DARK_ORANGE, (bar_x, bar_y, bar_width, bar_height), 2)
 
-    def load_keywords(self, path):
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def current_keywords(self):
+        """Các keyword xuất hiện trong text hiện tại (KeywordMatch: keyword, vị trí, group/type/params)"""
+        if self.is_out_of_texts():
+            return []
+        return self.text_keywords[self.current_text_index]
     
     def on_timer_timeout(self):
         '''Callback khi hết giờ'''
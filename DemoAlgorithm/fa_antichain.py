@@ -0,0 +1,266 @@
+"""
+FA Antichain - Kiểm tra bao hàm L(A) ⊆ L(B) và tính phổ quát L(A) = Σ* trực tiếp trên NFA
+Không xác định hóa toàn bộ: chỉ khám phá các cặp (trạng thái của A, tập trạng thái của B)
+và loại bỏ những cặp bị "bao phủ" (subsumption) bởi một cặp đã có - tập các cặp được giữ lại
+là một antichain. Quan hệ mô phỏng (simulation) giúp loại bỏ được nhiều cặp hơn so với
+chỉ so sánh tập con (De Wulf et al. 2006, Abdulla et al. 2010)
+
+Khi kiểm tra thất bại, trả về một chuỗi phản ví dụ (chuỗi thuộc L(A) nhưng không thuộc L(B))
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fa_models import CompiledNFA, DFA, NFA, EpsilonNFA
+
+
+def as_compiled_nfa(fa) -> CompiledNFA:
+    """Đưa NFA, ε-NFA, DFA (hoặc CompiledNFA) về dạng bitset không có ε"""
+    if isinstance(fa, CompiledNFA):
+        return fa
+    if isinstance(fa, (NFA, EpsilonNFA)):
+        return fa.compile()
+    if isinstance(fa, DFA):
+        return CompiledNFA.from_automaton(fa)
+    raise TypeError(f"Cannot check inclusion on {type(fa).__name__}")
+
+
+class AntichainChecker:
+    """Kiểm tra bao hàm / phổ quát / tương đương của NFA bằng antichain + mô phỏng"""
+
+    @staticmethod
+    def simulation(compiled: CompiledNFA) -> List[int]:
+        """
+        Quan hệ mô phỏng thuận lớn nhất: sim[q] = bitmask các trạng thái r mô phỏng q
+        (r chấp nhận nếu q chấp nhận, và mọi bước q -a-> q' đều có r -a-> r' với r' mô phỏng q')
+        Khi đó L(q) ⊆ L(r)
+        """
+        n = compiled.num_states
+        full = (1 << n) - 1
+        accept = compiled.accept_mask
+        sim = [full & (accept if accept >> q & 1 else full) for q in range(n)]
+
+        changed = True
+        while changed:
+            changed = False
+            for q in range(n):
+                candidates = sim[q]
+                remaining = candidates
+                while remaining:
+                    low = remaining & -remaining
+                    r = low.bit_length() - 1
+                    remaining ^= low
+                    for row in compiled.successors:
+                        targets = row[q]
+                        r_targets = row[r]
+                        simulated = True
+                        while targets:
+                            target_low = targets & -targets
+                            if not r_targets & sim[target_low.bit_length() - 1]:
+                                simulated = False
+                                break
+                            targets ^= target_low
+                        if not simulated:
+                            candidates &= ~low
+                            break
+                if candidates != sim[q]:
+                    sim[q] = candidates
+                    changed = True
+        return sim
+
+    @staticmethod
+    def _covered(small: int, large: int, sim: List[int]) -> bool:
+        """Mọi trạng thái của small đều được mô phỏng bởi một trạng thái trong large"""
+        rest = small & ~large
+        while rest:
+            low = rest & -rest
+            if not sim[low.bit_length() - 1] & large:
+                return False
+            rest ^= low
+        return True
+
+    @staticmethod
+    def _post(mask: int, row) -> int:
+        next_mask = 0
+        while mask:
+            low = mask & -mask
+            next_mask |= row[low.bit_length() - 1]
+            mask ^= low
+        return next_mask
+
+    @staticmethod
+    def _joint_columns(a: CompiledNFA, b: CompiledNFA) -> List[Tuple[str, int, int]]:
+        """Các lớp ký tự chung của A và B: (ký tự đại diện, cột của A, cột của B); -1 = không có"""
+        columns = {}
+        for symbol in sorted(set(a.symbol_index) | set(b.symbol_index)):
+            key = (a.symbol_index.get(symbol, -1), b.symbol_index.get(symbol, -1))
+            columns.setdefault(key, symbol)
+        return [(symbol, ca, cb) for (ca, cb), symbol in columns.items()]
+
+    @staticmethod
+    def _word(nodes: List[tuple], node: int, last: str = "") -> str:
+        """Dựng lại chuỗi phản ví dụ theo con trỏ cha"""
+        symbols = [last] if last else []
+        while node >= 0:
+            _, _, parent, symbol = nodes[node]
+            if symbol:
+                symbols.append(symbol)
+            node = parent
+        return "".join(reversed(symbols))
+
+    @staticmethod
+    def inclusion_counterexample(a, b) -> Optional[str]:
+        """
+        Tìm chuỗi thuộc L(A) nhưng không thuộc L(B)
+
+        Returns:
+            Chuỗi phản ví dụ (ngắn nhất theo BFS trên các cặp được giữ lại), hoặc None nếu L(A) ⊆ L(B)
+        """
+        a = as_compiled_nfa(a)
+        b = as_compiled_nfa(b)
+        sim_a = AntichainChecker.simulation(a)
+        sim_b = AntichainChecker.simulation(b)
+        # simulated_by[p] = các trạng thái q mà p mô phỏng (p ∈ sim_a[q])
+        simulated_by = [0] * a.num_states
+        for q, mask in enumerate(sim_a):
+            while mask:
+                low = mask & -mask
+                simulated_by[low.bit_length() - 1] |= 1 << q
+                mask ^= low
+
+        columns = AntichainChecker._joint_columns(a, b)
+        accept_a, accept_b = a.accept_mask, b.accept_mask
+        covered = AntichainChecker._covered
+
+        # nodes[i] = (p, S, cha, ký tự); antichain[p] = các nút còn sống có thành phần A là p
+        nodes: List[tuple] = []
+        alive: List[bool] = []
+        antichain: Dict[int, List[int]] = {}
+        queue = deque()
+
+        def subsumed(p: int, mask: int) -> bool:
+            candidates = sim_a[p]
+            while candidates:
+                low = candidates & -candidates
+                candidates ^= low
+                for node in antichain.get(low.bit_length() - 1, ()):
+                    if covered(nodes[node][1], mask, sim_b):
+                        return True
+            return False
+
+        def add(p: int, mask: int, parent: int, symbol: str):
+            # Loại bỏ các nút cũ bị nút mới bao phủ
+            weaker = simulated_by[p]
+            while weaker:
+                low = weaker & -weaker
+                weaker ^= low
+                q = low.bit_length() - 1
+                kept = []
+                for node in antichain.get(q, ()):
+                    if covered(mask, nodes[node][1], sim_b):
+                        alive[node] = False
+                    else:
+                        kept.append(node)
+                if q in antichain:
+                    antichain[q] = kept
+            node = len(nodes)
+            nodes.append((p, mask, parent, symbol))
+            alive.append(True)
+            antichain.setdefault(p, []).append(node)
+            queue.append(node)
+
+        starts = a.start_mask
+        while starts:
+            low = starts & -starts
+            starts ^= low
+            p = low.bit_length() - 1
+            if accept_a >> p & 1 and not b.start_mask & accept_b:
+                return ""
+            if not subsumed(p, b.start_mask):
+                add(p, b.start_mask, -1, "")
+
+        while queue:
+            node = queue.popleft()
+            if not alive[node]:
+                continue
+            p, mask = nodes[node][0], nodes[node][1]
+            for symbol, ca, cb in columns:
+                if ca < 0:
+                    continue
+                targets = a.successors[ca][p]
+                if not targets:
+                    continue
+                next_mask = AntichainChecker._post(mask, b.successors[cb]) if cb >= 0 else 0
+                while targets:
+                    low = targets & -targets
+                    targets ^= low
+                    q = low.bit_length() - 1
+                    if accept_a >> q & 1 and not next_mask & accept_b:
+                        return AntichainChecker._word(nodes, node, symbol)
+                    if not subsumed(q, next_mask):
+                        add(q, next_mask, node, symbol)
+        return None
+
+    @staticmethod
+    def is_included(a, b) -> bool:
+        """L(A) ⊆ L(B)?"""
+        return AntichainChecker.inclusion_counterexample(a, b) is None
+
+    @staticmethod
+    def universality_counterexample(fa, alphabet: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Tìm chuỗi trên bảng chữ cái (mặc định: bảng chữ cái của fa) mà fa không chấp nhận
+
+        Returns:
+            Chuỗi ngắn nhất bị từ chối, hoặc None nếu fa nhận mọi chuỗi (L = Σ*)
+        """
+        fa = as_compiled_nfa(fa)
+        sim = AntichainChecker.simulation(fa)
+        accept = fa.accept_mask
+        symbols = sorted(set(alphabet) if alphabet is not None else fa.symbol_index)
+        columns = {}
+        for symbol in symbols:
+            columns.setdefault(fa.symbol_index.get(symbol, -1), symbol)
+
+        if not fa.start_mask & accept:
+            return ""
+        nodes: List[tuple] = [(0, fa.start_mask, -1, "")]
+        antichain = {0}
+        queue = deque([0])
+        covered = AntichainChecker._covered
+
+        while queue:
+            node = queue.popleft()
+            if node not in antichain:
+                continue
+            mask = nodes[node][1]
+            for column, symbol in columns.items():
+                next_mask = AntichainChecker._post(mask, fa.successors[column]) if column >= 0 else 0
+                if not next_mask & accept:
+                    return AntichainChecker._word(nodes, node, symbol)
+                # Tập lớn hơn (theo mô phỏng) dễ được chấp nhận hơn -> chỉ giữ các tập "nhỏ"
+                if any(covered(nodes[other][1], next_mask, sim) for other in antichain):
+                    continue
+                antichain = {other for other in antichain if not covered(next_mask, nodes[other][1], sim)}
+                antichain.add(len(nodes))
+                queue.append(len(nodes))
+                nodes.append((0, next_mask, node, symbol))
+        return None
+
+    @staticmethod
+    def is_universal(fa, alphabet: Optional[Iterable[str]] = None) -> bool:
+        """L(fa) = Σ*?"""
+        return AntichainChecker.universality_counterexample(fa, alphabet) is None
+
+    @staticmethod
+    def equivalence_counterexample(a, b) -> Optional[str]:
+        """Chuỗi thuộc đúng một trong hai ngôn ngữ, hoặc None nếu L(A) = L(B)"""
+        counterexample = AntichainChecker.inclusion_counterexample(a, b)
+        if counterexample is None:
+            counterexample = AntichainChecker.inclusion_counterexample(b, a)
+        return counterexample
+
+    @staticmethod
+    def are_equivalent(a, b) -> bool:
+        """L(A) = L(B)?"""
+        return AntichainChecker.equivalence_counterexample(a, b) is None
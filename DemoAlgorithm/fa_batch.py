@@ -0,0 +1,126 @@
+"""
+FA Batch - So khớp DFA cho cả một lô chuỗi cùng lúc bằng NumPy
+Thay vì chạy từng chuỗi, cả vector trạng thái được đẩy đi một cột ký tự mỗi bước
+"""
+
+from typing import Iterable, Sequence, Tuple
+from fa_models import CompiledDFA
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là thư viện tùy chọn
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+class BatchMatcher:
+    """
+    Bộ so khớp theo lô trên bảng DFA dày đặc
+
+    Phương pháp:
+    1. Mã hóa lô chuỗi thành ma trận code point (đệm thêm) và vector độ dài
+    2. Ánh xạ code point -> cột của bảng (ký tự ngoài alphabet -> cột "lạ" dẫn tới trạng thái chết)
+    3. Ô đệm sau cuối chuỗi -> cột "đệm" giữ nguyên trạng thái
+    4. Mỗi bước: state = table[state, cột_j] cho toàn bộ lô (fancy indexing)
+    5. Kết quả: mask boolean accepting[state]
+    """
+
+    def __init__(self, compiled: CompiledDFA):
+        if not HAS_NUMPY:
+            raise ImportError("BatchMatcher requires NumPy (pip install numpy)")
+
+        self.compiled = compiled
+        num_rows = compiled.dead + 1
+        num_columns = compiled.num_columns
+        self.unknown_column = num_columns
+        self.pad_column = num_columns + 1
+
+        # Bảng dày đặc (trạng thái x cột), thêm cột "lạ" và cột "đệm"
+        table = np.empty((num_rows, num_columns + 2), dtype=np.int32)
+        if num_columns:
+            flat = np.frombuffer(compiled.table, dtype=np.intc)
+            table[:, :num_columns] = flat.reshape(num_rows, num_columns)
+        table[:, self.unknown_column] = compiled.dead
+        table[:, self.pad_column] = np.arange(num_rows, dtype=np.int32)
+        self.table = table
+
+        # Ánh xạ code point -> cột (chỉ các ký hiệu 1 ký tự mới có thể khớp với chuỗi)
+        single_chars = [(ord(symbol), column) for symbol, column in compiled.symbol_index.items()
+                        if len(symbol) == 1]
+        self.max_code = max((code for code, _ in single_chars), default=0)
+        column_of = np.full(self.max_code + 2, self.unknown_column, dtype=np.int32)
+        for code, column in single_chars:
+            column_of[code] = column
+        self.column_of = column_of
+
+        self.accepting = np.frombuffer(compiled.accepting, dtype=np.uint8).astype(bool)
+
+    @staticmethod
+    def encode(strings: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Mã hóa lô chuỗi thành ma trận code point (uint32, đệm 0) và vector độ dài
+
+        Ghi chú: NumPy lưu chuỗi unicode dạng UCS4 có độ rộng cố định,
+        nên ma trận chỉ là một view của mảng chuỗi (không sao chép từng ký tự)
+        """
+        lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+        array_of_strings = np.asarray(strings, dtype=np.str_).reshape(-1)
+        width = array_of_strings.dtype.itemsize // 4
+        if width == 0:
+            return np.zeros((len(array_of_strings), 0), dtype=np.uint32), lengths
+        codes = array_of_strings.view(np.uint32).reshape(len(array_of_strings), width)
+        return codes, lengths
+
+    def _columns(self, codes: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+        """Đổi ma trận code point thành ma trận chỉ số cột (lưu theo cột để duyệt nhanh)"""
+        columns = self.column_of[np.minimum(codes, self.max_code + 1)]
+        beyond_end = np.arange(codes.shape[1]) >= lengths[:, None]
+        columns[beyond_end] = self.pad_column
+        return np.asfortranarray(columns)
+
+    def match(self, strings: Sequence[str], chunk_size: int = 65536) -> "np.ndarray":
+        """
+        So khớp cả lô chuỗi
+
+        Args:
+            strings: Danh sách (hoặc mảng NumPy) các chuỗi
+            chunk_size: Số chuỗi mỗi khối (giới hạn bộ nhớ của ma trận đệm)
+
+        Returns:
+            Mảng boolean: True nếu chuỗi tương ứng được DFA chấp nhận
+        """
+        if not isinstance(strings, (list, tuple)) and not (HAS_NUMPY and isinstance(strings, np.ndarray)):
+            strings = list(strings)
+
+        result = np.empty(len(strings), dtype=bool)
+        for begin in range(0, len(strings), chunk_size):
+            chunk = strings[begin:begin + chunk_size]
+            result[begin:begin + len(chunk)] = self._match_chunk(chunk)
+        return result
+
+    def _match_chunk(self, strings: Sequence[str]) -> "np.ndarray":
+        codes, lengths = self.encode(strings)
+        columns = self._columns(codes, lengths)
+        table = self.table
+        dead = self.compiled.dead
+
+        state = np.full(len(lengths), self.compiled.start, dtype=np.int32)
+        for j in range(columns.shape[1]):
+            state = table[state, columns[:, j]]
+            # Dừng sớm khi mọi chuỗi đã rơi vào trạng thái chết
+            if j % 16 == 15 and (state == dead).all():
+                break
+
+        return self.accepting[state]
+
+    def match_iter(self, strings: Iterable[str], chunk_size: int = 65536):
+        """So khớp một iterable bất kỳ theo từng khối, trả về từng kết quả boolean"""
+        chunk = []
+        for s in strings:
+            chunk.append(s)
+            if len(chunk) == chunk_size:
+                yield from self._match_chunk(chunk).tolist()
+                chunk = []
+        if chunk:
+            yield from self._match_chunk(chunk).tolist()
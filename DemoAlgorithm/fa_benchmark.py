@@ -0,0 +1,343 @@
+"""
+FA Benchmark - Đo thời gian các thuật toán automata trên dữ liệu tổng hợp
+Mọi automata và bộ chuỗi thử đều được sinh từ seed cố định nên kết quả so sánh được giữa các commit
+
+Chạy:
+    python fa_benchmark.py                                  # toàn bộ benchmark, kích thước mặc định
+    python fa_benchmark.py --sizes 100 1000 --strings 5000  # tùy chỉnh kích thước
+    python fa_benchmark.py --only accepts minimize          # chỉ chạy các benchmark có tên chứa từ khóa
+    python fa_benchmark.py --only scaling                   # chỉ đo khả năng mở rộng của xây dựng tập con
+    python fa_benchmark.py --json result.json               # ghi kết quả ra JSON
+    python fa_benchmark.py --compare baseline.json          # so sánh với một lần chạy trước
+    python fa_benchmark.py --instrument counters.json       # ghi thêm bộ đếm nội bộ (xem fa_instrument)
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from fa_models import DFA, NFA, EpsilonNFA
+from fa_converter import FAConverter, FAMinimizer, FAEquivalenceChecker
+
+DEFAULT_SIZES = [10, 100, 1000]
+# Xây dựng tập con được đo riêng trên dải rộng hơn (tới 5000 trạng thái NFA)
+SCALING_SIZES = [10, 50, 100, 500, 1000, 2000, 5000]
+ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+# ==================== DỮ LIỆU TỔNG HỢP ====================
+
+def random_nfa(num_states: int, alphabet: str = "ab", width: int = 3,
+               max_targets: int = 2, accept_ratio: float = 0.1, seed: int = 0) -> NFA:
+    """
+    Sinh NFA ngẫu nhiên dạng "tầng": các trạng thái được chia thành các tầng rộng width,
+    mỗi chuyển tiếp chỉ đi từ một tầng sang tầng kế tiếp (tầng cuối quay về tầng đầu).
+    Mỗi tập con trong DFA nằm gọn trong một tầng, nên số trạng thái DFA tăng
+    tuyến tính theo số trạng thái NFA (tối đa 2^width tập con mỗi tầng),
+    phù hợp để đo khả năng mở rộng thay vì đo bùng nổ hàm mũ
+    """
+    rng = random.Random(seed)
+    nfa = NFA()
+    for i in range(num_states):
+        nfa.add_state(f"s{i}", is_start=(i == 0), is_accept=rng.random() < accept_ratio)
+
+    num_layers = max(1, num_states // width)
+    for i in range(num_states):
+        next_layer = (min(i // width, num_layers - 1) + 1) % num_layers
+        layer_states = range(next_layer * width, min(num_states, (next_layer + 1) * width))
+        for symbol in alphabet:
+            for target in rng.sample(layer_states, min(len(layer_states), rng.randint(1, max_targets))):
+                nfa.add_transition(f"s{i}", symbol, f"s{target}")
+
+    nfa.alphabet = set(alphabet)
+    return nfa
+
+
+def random_epsilon_nfa(num_states: int, alphabet: str = "ab", width: int = 3,
+                       epsilon_ratio: float = 0.3, seed: int = 0) -> EpsilonNFA:
+    """
+    Sinh ε-NFA: NFA dạng tầng như random_nfa, thêm các ε-chuyển tiếp giữa
+    các trạng thái cùng tầng (nên epsilon-closure cũng nằm gọn trong một tầng)
+    """
+    nfa = random_nfa(num_states, alphabet, width=width, seed=seed)
+    rng = random.Random(seed + 1)
+    e_nfa = EpsilonNFA()
+    for name, state in nfa.states.items():
+        e_nfa.add_state(name, state.is_start, state.is_accept)
+    for from_state, symbol, to_state in nfa.iter_transitions():
+        e_nfa.add_transition(from_state, symbol, to_state)
+
+    for i in range(num_states):
+        if rng.random() < epsilon_ratio:
+            layer = i // width * width
+            target = rng.randrange(layer, min(num_states, layer + width))
+            if target != i:
+                e_nfa.add_epsilon_transition(f"s{i}", f"s{target}")
+
+    e_nfa.alphabet = set(alphabet)
+    return e_nfa
+
+
+def random_dfa(num_states: int, alphabet: str = "ab", accept_ratio: float = 0.3,
+               seed: int = 0) -> DFA:
+    """Sinh DFA đầy đủ ngẫu nhiên (mọi trạng thái đều có chuyển tiếp với mọi ký tự)"""
+    rng = random.Random(seed)
+    dfa = DFA()
+    for i in range(num_states):
+        dfa.add_state(f"q{i}", is_start=(i == 0), is_accept=rng.random() < accept_ratio)
+    for i in range(num_states):
+        for symbol in alphabet:
+            dfa.add_transition(f"q{i}", symbol, f"q{rng.randrange(num_states)}")
+    return dfa
+
+
+def random_strings(count: int, alphabet: str = "ab", min_length: int = 0,
+                   max_length: int = 20, seed: int = 0) -> List[str]:
+    """Sinh bộ chuỗi thử ngẫu nhiên"""
+    rng = random.Random(seed)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(min_length, max_length)))
+            for _ in range(count)]
+
+
+def english_corpus(count: int, noise_ratio: float = 0.5, seed: int = 0) -> List[str]:
+    """Sinh bộ chuỗi hỗn hợp: các câu chỉ gồm chữ cái + khoảng trắng, xen lẫn chuỗi có chữ số / ký tự đặc biệt"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = ["".join(rng.choice(ENGLISH_ALPHABET) for _ in range(rng.randint(1, 8)))
+                 for _ in range(rng.randint(1, 4))]
+        text = " ".join(words)
+        if rng.random() < noise_ratio:
+            position = rng.randrange(len(text) + 1)
+            text = text[:position] + rng.choice("0123456789!@#$%") + text[position:]
+        corpus.append(text)
+    return corpus
+
+
+# ==================== ĐO THỜI GIAN ====================
+
+def measure(func: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            warmup: int = 1, repeat: int = 5) -> Dict[str, float]:
+    """
+    Chạy func warmup lần (không tính), sau đó repeat lần và thống kê thời gian (giây)
+
+    Args:
+        func: Hàm cần đo
+        setup: Hàm chạy trước mỗi lần đo, không tính vào thời gian (ví dụ xóa cache)
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+class BenchmarkSuite:
+    """
+    Tập hợp các benchmark
+
+    Mỗi benchmark là (tên, tham số, hàm đo, setup); kết quả được gom lại thành
+    danh sách dict có thể ghi ra JSON và so sánh giữa các lần chạy
+    """
+
+    def __init__(self, sizes: List[int], num_strings: int = 2000, seed: int = 0,
+                 warmup: int = 1, repeat: int = 5, only: Optional[List[str]] = None,
+                 scaling_sizes: Optional[List[int]] = None):
+        self.sizes = sizes
+        self.scaling_sizes = scaling_sizes if scaling_sizes is not None else SCALING_SIZES
+        self.num_strings = num_strings
+        self.seed = seed
+        self.warmup = warmup
+        self.repeat = repeat
+        self.only = only
+        self.results: List[dict] = []
+
+    def _selected(self, name: str) -> bool:
+        return not self.only or any(keyword in name for keyword in self.only)
+
+    def run_case(self, name: str, params: dict, func: Callable[[], object],
+                 setup: Optional[Callable[[], None]] = None, items: Optional[int] = None,
+                 extra: Optional[dict] = None):
+        """
+        Đo một benchmark và in kết quả
+
+        Args:
+            items: Số phần tử xử lý mỗi lần, để tính per_item_us (µs / phần tử)
+            extra: Số liệu bổ sung ghi kèm kết quả (ví dụ số trạng thái DFA tạo ra)
+        """
+        if not self._selected(name):
+            return
+        stats = measure(func, setup, self.warmup, self.repeat)
+        result = {"name": name, "params": params, **stats, **(extra or {})}
+        if items:
+            result["per_item_us"] = stats["min"] / items * 1e6
+        self.results.append(result)
+
+        param_text = " ".join(f"{key}={value}" for key, value in params.items())
+        extra_text = "".join(f" {key}={value}" for key, value in (extra or {}).items())
+        per_item_text = f" {result['per_item_us']:.2f}µs/item" if items else ""
+        print(f"  {name:<28} {param_text:<22} min={stats['min']:.5f}s "
+              f"median={stats['median']:.5f}s stdev={stats['stdev']:.5f}s{extra_text}{per_item_text}")
+
+    def run(self) -> List[dict]:
+        """Chạy toàn bộ benchmark"""
+        self.results = []
+        strings = random_strings(self.num_strings, "ab", 0, 30, seed=self.seed)
+
+        for size in self.sizes:
+            print(f"\n--- {size} trạng thái ---")
+            params = {"states": size}
+            dfa = random_dfa(size, seed=self.seed)
+            nfa = random_nfa(size, seed=self.seed)
+            e_nfa = random_epsilon_nfa(size, seed=self.seed)
+
+            # So khớp: trạng thái ổn định (dạng biên dịch đã được lưu sau lần warmup)
+            string_params = {**params, "strings": len(strings)}
+            for label, fa in (("dfa", dfa), ("nfa", nfa), ("epsilon_nfa", e_nfa)):
+                accepts = fa.accepts_string
+                self.run_case(f"accepts_string.{label}", string_params,
+                              lambda accepts=accepts: [accepts(s) for s in strings], items=len(strings))
+
+            # Chuyển đổi: xóa cache trước mỗi lần đo để tính cả chi phí biên dịch
+            def reset():
+                for fa in (dfa, nfa, e_nfa):
+                    fa._invalidate_cache()
+
+            self.run_case("convert.epsilon_nfa_to_nfa", params,
+                          lambda: FAConverter.epsilon_nfa_to_nfa(e_nfa), reset)
+            self.run_case("convert.nfa_to_dfa", params, lambda: FAConverter.nfa_to_dfa(nfa), reset)
+            self.run_case("convert.epsilon_nfa_to_dfa", params,
+                          lambda: FAConverter.epsilon_nfa_to_dfa(e_nfa), reset)
+            self.run_case("convert.dfa_to_nfa", params, lambda: FAConverter.dfa_to_nfa(dfa))
+            self.run_case("convert.dfa_to_epsilon_nfa", params, lambda: FAConverter.dfa_to_epsilon_nfa(dfa))
+            self.run_case("convert.nfa_to_epsilon_nfa", params, lambda: FAConverter.nfa_to_epsilon_nfa(nfa))
+
+            compiled_nfa = nfa.compile()
+            dfa_states = FAConverter.subset_construction(compiled_nfa).num_states
+            self.run_case("subset_construction", params,
+                          lambda: FAConverter.subset_construction(compiled_nfa),
+                          items=dfa_states, extra={"dfa_states": dfa_states})
+
+            self.run_case("minimize_dfa", params, lambda: FAMinimizer.minimize_dfa(dfa), reset)
+
+            # Tương đương: DFA với chính bản tối thiểu của nó (trường hợp xấu nhất - phải duyệt hết)
+            minimized = FAMinimizer.minimize_dfa(dfa)
+            self.run_case("equivalence.equivalent", params,
+                          lambda: FAEquivalenceChecker.are_dfa_equivalent(dfa, minimized), reset)
+            other = random_dfa(size, seed=self.seed + 1)
+            self.run_case("equivalence.different", params,
+                          lambda: FAEquivalenceChecker.are_dfa_equivalent(dfa, other), reset)
+
+        if self._selected("subset_construction.scaling"):
+            # Khả năng mở rộng: NFA dạng tầng nên số trạng thái DFA tăng tuyến tính,
+            # per_item_us là µs trên mỗi trạng thái DFA tạo ra
+            print("\n--- subset_construction.scaling ---")
+            for size in self.scaling_sizes:
+                compiled_nfa = random_nfa(size, seed=self.seed).compile()
+                dfa_states = FAConverter.subset_construction(compiled_nfa).num_states
+                self.run_case("subset_construction.scaling", {"states": size},
+                              lambda compiled_nfa=compiled_nfa: FAConverter.subset_construction(compiled_nfa),
+                              items=dfa_states, extra={"dfa_states": dfa_states})
+
+        if self._selected("classify_strings"):
+            # Import muộn: module nhận diện tiếng Anh đăng ký các automata vào registry
+            from fa_english_recognizer import EnglishRecognizer
+            print("\n--- classify_strings ---")
+            corpus = english_corpus(self.num_strings * 10, seed=self.seed)
+            EnglishRecognizer.warm_up()
+            self.run_case("classify_strings", {"strings": len(corpus)},
+                          lambda: EnglishRecognizer.classify_strings(corpus), items=len(corpus))
+
+        return self.results
+
+    def to_json(self) -> dict:
+        """Kết quả kèm thông tin môi trường chạy"""
+        return {
+            "meta": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "sizes": self.sizes,
+                "scaling_sizes": self.scaling_sizes,
+                "strings": self.num_strings,
+                "seed": self.seed,
+                "warmup": self.warmup,
+                "repeat": self.repeat,
+            },
+            "results": self.results,
+        }
+
+
+def compare(results: List[dict], baseline: dict):
+    """In tỉ lệ thời gian (min) so với một lần chạy trước (> 1: chậm hơn baseline)"""
+    previous = {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in baseline["results"]}
+    print("\n" + "=" * 70)
+    print("SO SÁNH VỚI BASELINE (ratio = hiện tại / baseline)")
+    print("=" * 70)
+    for result in results:
+        old = previous.get((result["name"], json.dumps(result["params"], sort_keys=True)))
+        if old is None:
+            continue
+        ratio = result["min"] / old["min"] if old["min"] else float("inf")
+        flag = "  <-- chậm hơn" if ratio > 1.1 else ""
+        param_text = " ".join(f"{key}={value}" for key, value in result["params"].items())
+        print(f"  {result['name']:<28} {param_text:<22} {old['min']:.5f}s -> {result['min']:.5f}s "
+              f"x{ratio:.2f}{flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark các thuật toán automata")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Số trạng thái của các automata tổng hợp")
+    parser.add_argument("--scaling-sizes", type=int, nargs="+", default=SCALING_SIZES,
+                        help="Số trạng thái NFA cho benchmark subset_construction.scaling")
+    parser.add_argument("--strings", type=int, default=2000, help="Số chuỗi thử cho phép so khớp")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="Chỉ chạy benchmark có tên chứa một trong các từ khóa")
+    parser.add_argument("--json", help="Ghi kết quả ra file JSON")
+    parser.add_argument("--compare", help="File JSON của một lần chạy trước để so sánh")
+    parser.add_argument("--instrument", help="Chạy kèm bộ đếm nội bộ và ghi ra file JSON (thời gian sẽ chậm hơn)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("FA BENCHMARK")
+    print("=" * 70)
+    suite = BenchmarkSuite(args.sizes, args.strings, args.seed, args.warmup, args.repeat, args.only,
+                           args.scaling_sizes)
+    if args.instrument:
+        from fa_instrument import instrument
+        with instrument(dump_to=args.instrument):
+            suite.run()
+        print(f"\nĐã ghi bộ đếm ra {args.instrument}")
+    else:
+        suite.run()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(suite.to_json(), f, indent=2)
+        print(f"\nĐã ghi kết quả ra {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(suite.results, json.load(f))
@@ -0,0 +1,186 @@
+"""
+FA Binary - Định dạng nhị phân (có phiên bản) cho DFA đã biên dịch
+File được nạp bằng mmap + memoryview: bảng chuyển tiếp không bị sao chép,
+việc so khớp chạy trực tiếp trên vùng nhớ được ánh xạ từ file
+
+Cấu trúc file (little-endian, mọi phần đều căn lề 4 byte):
+    Header (32 byte):
+        magic        4s   b"FADF"
+        version      u16  phiên bản định dạng
+        flags        u16  (dự trữ, hiện là 0)
+        num_states   u32  số trạng thái thật n (trạng thái chết = n)
+        num_columns  u32  số cột (lớp ký tự)
+        start        u32  trạng thái khởi đầu
+        symbols_size u32  số byte của bảng ký hiệu
+        names_size   u32  số byte của bảng tên trạng thái
+        reserved     u32
+    Bảng ký hiệu:    JSON UTF-8, danh sách các lớp ký tự (classes[cột] = [ký tự, ...])
+    Tên trạng thái:  JSON UTF-8, danh sách n tên
+    Accepting:       n+1 byte (1 = accept)
+    Bảng chuyển tiếp: (n+1) * num_columns số int32
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from fa_models import CompiledDFA
+
+MAGIC = b"FADF"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIII")
+
+
+def _pad(size: int) -> int:
+    """Số byte đệm để căn lề 4 byte"""
+    return -size % 4
+
+
+def dumps(compiled) -> bytes:
+    """Mã hóa DFA (hoặc CompiledDFA) thành bytes theo định dạng nhị phân"""
+    if not isinstance(compiled, CompiledDFA):
+        compiled = compiled.compile()
+    symbols = json.dumps([list(symbols) for symbols in compiled.classes], ensure_ascii=False).encode("utf-8")
+    names = json.dumps(list(compiled.state_names), ensure_ascii=False).encode("utf-8")
+
+    table = array("i", compiled.table)
+    if sys.byteorder != "little":
+        table.byteswap()
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, compiled.num_states, compiled.num_columns,
+                         compiled.start, len(symbols), len(names), 0)
+    parts = [header]
+    for section in (symbols, names, bytes(compiled.accepting)):
+        parts.append(section)
+        parts.append(b"\x00" * _pad(len(section)))
+    parts.append(table.tobytes())
+    return b"".join(parts)
+
+
+def _is_list_of(value, item_type: type) -> bool:
+    return isinstance(value, list) and all(isinstance(item, item_type) for item in value)
+
+
+def _decode(buffer) -> tuple:
+    """
+    Đọc và kiểm tra header cùng mọi phần của buffer
+    
+    Returns:
+        Tham số của CompiledDFA: (state_names, classes, table, accepting, start)
+    """
+    with memoryview(buffer) as view:
+        size = len(view)
+        if size < HEADER.size:
+            raise ValueError("Buffer is too small to be a compiled automaton")
+
+        magic, version, _, num_states, num_columns, start, symbols_size, names_size, _ = \
+            HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a compiled automaton file (bad magic)")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled automaton format version {version}")
+
+        # Vị trí của từng phần, kiểm tra trước khi cắt để file cụt báo lỗi rõ ràng
+        num_rows = num_states + 1
+        sections = {}
+        offset = HEADER.size
+        for name, length in (("symbols", symbols_size), ("names", names_size),
+                             ("accepting", num_rows), ("table", num_rows * num_columns * 4)):
+            if offset + length > size:
+                raise ValueError(f"Compiled automaton file is truncated: {name} section "
+                                 f"[{offset}, {offset + length}) is past the end ({size} bytes)")
+            sections[name] = (offset, offset + length)
+            offset += length + _pad(length)
+
+        try:
+            classes = json.loads(bytes(view[slice(*sections["symbols"])]).decode("utf-8"))
+            state_names = json.loads(bytes(view[slice(*sections["names"])]).decode("utf-8"))
+        except ValueError as error:
+            raise ValueError(f"Corrupted compiled automaton file: {error}") from None
+        if not _is_list_of(classes, list) or not all(_is_list_of(symbols, str) for symbols in classes) \
+                or not _is_list_of(state_names, str):
+            raise ValueError("Corrupted compiled automaton file: bad symbol or state name table")
+        if len(classes) != num_columns or len(state_names) != num_states or start > num_states:
+            raise ValueError("Corrupted compiled automaton file: header does not match its sections")
+
+        # Các memoryview con vẫn dùng được sau khi view bị giải phóng ở cuối khối with
+        accepting = view[slice(*sections["accepting"])]
+        table_bytes = view[slice(*sections["table"])]
+        if sys.byteorder == "little" and array("i").itemsize == 4:
+            table = table_bytes.cast("i")
+        else:
+            # Máy big-endian: buộc phải sao chép và đảo byte
+            table = array("i", bytes(table_bytes))
+            table.byteswap()
+
+    return state_names, classes, table, accepting, start
+
+
+def loads(buffer) -> CompiledDFA:
+    """
+    Giải mã DFA từ một buffer bất kỳ (bytes, bytearray, mmap, ...)
+    Accepting và bảng chuyển tiếp là memoryview trỏ thẳng vào buffer (không sao chép)
+    Buffer hỏng hoặc bị cụt gây ValueError
+    """
+    return CompiledDFA(*_decode(buffer))
+
+
+class MappedCompiledDFA(CompiledDFA):
+    """
+    CompiledDFA do load_compiled trả về: accepting và bảng chuyển tiếp nằm trên vùng nhớ mmap của file
+    
+    close() (hoặc thoát khối with) đóng vùng nhớ ngay, sau đó không dùng được nữa;
+    nếu không gọi, vùng nhớ được đóng khi đối tượng bị thu hồi
+    """
+    
+    __slots__ = ('_mapping',)
+    
+    def __init__(self, state_names, classes, table, accepting, start: int, mapping: mmap.mmap):
+        super().__init__(state_names, classes, table, accepting, start)
+        object.__setattr__(self, '_mapping', mapping)
+    
+    def __reduce__(self):
+        # Bản pickle là CompiledDFA thường (bảng đã được chép ra khỏi vùng nhớ)
+        return (CompiledDFA, super().__reduce__()[1])
+    
+    @property
+    def closed(self) -> bool:
+        return self._mapping.closed
+    
+    def close(self):
+        """Giải phóng các memoryview và đóng vùng nhớ mmap"""
+        if self._mapping.closed:
+            return
+        for view in (self.table, self.accepting):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mapping.close()
+    
+    def __enter__(self) -> 'MappedCompiledDFA':
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+def save_compiled(compiled, path: str):
+    """Ghi DFA (hoặc CompiledDFA) ra file nhị phân"""
+    with open(path, "wb") as f:
+        f.write(dumps(compiled))
+
+
+def load_compiled(path: str) -> MappedCompiledDFA:
+    """
+    Nạp DFA đã biên dịch từ file bằng mmap (chỉ đọc)
+    Dùng `with load_compiled(path) as compiled:` hoặc gọi close() để đóng vùng nhớ khi xong
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return MappedCompiledDFA(*_decode(mapped), mapped)
+    except BaseException:
+        mapped.close()
+        raise
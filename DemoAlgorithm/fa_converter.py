@@ -2,8 +2,10 @@
 FA Conversion - Các thuật toán chuyển đổi giữa DFA, NFA, và ε-NFA
 """
 
-from typing import Set, Dict, List, Tuple, FrozenSet
-from fa_models import DFA, NFA, EpsilonNFA
+from collections import deque
+from typing import Set, Dict, List, Tuple, FrozenSet, Optional
+from array import array
+from fa_models import DFA, NFA, EpsilonNFA, CompiledDFA, CompiledNFA
 
 
 class FAConverter:
@@ -14,9 +16,9 @@ class FAConverter:
         """
         Chuyển đổi ε-NFA thành NFA
         
-        Phương pháp:
+        Phương pháp (dùng bảng epsilon-closure tính sẵn của ε-NFA):
         1. Loại bỏ tất cả các chuyển tiếp epsilon
-        2. Mỗi chuyển tiếp trở thành: state -> epsilon_closure(next_states_with_symbol)
+        2. Mỗi chuyển tiếp trở thành: δ'(q, a) = ε-closure(δ(ε-closure(q), a))
         3. Một trạng thái trở thành accept nếu epsilon-closure của nó chứa bất kỳ accept state
         """
         nfa = NFA()
@@ -29,24 +31,31 @@ class FAConverter:
         # Thêm alphabet
         nfa.alphabet = e_nfa.alphabet.copy()
         
+        # Bitmask: successors[a][i] = ε-closure(δ(i, a)), closures[i] = ε-closure(i)
+        compiled = e_nfa.compile()
+        _, state_ids, closures = e_nfa.epsilon_closure_table()
+        
         # Thêm các chuyển tiếp mới
         for from_state in e_nfa.states:
-            for symbol in e_nfa.alphabet:
-                # Lấy tất cả các trạng thái có thể đạt được từ from_state bằng symbol
-                direct_nexts = e_nfa.get_transitions(from_state, symbol)
+            source = closures[state_ids[from_state]]
+            for column, symbols in enumerate(compiled.classes):
+                targets = 0
+                row = compiled.successors[column]
+                mask = source
+                while mask:
+                    low = mask & -mask
+                    targets |= row[low.bit_length() - 1]
+                    mask ^= low
                 
-                if direct_nexts:
-                    # Tính epsilon-closure của các trạng thái tiếp theo
-                    closure = e_nfa.epsilon_closure(direct_nexts)
-                    for to_state in closure:
+                for to_state in compiled.names_of(targets):
+                    for symbol in symbols:
                         nfa.add_transition(from_state, symbol, to_state)
         
         # Cập nhật accept states: trạng thái trở thành accept nếu epsilon-closure của nó
         # chứa một accept state hoặc chính nó là accept state
         new_accept_states = set()
         for state_name in nfa.states:
-            closure = e_nfa.epsilon_closure({state_name})
-            if closure & e_nfa.accept_states:
+            if closures[state_ids[state_name]] & compiled.accept_mask:
                 new_accept_states.add(state_name)
         
         nfa.accept_states = new_accept_states
@@ -64,60 +73,7 @@ class FAConverter:
         3. Trạng thái accept của DFA = những tập hợp chứa ít nhất một accept state của NFA
         4. Chuyển tiếp: từ tập {p1, p2, ...} với ký tự a -> {q | q ∈ δ(pi, a), pi ∈ tập hiện tại}
         """
-        dfa = DFA()
-        
-        # Bắt đầu từ tập chứa trạng thái khởi đầu
-        start_set = frozenset({nfa.start_state})
-        
-        # Đặt tên cho các trạng thái của DFA
-        state_map = {}  # Từ frozenset sang tên trạng thái
-        state_counter = 0
-        
-        # BFS để tìm tất cả các trạng thái có thể đạt được
-        queue = [start_set]
-        visited = {start_set}
-        
-        while queue:
-            current_set = queue.pop(0)
-            
-            # Tạo tên cho trạng thái này
-            if current_set not in state_map:
-                state_name = f"q{state_counter}"
-                state_counter += 1
-                state_map[current_set] = state_name
-            else:
-                state_name = state_map[current_set]
-            
-            # Kiểm tra xem đây có phải accept state không
-            is_accept = bool(current_set & nfa.accept_states)
-            is_start = (current_set == start_set)
-            
-            dfa.add_state(state_name, is_start, is_accept)
-            dfa.alphabet = nfa.alphabet.copy()
-            
-            # Tính chuyển tiếp cho mỗi ký tự
-            for symbol in nfa.alphabet:
-                next_set = set()
-                for state in current_set:
-                    next_set.update(nfa.get_transitions(state, symbol))
-                
-                if next_set:
-                    next_set = frozenset(next_set)
-                    
-                    if next_set not in state_map:
-                        state_name_next = f"q{state_counter}"
-                        state_counter += 1
-                        state_map[next_set] = state_name_next
-                    else:
-                        state_name_next = state_map[next_set]
-                    
-                    dfa.add_transition(state_name, symbol, state_name_next)
-                    
-                    if next_set not in visited:
-                        visited.add(next_set)
-                        queue.append(next_set)
-        
-        return dfa
+        return FAConverter.subset_construction(nfa.compile()).to_dfa()
     
     @staticmethod
     def epsilon_nfa_to_dfa(e_nfa: EpsilonNFA) -> DFA:
@@ -128,57 +84,67 @@ class FAConverter:
         1. Tương tự NFA to DFA nhưng sử dụng epsilon-closure
         2. Trạng thái khởi đầu = epsilon-closure({q0})
         3. Mỗi bước chuyển tiếp bao gồm epsilon-closure của kết quả
+           (dạng biên dịch của ε-NFA đã gộp sẵn epsilon-closure vào các bitmask)
+        """
+        return FAConverter.subset_construction(e_nfa.compile()).to_dfa()
+    
+    @staticmethod
+    def subset_construction(compiled: CompiledNFA) -> CompiledDFA:
         """
-        dfa = DFA()
+        Xây dựng tập con trên dạng bitset của NFA / ε-NFA, ghi thẳng vào bảng DFA
         
-        # Bắt đầu từ epsilon-closure của trạng thái khởi đầu
-        start_set = frozenset(e_nfa.epsilon_closure({e_nfa.start_state}))
+        - Mỗi tập con là một bitmask (số nguyên), dùng làm khóa của dict
+        - Worklist là deque (BFS), trạng thái DFA được đánh số theo thứ tự phát hiện
+          nên hàng thứ i của bảng chính là hàng của trạng thái thứ i
+        - Tập rỗng không tạo trạng thái mà trỏ tới trạng thái chết của bảng
         
-        state_map = {}
-        state_counter = 0
+        Returns:
+            CompiledDFA (gọi to_dfa() để có DFA dạng tên trạng thái)
+        """
+        classes = compiled.classes
+        num_columns = compiled.num_columns
+        if not compiled.start_mask:
+            return CompiledDFA([], classes, array('i', [0]) * num_columns, b'\x00', 0)
         
-        queue = [start_set]
-        visited = {start_set}
+        successors = compiled.successors
+        state_ids = {compiled.start_mask: 0}
+        masks = [compiled.start_mask]
+        queue = deque([compiled.start_mask])
+        table = array('i')
         
         while queue:
-            current_set = queue.pop(0)
-            
-            if current_set not in state_map:
-                state_name = f"q{state_counter}"
-                state_counter += 1
-                state_map[current_set] = state_name
-            else:
-                state_name = state_map[current_set]
-            
-            is_accept = bool(current_set & e_nfa.accept_states)
-            is_start = (current_set == start_set)
-            
-            dfa.add_state(state_name, is_start, is_accept)
-            dfa.alphabet = e_nfa.alphabet.copy()
-            
-            for symbol in e_nfa.alphabet:
-                next_set = set()
-                for state in current_set:
-                    next_set.update(e_nfa.get_transitions(state, symbol))
+            current = queue.popleft()
+            for row in successors:
+                next_mask = 0
+                mask = current
+                while mask:
+                    low = mask & -mask
+                    next_mask |= row[low.bit_length() - 1]
+                    mask ^= low
                 
-                if next_set:
-                    # Tính epsilon-closure của tập tiếp theo
-                    next_set = frozenset(e_nfa.epsilon_closure(next_set))
-                    
-                    if next_set not in state_map:
-                        state_name_next = f"q{state_counter}"
-                        state_counter += 1
-                        state_map[next_set] = state_name_next
-                    else:
-                        state_name_next = state_map[next_set]
-                    
-                    dfa.add_transition(state_name, symbol, state_name_next)
-                    
-                    if next_set not in visited:
-                        visited.add(next_set)
-                        queue.append(next_set)
-        
-        return dfa
+                if not next_mask:
+                    table.append(-1)  # trạng thái chết, đánh số lại ở cuối
+                    continue
+                
+                next_state = state_ids.get(next_mask)
+                if next_state is None:
+                    next_state = len(masks)
+                    state_ids[next_mask] = next_state
+                    masks.append(next_mask)
+                    queue.append(next_mask)
+                table.append(next_state)
+        
+        # Trạng thái chết là trạng thái cuối cùng của bảng
+        dead = len(masks)
+        table = array('i', [dead if target < 0 else target for target in table])
+        table.extend([dead] * num_columns)
+        
+        accept_mask = compiled.accept_mask
+        accepting = bytearray(1 if mask & accept_mask else 0 for mask in masks)
+        accepting.append(0)
+        
+        state_names = [f"q{i}" for i in range(dead)]
+        return CompiledDFA(state_names, classes, table, accepting, 0)
     
     @staticmethod
     def dfa_to_nfa(dfa: DFA) -> NFA:
@@ -186,20 +152,8 @@ class FAConverter:
         Chuyển đổi DFA thành NFA (Trivial conversion)
         DFA là một trường hợp đặc biệt của NFA
         """
-        nfa = NFA()
-        
-        # Sao chép tất cả các trạng thái
-        for state_name, state in dfa.states.items():
-            nfa.add_state(state_name, state.is_start, state.is_accept)
-        
-        nfa.alphabet = dfa.alphabet.copy()
-        nfa.accept_states = dfa.accept_states.copy()
-        
-        # Sao chép tất cả các chuyển tiếp
-        for from_state in dfa.transitions:
-            for symbol in dfa.transitions[from_state]:
-                to_state = next(iter(dfa.transitions[from_state][symbol]))
-                nfa.add_transition(from_state, symbol, to_state)
+        # Sao chép thẳng bảng trạng thái và danh sách kề (không thêm lại từng chuyển tiếp)
+        nfa = dfa.copy(NFA)
         
         return nfa
     
@@ -208,20 +162,8 @@ class FAConverter:
         """
         Chuyển đổi DFA thành ε-NFA
         """
-        e_nfa = EpsilonNFA()
-        
-        # Sao chép tất cả các trạng thái
-        for state_name, state in dfa.states.items():
-            e_nfa.add_state(state_name, state.is_start, state.is_accept)
-        
-        e_nfa.alphabet = dfa.alphabet.copy()
-        e_nfa.accept_states = dfa.accept_states.copy()
-        
-        # Sao chép tất cả các chuyển tiếp
-        for from_state in dfa.transitions:
-            for symbol in dfa.transitions[from_state]:
-                to_state = next(iter(dfa.transitions[from_state][symbol]))
-                e_nfa.add_transition(from_state, symbol, to_state)
+        # Sao chép thẳng bảng trạng thái và danh sách kề (không thêm lại từng chuyển tiếp)
+        e_nfa = dfa.copy(EpsilonNFA)
         
         return e_nfa
     
@@ -230,20 +172,8 @@ class FAConverter:
         """
         Chuyển đổi NFA thành ε-NFA
         """
-        e_nfa = EpsilonNFA()
-        
-        # Sao chép tất cả các trạng thái
-        for state_name, state in nfa.states.items():
-            e_nfa.add_state(state_name, state.is_start, state.is_accept)
-        
-        e_nfa.alphabet = nfa.alphabet.copy()
-        e_nfa.accept_states = nfa.accept_states.copy()
-        
-        # Sao chép tất cả các chuyển tiếp
-        for from_state in nfa.transitions:
-            for symbol in nfa.transitions[from_state]:
-                for to_state in nfa.transitions[from_state][symbol]:
-                    e_nfa.add_transition(from_state, symbol, to_state)
+        # Sao chép thẳng bảng trạng thái và danh sách kề (không thêm lại từng chuyển tiếp)
+        e_nfa = nfa.copy(EpsilonNFA)
         
         return e_nfa
     
@@ -283,136 +213,247 @@ class FAMinimizer:
     @staticmethod
     def minimize_dfa(dfa: DFA) -> DFA:
         """
-        Tối thiểu hóa DFA bằng thuật toán Hopcroft
+        Tối thiểu hóa DFA bằng thuật toán Hopcroft - O(n·|Σ|·log n)
         
         Phương pháp:
-        1. Phân chia trạng thái thành 2 nhóm: accept và non-accept
-        2. Lặp lại: chia nhỏ nhóm nếu các thành viên đi đến các nhóm khác nhau
-        3. Tạo DFA mới từ các nhóm
+        1. Biên dịch DFA thành bảng số nguyên; trạng thái chết ngầm định của bảng
+           đóng vai trò đích của các chuyển tiếp bị thiếu (DFA không đầy đủ)
+        2. Chỉ giữ các trạng thái đạt được từ trạng thái khởi đầu
+        3. Phân chia ban đầu: accept và non-accept, worklist chứa nhóm nhỏ hơn
+        4. Lấy nhóm A khỏi worklist; với mỗi ký tự a, X = các trạng thái đi vào A bằng a
+           (tra bảng chuyển tiếp ngược). Mỗi nhóm Y bị X cắt được tách thành Y∩X và Y\\X;
+           nếu Y đang trong worklist thì thêm cả hai, ngược lại chỉ thêm phần nhỏ hơn
+        5. Tạo DFA mới từ các nhóm, bỏ nhóm không tới được trạng thái chấp nhận
+           (trạng thái chết ngầm định hoặc trạng thái bẫy tường minh của DFA đầy đủ),
+           nên DFA đầy đủ và DFA không đầy đủ của cùng một ngôn ngữ cho cùng kết quả
         """
-        # Phân chia ban đầu: accept vs non-accept
-        accept = dfa.accept_states.copy()
-        non_accept = set(dfa.states.keys()) - accept
-        
-        partition = [accept, non_accept] if non_accept else [accept]
-        
-        # Lặp lại cho đến khi không còn thay đổi
-        changed = True
-        while changed:
-            changed = False
-            new_partition = []
+        minimized = DFA()
+        minimized.alphabet = dfa.alphabet.copy()
+        if dfa.start_state is None:
+            return minimized
+        
+        compiled = dfa.compile()
+        table = compiled.table
+        num_columns = compiled.num_columns
+        
+        # Các trạng thái đạt được (kể cả trạng thái chết nếu có chuyển tiếp bị thiếu)
+        local = {compiled.start: 0}
+        reachable = [compiled.start]
+        for state in reachable:
+            row = state * num_columns
+            for column in range(num_columns):
+                target = table[row + column]
+                if target not in local:
+                    local[target] = len(reachable)
+                    reachable.append(target)
+        count = len(reachable)
+        
+        # Bảng chuyển tiếp (theo chỉ số cục bộ) và bảng ngược: inverse[a][t] = {s | δ(s, a) = t}
+        forward = [[local[table[state * num_columns + column]] for column in range(num_columns)]
+                   for state in reachable]
+        inverse = [[[] for _ in range(count)] for _ in range(num_columns)]
+        for s, row in enumerate(forward):
+            for column, t in enumerate(row):
+                inverse[column][t].append(s)
+        
+        # Phân chia ban đầu
+        accepting = compiled.accepting
+        accept_block = {s for s, state in enumerate(reachable) if accepting[state]}
+        other_block = set(range(count)) - accept_block
+        blocks = [block for block in (accept_block, other_block) if block]
+        block_of = [0] * count
+        for b, block in enumerate(blocks):
+            for s in block:
+                block_of[s] = b
+        
+        in_worklist = [False] * len(blocks)
+        worklist = []
+        if len(blocks) == 2:
+            smaller = 0 if len(blocks[0]) <= len(blocks[1]) else 1
+            worklist.append(smaller)
+            in_worklist[smaller] = True
+        
+        while worklist:
+            a = worklist.pop()
+            in_worklist[a] = False
+            splitter = list(blocks[a])
             
-            for group in partition:
-                sub_groups = {}
-                
-                for state in group:
-                    # Tính "signature" của state: (symbol -> group_id)
-                    signature = []
-                    for symbol in sorted(dfa.alphabet):
-                        next_state = dfa.get_transitions(state, symbol)
-                        
-                        # Tìm group_id của next_state
-                        group_id = -1
-                        if next_state:
-                            for i, p in enumerate(partition):
-                                if next_state in p:
-                                    group_id = i
-                                    break
-                        
-                        signature.append((symbol, group_id))
-                    
-                    signature = tuple(signature)
-                    if signature not in sub_groups:
-                        sub_groups[signature] = []
-                    sub_groups[signature].append(state)
+            for column in range(num_columns):
+                inverse_column = inverse[column]
                 
-                if len(sub_groups) > 1:
-                    changed = True
+                # Gom các trạng thái đi vào splitter theo nhóm hiện tại của chúng
+                touched = {}
+                for t in splitter:
+                    for s in inverse_column[t]:
+                        touched.setdefault(block_of[s], []).append(s)
                 
-                new_partition.extend(sub_groups.values())
-            
-            partition = new_partition
-        
-        # Tạo DFA tối thiểu
-        minimized = DFA()
-        
-        # Tạo ánh xạ từ trạng thái cũ sang nhóm mới
-        state_to_group = {}
-        for i, group in enumerate(partition):
-            group_name = f"q{i}"
-            for state in group:
-                state_to_group[state] = group_name
-        
-        # Thêm các trạng thái mới
-        for i, group in enumerate(partition):
-            group_name = f"q{i}"
-            representative = next(iter(group))
-            
-            is_start = dfa.states[representative].is_start
-            is_accept = representative in dfa.accept_states
-            
-            minimized.add_state(group_name, is_start, is_accept)
-        
-        minimized.alphabet = dfa.alphabet.copy()
-        
-        # Thêm chuyển tiếp
-        added_transitions = set()
-        for group in partition:
-            representative = next(iter(group))
-            for symbol in dfa.alphabet:
-                next_state = dfa.get_transitions(representative, symbol)
-                if next_state:
-                    from_group = state_to_group[representative]
-                    to_group = state_to_group[next_state]
+                for b, moved in touched.items():
+                    block = blocks[b]
+                    if len(moved) == len(block):
+                        continue
                     
-                    if (from_group, symbol, to_group) not in added_transitions:
-                        minimized.add_transition(from_group, symbol, to_group)
-                        added_transitions.add((from_group, symbol, to_group))
+                    # Tách nhóm b: phần đi vào splitter trở thành nhóm mới
+                    new_b = len(blocks)
+                    block.difference_update(moved)
+                    blocks.append(set(moved))
+                    in_worklist.append(False)
+                    for s in moved:
+                        block_of[s] = new_b
+                    
+                    if in_worklist[b]:
+                        added = new_b
+                    else:
+                        added = new_b if len(moved) <= len(block) else b
+                    worklist.append(added)
+                    in_worklist[added] = True
+        
+        # Nhóm chết: các trạng thái không tới được trạng thái chấp nhận (BFS ngược).
+        # Sau khi tách, chúng tương đương nhau nên nằm chung tối đa một nhóm
+        live = [False] * count
+        queue = [s for s in range(count) if accepting[reachable[s]]]
+        for s in queue:
+            live[s] = True
+        for t in queue:
+            for column in range(num_columns):
+                for s in inverse[column][t]:
+                    if not live[s]:
+                        live[s] = True
+                        queue.append(s)
+        dead_block = next((block_of[s] for s in range(count) if not live[s]), None)
+        
+        # Đặt tên các nhóm theo thứ tự BFS từ nhóm khởi đầu (nhóm khởi đầu là q0)
+        group_names = {block_of[0]: "q0"}
+        order = [block_of[0]]
+        for b in order:
+            representative = next(iter(blocks[b]))
+            for t in forward[representative]:
+                target_block = block_of[t]
+                if target_block != dead_block and target_block not in group_names:
+                    group_names[target_block] = f"q{len(order)}"
+                    order.append(target_block)
+        
+        # Thêm các trạng thái và chuyển tiếp mới
+        classes = compiled.classes
+        for b in order:
+            representative = next(iter(blocks[b]))
+            minimized.add_state(group_names[b], is_start=(b == block_of[0]),
+                                is_accept=bool(accepting[reachable[representative]]))
+        
+        for b in order:
+            representative = next(iter(blocks[b]))
+            for column, t in enumerate(forward[representative]):
+                target_block = block_of[t]
+                if target_block != dead_block:
+                    for symbol in classes[column]:
+                        minimized.add_transition(group_names[b], symbol, group_names[target_block])
         
+        minimized.alphabet = dfa.alphabet.copy()
         return minimized
 
 
 class FAEquivalenceChecker:
     """Lớp để kiểm tra tương đương giữa các automata"""
     
+    @staticmethod
+    def _common_symbols(compiled1, compiled2) -> List[Tuple[str, int, int]]:
+        """
+        Alphabet chung của hai DFA đã biên dịch, nén theo cặp lớp ký tự:
+        danh sách (ký tự đại diện, cột_1, cột_2), mỗi cặp (cột_1, cột_2) xuất hiện một lần
+        Ký hiệu không thuộc một DFA có cột -1 (dẫn tới trạng thái chết của DFA đó)
+        """
+        # Chỉ ký hiệu 1 ký tự mới có thể xuất hiện trong chuỗi đầu vào
+        symbols = sorted(s for s in set(compiled1.symbol_index) | set(compiled2.symbol_index) if len(s) == 1)
+        representatives = {}
+        for s in symbols:
+            representatives.setdefault((compiled1.symbol_index.get(s, -1), compiled2.symbol_index.get(s, -1)), s)
+        return [(s, column1, column2) for (column1, column2), s in representatives.items()]
+    
+    @staticmethod
+    def _step(compiled, state: int, column: int) -> int:
+        if column < 0:
+            return compiled.dead
+        return compiled.table[state * compiled.num_columns + column]
+    
     @staticmethod
     def are_dfa_equivalent(dfa1: DFA, dfa2: DFA) -> bool:
         """
-        Kiểm tra xem hai DFA có tương đương không
+        Kiểm tra xem hai DFA có tương đương không (chính xác, gần tuyến tính)
         Hai DFA tương đương nếu chúng chấp nhận cùng một ngôn ngữ
-        """
-        # Tối thiểu hóa cả hai
-        min1 = FAMinimizer.minimize_dfa(dfa1)
-        min2 = FAMinimizer.minimize_dfa(dfa2)
-        
-        # So sánh cấu trúc
-        # Kiểm tra bằng cách kiểm tra xem chúng chấp nhận các chuỗi giống nhau
-        # (Đây là phương pháp đơn giản, trong thực tế có thể dùng phương pháp phức tạp hơn)
-        
-        # Sinh các chuỗi test từ alphabet
-        test_strings = FAEquivalenceChecker._generate_test_strings(
-            min1.alphabet | min2.alphabet, max_length=5
-        )
         
-        for string in test_strings:
-            if min1.accepts_string(string) != min2.accepts_string(string):
+        Phương pháp: thuật toán Hopcroft–Karp dùng union-find
+        1. Hợp nhất hai trạng thái khởi đầu
+        2. Với mỗi cặp (p, q) đã hợp nhất và mỗi ký tự a: nếu δ1(p,a) và δ2(q,a)
+           chưa cùng lớp thì hợp nhất và đưa cặp đó vào stack
+        3. Không tương đương nếu gặp một cặp có trạng thái accept khác nhau
+        """
+        c1 = dfa1.compile()
+        c2 = dfa2.compile()
+        symbols = FAEquivalenceChecker._common_symbols(c1, c2)
+        step = FAEquivalenceChecker._step
+        
+        # Union-find trên hợp rời rạc các trạng thái (kể cả trạng thái chết) của hai DFA
+        offset = c1.dead + 1
+        parent = list(range(offset + c2.dead + 1))
+        
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        
+        parent[find(c1.start)] = find(offset + c2.start)
+        stack = [(c1.start, c2.start)]
+        
+        while stack:
+            p, q = stack.pop()
+            if c1.accepting[p] != c2.accepting[q]:
                 return False
+            
+            for _, column1, column2 in symbols:
+                next_p = step(c1, p, column1)
+                next_q = step(c2, q, column2)
+                root_p = find(next_p)
+                root_q = find(offset + next_q)
+                if root_p != root_q:
+                    parent[root_p] = root_q
+                    stack.append((next_p, next_q))
         
         return True
     
     @staticmethod
-    def _generate_test_strings(alphabet: Set[str], max_length: int = 3) -> List[str]:
-        """Sinh các chuỗi test"""
-        strings = ['']  # Chuỗi rỗng
-        
-        for length in range(1, max_length + 1):
-            def generate(current, depth):
-                if depth == 0:
-                    strings.append(current)
-                    return
-                for symbol in alphabet:
-                    generate(current + symbol, depth - 1)
+    def find_distinguishing_string(dfa1: DFA, dfa2: DFA) -> Optional[str]:
+        """
+        Tìm chuỗi ngắn nhất phân biệt hai DFA (được chấp nhận bởi đúng một trong hai)
+        
+        Phương pháp: BFS trên automata tích, chỉ duyệt các cặp trạng thái đạt được
+        
+        Returns:
+            Chuỗi phân biệt ngắn nhất, hoặc None nếu hai DFA tương đương
+        """
+        c1 = dfa1.compile()
+        c2 = dfa2.compile()
+        symbols = FAEquivalenceChecker._common_symbols(c1, c2)
+        step = FAEquivalenceChecker._step
+        
+        start = (c1.start, c2.start)
+        previous = {start: None}  # cặp -> (cặp trước đó, ký tự)
+        queue = deque([start])
+        
+        while queue:
+            pair = queue.popleft()
+            p, q = pair
+            if c1.accepting[p] != c2.accepting[q]:
+                # Dựng lại chuỗi từ các con trỏ ngược
+                word = []
+                while previous[pair] is not None:
+                    pair, symbol = previous[pair]
+                    word.append(symbol)
+                return ''.join(reversed(word))
             
-            generate('', length)
+            for symbol, column1, column2 in symbols:
+                next_pair = (step(c1, p, column1), step(c2, q, column2))
+                if next_pair not in previous:
+                    previous[next_pair] = (pair, symbol)
+                    queue.append(next_pair)
         
-        return strings
+        return None
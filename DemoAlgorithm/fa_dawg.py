@@ -0,0 +1,182 @@
+"""
+FA DAWG - Từ điển dạng automata hữu hạn xác định, không chu trình, tối thiểu (DAWG)
+Xây dựng tăng dần theo thuật toán Daciuk et al. (2000) từ danh sách từ đã sắp xếp:
+mỗi từ được thêm vào như một trie, phần hậu tố của từ trước đó được tối thiểu hóa ngay
+(thay bằng trạng thái tương đương đã có trong "register"), nên automata luôn tối thiểu
+mà không bao giờ phải giữ toàn bộ trie trong bộ nhớ
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fa_models import DFA, CompiledDFA
+
+
+class DAWG:
+    """
+    Automata tối thiểu nhận đúng tập từ của từ điển
+
+    - Trạng thái là số nguyên 0..n-1, 0 là trạng thái khởi đầu
+    - edges[state] = {ký tự: trạng thái tiếp theo}, final[state] = kết thúc một từ
+    - Hỗ trợ: kiểm tra từ (in), kiểm tra tiền tố, liệt kê các từ bắt đầu bằng tiền tố
+    - Xuất ra DFA / CompiledDFA để kết hợp với các automata nhận diện khác
+    - Bất biến sau khi tạo: toàn bộ từ được đưa vào qua hàm dựng (hoặc from_words / load)
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        Args:
+            words: Các từ theo thứ tự tăng dần (dùng from_words nếu chưa sắp xếp)
+        """
+        self.edges: List[Dict[str, int]] = [{}]
+        self.final: List[bool] = [False]
+        self._register: Dict[Tuple, int] = {}
+        self._unchecked: List[Tuple[int, str, int]] = []  # (cha, ký tự, con) chưa được tối thiểu hóa
+        self._previous = ""
+        self._num_words = 0
+        self._compiled: Optional[CompiledDFA] = None
+
+        for word in words:
+            self._insert(word)
+        self._finish()
+
+    @staticmethod
+    def from_words(words: Iterable[str]) -> 'DAWG':
+        """Xây DAWG từ các từ bất kỳ (tự sắp xếp và loại trùng)"""
+        return DAWG(sorted(set(words)))
+
+    @staticmethod
+    def load(path: str, lowercase: bool = True) -> 'DAWG':
+        """Xây DAWG từ file json chứa danh sách từ (ví dụ Data/words.json)"""
+        with open(path, "r", encoding="utf-8") as f:
+            words = json.load(f)
+        return DAWG.from_words(word.lower() if lowercase else word for word in words)
+
+    def _insert(self, word: str):
+        """Thêm một từ (phải lớn hơn từ được thêm trước đó; chỉ dùng trong lúc xây dựng ở __init__)"""
+        if self._register is None:
+            raise ValueError("DAWG is already finished")
+        if word <= self._previous and self._num_words:
+            if word == self._previous:
+                return
+            raise ValueError(f"Words must be inserted in sorted order: {word!r} after {self._previous!r}")
+
+        common = 0
+        for a, b in zip(word, self._previous):
+            if a != b:
+                break
+            common += 1
+
+        # Hậu tố của từ trước (sau phần chung) sẽ không thay đổi nữa -> tối thiểu hóa
+        self._replace_or_register(common)
+        state = self._unchecked[-1][2] if self._unchecked else 0
+        for symbol in word[common:]:
+            child = len(self.edges)
+            self.edges.append({})
+            self.final.append(False)
+            self.edges[state][symbol] = child
+            self._unchecked.append((state, symbol, child))
+            state = child
+
+        self.final[state] = True
+        self._previous = word
+        self._num_words += 1
+
+    def _replace_or_register(self, down_to: int):
+        """Tối thiểu hóa các trạng thái chưa kiểm tra, từ sâu nhất lên tới độ sâu down_to"""
+        while len(self._unchecked) > down_to:
+            parent, symbol, child = self._unchecked.pop()
+            # Các con của child đã nằm trong register nên id của chúng là đại diện chuẩn
+            signature = (self.final[child], tuple(sorted(self.edges[child].items())))
+            existing = self._register.get(signature)
+            if existing is None:
+                self._register[signature] = child
+            else:
+                self.edges[parent][symbol] = existing
+
+    def _finish(self):
+        """Kết thúc việc xây dựng và đánh số lại các trạng thái còn dùng (theo BFS từ 0)"""
+        if self._register is None:
+            return
+        self._replace_or_register(0)
+        self._register = None
+
+        ids = {0: 0}
+        order = [0]
+        for state in order:
+            for symbol in sorted(self.edges[state]):
+                child = self.edges[state][symbol]
+                if child not in ids:
+                    ids[child] = len(order)
+                    order.append(child)
+
+        self.edges = [{symbol: ids[child] for symbol, child in sorted(self.edges[state].items())}
+                      for state in order]
+        self.final = [self.final[state] for state in order]
+        self._unchecked = []
+
+    def _walk(self, string: str) -> Optional[int]:
+        """Trạng thái đạt được sau khi đọc string (None nếu rơi ra ngoài)"""
+        state = 0
+        edges = self.edges
+        for symbol in string:
+            state = edges[state].get(symbol)
+            if state is None:
+                return None
+        return state
+
+    def __contains__(self, word: str) -> bool:
+        state = self._walk(word)
+        return state is not None and self.final[state]
+
+    def __len__(self) -> int:
+        return self._num_words
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Có từ nào bắt đầu bằng prefix không"""
+        return self._walk(prefix) is not None
+
+    def completions(self, prefix: str, limit: Optional[int] = None) -> Iterator[str]:
+        """Liệt kê (theo thứ tự từ điển) các từ bắt đầu bằng prefix"""
+        state = self._walk(prefix)
+        if state is None:
+            return
+        count = 0
+        # DFS bằng stack tường minh; thêm con theo thứ tự ngược để lấy ra theo thứ tự tăng
+        stack = [(state, prefix)]
+        while stack:
+            state, word = stack.pop()
+            if self.final[state]:
+                yield word
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+            for symbol, child in reversed(list(self.edges[state].items())):
+                stack.append((child, word + symbol))
+
+    @property
+    def num_states(self) -> int:
+        return len(self.edges)
+
+    @property
+    def num_transitions(self) -> int:
+        return sum(len(edges) for edges in self.edges)
+
+    def to_dfa(self) -> DFA:
+        """Xuất ra DFA (trạng thái q0..qn-1, thiếu chuyển tiếp = bị từ chối)"""
+        dfa = DFA()
+        for state, is_final in enumerate(self.final):
+            dfa.add_state(f"q{state}", is_start=(state == 0), is_accept=is_final)
+        for state, edges in enumerate(self.edges):
+            for symbol, child in edges.items():
+                dfa.add_transition(f"q{state}", symbol, f"q{child}")
+        return dfa
+
+    def compile(self) -> CompiledDFA:
+        """Dạng biên dịch (bảng chuyển tiếp phẳng), được lưu lại sau lần gọi đầu tiên"""
+        if self._compiled is None:
+            self._compiled = self.to_dfa().compile()
+        return self._compiled
+
+    def __repr__(self):
+        return f"DAWG(words={len(self)}, states={self.num_states}, transitions={self.num_transitions})"
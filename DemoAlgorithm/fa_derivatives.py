@@ -0,0 +1,274 @@
+"""
+FA Derivatives - So khớp regex bằng đạo hàm Brzozowski
+Đạo hàm của regex r theo ký tự a là regex d_a(r) nhận { w | aw thuộc L(r) }:
+chuỗi w khớp r khi và chỉ khi đạo hàm lần lượt theo các ký tự của w là nullable (nhận ε)
+
+- Mỗi regex con được "hash-cons": cùng cấu trúc -> cùng một id số nguyên, nên so sánh
+  hai regex chỉ là so sánh hai số
+- Các hàm dựng thông minh (smart constructor) rút gọn ngay khi tạo (∅·r = ∅, ε·r = r,
+  r|r = r, (r*)* = r*, ...) để số đạo hàm khác nhau là hữu hạn
+- Mỗi id là một trạng thái DFA; bảng đạo hàm (id, lớp ký tự) -> id chính là bảng chuyển tiếp,
+  được lấp dần khi so khớp (không cần ε-NFA -> NFA -> DFA)
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from fa_models import DFA
+from fa_regex import RegexCompiler
+
+EMPTY_SET = 0  # ∅ - không nhận chuỗi nào (trạng thái chết)
+EPSILON = 1    # ε - chỉ nhận chuỗi rỗng
+UNKNOWN = -1   # Ô đạo hàm chưa được tính
+
+
+class DerivativeMatcher:
+    """
+    Bộ so khớp regex bằng đạo hàm, DFA được xây lười theo các chuỗi đã gặp
+
+    - Bảng chữ cái được chia thành các lớp: hai ký tự cùng lớp khi chúng thuộc đúng
+      cùng những tập ký tự trong regex, nên có cùng đạo hàm với mọi regex con
+    - Ký tự không xuất hiện trong regex (và alphabet) luôn dẫn tới ∅
+    """
+
+    def __init__(self, pattern: str, alphabet: Optional[Iterable[str]] = None):
+        """
+        Args:
+            pattern: Biểu thức chính quy (cú pháp như fa_regex)
+            alphabet: Bảng chữ cái, cần khi pattern dùng '.' hoặc '[^...]'
+        """
+        self.pattern = pattern
+        tree = RegexCompiler.parse(pattern, alphabet)
+
+        # Bảng hash-consing: _nodes[id] = cấu trúc, _ids[cấu trúc] = id
+        self._nodes: List[tuple] = [('empty_set',), ('epsilon',)]
+        self._ids: Dict[tuple, int] = {('empty_set',): EMPTY_SET, ('epsilon',): EPSILON}
+        self._nullable: List[bool] = [False, True]
+        self._rows: Dict[int, List[int]] = {}
+
+        char_sets = set()
+        self._collect_chars(tree, char_sets)
+        symbols = set(alphabet or ())
+        for chars in char_sets:
+            symbols |= chars
+        groups: Dict[FrozenSet, List[str]] = {}
+        for symbol in sorted(symbols):
+            signature = frozenset(chars for chars in char_sets if symbol in chars)
+            groups.setdefault(signature, []).append(symbol)
+        self.classes: List[Tuple[str, ...]] = [tuple(symbols) for symbols in groups.values()]
+        self.symbol_index: Dict[str, int] = {symbol: column for column, symbols in enumerate(self.classes)
+                                             for symbol in symbols}
+
+        self.start = self._from_tree(tree)
+
+    @staticmethod
+    def _collect_chars(tree: tuple, char_sets: set):
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if node[0] == 'chars':
+                char_sets.add(node[1])
+            elif node[0] in ('cat', 'alt'):
+                stack.extend(node[1])
+            elif node[0] != 'empty':
+                stack.append(node[1])
+
+    # ==================== HASH-CONSING + SMART CONSTRUCTORS ====================
+
+    def _make(self, key: tuple, nullable: bool) -> int:
+        node = self._ids.get(key)
+        if node is None:
+            node = len(self._nodes)
+            self._ids[key] = node
+            self._nodes.append(key)
+            self._nullable.append(nullable)
+        return node
+
+    def chars(self, symbols: FrozenSet[str]) -> int:
+        if not symbols:
+            return EMPTY_SET
+        return self._make(('chars', symbols), False)
+
+    def cat(self, left: int, right: int) -> int:
+        """Nối: ∅r = r∅ = ∅, εr = rε = r, (rs)t = r(st)"""
+        if left == EMPTY_SET or right == EMPTY_SET:
+            return EMPTY_SET
+        if left == EPSILON:
+            return right
+        if right == EPSILON:
+            return left
+        
+        # Tách vế trái thành các thừa số (vế trái của một nút cat không bao giờ là cat)
+        # rồi nối lần lượt từ phải sang bằng vòng lặp, không đệ quy theo độ dài chuỗi nối
+        nodes = self._nodes
+        factors = []
+        while nodes[left][0] == 'cat':
+            factors.append(nodes[left][1])
+            left = nodes[left][2]
+        factors.append(left)
+        
+        result = right
+        nullable = self._nullable
+        for factor in reversed(factors):
+            result = self._make(('cat', factor, result), nullable[factor] and nullable[result])
+        return result
+
+    def alt(self, *options: int) -> int:
+        """Hợp: làm phẳng, bỏ ∅, bỏ trùng, sắp xếp (kết hợp, giao hoán, lũy đẳng)"""
+        members = set()
+        for option in options:
+            node = self._nodes[option]
+            if node[0] == 'alt':
+                members.update(node[1])
+            elif option != EMPTY_SET:
+                members.add(option)
+        if not members:
+            return EMPTY_SET
+        if len(members) == 1:
+            return members.pop()
+        members = tuple(sorted(members))
+        return self._make(('alt', members), any(self._nullable[m] for m in members))
+
+    def star(self, inner: int) -> int:
+        """Lặp: ∅* = ε* = ε, (r*)* = r*"""
+        if inner in (EMPTY_SET, EPSILON):
+            return EPSILON
+        if self._nodes[inner][0] == 'star':
+            return inner
+        return self._make(('star', inner), True)
+
+    def _from_tree(self, tree: tuple) -> int:
+        """Đổi cây cú pháp của fa_regex thành regex đã hash-cons"""
+        kind = tree[0]
+        if kind == 'empty':
+            return EPSILON
+        if kind == 'chars':
+            return self.chars(tree[1])
+        if kind == 'cat':
+            result = EPSILON
+            for child in reversed(tree[1]):
+                result = self.cat(self._from_tree(child), result)
+            return result
+        if kind == 'alt':
+            return self.alt(*(self._from_tree(child) for child in tree[1]))
+        inner = self._from_tree(tree[1])
+        if kind == 'star':
+            return self.star(inner)
+        if kind == 'plus':
+            return self.cat(inner, self.star(inner))
+        return self.alt(inner, EPSILON)  # opt
+
+    # ==================== ĐẠO HÀM ====================
+
+    def nullable(self, node: int) -> bool:
+        """Regex có nhận chuỗi rỗng không"""
+        return self._nullable[node]
+
+    def derivative(self, node: int, column: int) -> int:
+        """Đạo hàm theo một lớp ký tự (có ghi nhớ trong bảng chuyển tiếp)"""
+        row = self._rows.get(node)
+        if row is None:
+            row = [UNKNOWN] * len(self.classes)
+            self._rows[node] = row
+        result = row[column]
+        if result == UNKNOWN:
+            result = self._derive(node, column)
+            row[column] = result
+        return result
+
+    def _derive(self, node: int, column: int) -> int:
+        structure = self._nodes[node]
+        kind = structure[0]
+        if kind in ('empty_set', 'epsilon'):
+            return EMPTY_SET
+        if kind == 'chars':
+            return EPSILON if self.classes[column][0] in structure[1] else EMPTY_SET
+        if kind == 'cat':
+            # d(r1 r2 ... rn) = d(r1) r2...rn | d(r2...rn) nếu r1 nullable, ...
+            # Duyệt xương sống cat bằng vòng lặp, dừng ở thừa số đầu tiên không nullable
+            terms = []
+            while structure[0] == 'cat':
+                left, node = structure[1], structure[2]
+                terms.append(self.cat(self.derivative(left, column), node))
+                if not self._nullable[left]:
+                    return self.alt(*terms)
+                structure = self._nodes[node]
+            terms.append(self.derivative(node, column))
+            return self.alt(*terms)
+        if kind == 'alt':
+            return self.alt(*(self.derivative(member, column) for member in structure[1]))
+        # star: d(r*) = d(r) r*
+        return self.cat(self.derivative(structure[1], column), node)
+
+    # ==================== SO KHỚP ====================
+
+    def accepts_string(self, string: str) -> bool:
+        """Kiểm tra chuỗi khớp regex (toàn bộ chuỗi)"""
+        symbol_index = self.symbol_index
+        rows = self._rows
+        state = self.start
+
+        for symbol in string:
+            column = symbol_index.get(symbol)
+            if column is None:
+                return False
+            row = rows.get(state)
+            next_state = row[column] if row is not None else UNKNOWN
+            if next_state == UNKNOWN:
+                next_state = self.derivative(state, column)
+            if next_state == EMPTY_SET:
+                return False
+            state = next_state
+
+        return self._nullable[state]
+
+    def explore(self) -> List[int]:
+        """
+        Tính toàn bộ đạo hàm đạt được từ regex ban đầu (BFS)
+
+        Returns:
+            Các trạng thái (id regex) theo thứ tự phát hiện, bắt đầu bằng start, không gồm ∅
+        """
+        order = [self.start] if self.start != EMPTY_SET else []
+        seen = set(order)
+        for state in order:
+            for column in range(len(self.classes)):
+                target = self.derivative(state, column)
+                if target != EMPTY_SET and target not in seen:
+                    seen.add(target)
+                    order.append(target)
+        return order
+
+    @property
+    def num_states(self) -> int:
+        """Số regex (trạng thái) đã có hàng trong bảng đạo hàm"""
+        return len(self._rows)
+
+    def to_dfa(self) -> DFA:
+        """Khám phá hết các đạo hàm rồi xuất ra DFA (q0 = regex ban đầu, ∅ bị bỏ)"""
+        order = self.explore()
+        names = {state: f"q{i}" for i, state in enumerate(order)}
+        dfa = DFA()
+        for state in order:
+            dfa.add_state(names[state], is_start=(state == self.start), is_accept=self._nullable[state])
+        for state in order:
+            for column, symbols in enumerate(self.classes):
+                target = self._rows[state][column]
+                if target != EMPTY_SET:
+                    for symbol in symbols:
+                        dfa.add_transition(names[state], symbol, names[target])
+        dfa.alphabet = set(self.symbol_index)
+        return dfa
+
+    def __repr__(self):
+        return f"DerivativeMatcher({self.pattern!r}, states={self.num_states})"
+
+
+@lru_cache(maxsize=256)
+def _matcher(pattern: str, alphabet: Optional[FrozenSet[str]]) -> DerivativeMatcher:
+    return DerivativeMatcher(pattern, alphabet)
+
+
+def derivative_matcher(pattern: str, alphabet: Optional[Iterable[str]] = None) -> DerivativeMatcher:
+    """Bộ so khớp dùng chung cho mỗi pattern: bảng đạo hàm tích lũy qua mọi lần gọi"""
+    return _matcher(pattern, frozenset(alphabet) if alphabet is not None else None)
@@ -5,7 +5,24 @@ Bài toán: Phân biệt chuỗi tiếng Anh từ tạp âm (noise)
 
 from fa_models import DFA, NFA, EpsilonNFA
 from fa_converter import FAConverter
-from typing import Set, List, Dict, Tuple
+from fa_registry import RECOGNIZERS
+from fa_batch import BatchMatcher, HAS_NUMPY
+from fa_parallel import classify_parallel
+from fa_dawg import DAWG
+from fa_product import ProductDFA, intersection
+from typing import Set, List, Dict, Tuple, Optional
+import json
+import os
+
+
+# Tên các automata tiếng Anh trong registry
+ENGLISH_EPSILON_NFA = "english_epsilon_nfa"
+ENGLISH_NFA = "english_nfa"
+ENGLISH_DFA = "english_dfa"
+ENGLISH_WORDS_DFA = "english_words_dfa"
+
+# Từ điển tiếng Anh (danh sách từ đã sắp xếp), đường dẫn tính theo vị trí file này
+WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data", "words.json")
 
 
 class EnglishRecognizer:
@@ -107,12 +124,42 @@ class EnglishRecognizer:
         Returns:
             True nếu là tiếng Anh, False nếu là tạp âm
         """
+        # Automata được lấy từ registry: chỉ xây dựng một lần, mỗi chuỗi chỉ còn bước so khớp
         if use_dfa:
-            dfa = EnglishRecognizer.create_english_dfa()
-            return dfa.accepts_string(text)
+            return RECOGNIZERS.get(ENGLISH_DFA).accepts_string(text)
         else:
-            nfa = EnglishRecognizer.create_english_nfa()
-            return nfa.accepts_string(text)
+            return RECOGNIZERS.get(ENGLISH_NFA).accepts_string(text)
+    
+    # Automata tích đã tạo, theo tập chữ cái bị cấm
+    @staticmethod
+    def create_english_without_letters(banned_letters) -> ProductDFA:
+        """
+        Automata tích: tiếng Anh VÀ không chứa chữ cái nào bị cấm (không phân biệt hoa thường)
+        Hai điều kiện được kiểm tra trong cùng một lần duyệt chuỗi
+        Được lưu trong RECOGNIZERS như đối tượng dẫn xuất của ENGLISH_DFA (bị xóa khi ENGLISH_DFA bị invalidate)
+        """
+        banned = frozenset(letter.lower() for letter in banned_letters)
+        return RECOGNIZERS.derived(ENGLISH_DFA, ('without_letters', banned),
+                                   lambda dfa: EnglishRecognizer._build_without_letters(dfa, banned))
+    
+    @staticmethod
+    def _build_without_letters(dfa: DFA, banned: frozenset) -> ProductDFA:
+        allowed = DFA()
+        allowed.add_state("q0", is_start=True, is_accept=True)
+        for symbol in dfa.alphabet:
+            if symbol.lower() not in banned:
+                allowed.add_transition("q0", symbol, "q0")
+        return intersection(dfa, allowed)
+    
+    @staticmethod
+    def is_english_without_letters(text: str, banned_letters) -> bool:
+        """Kiểm tra chuỗi là tiếng Anh và không chứa chữ cái bị cấm"""
+        return EnglishRecognizer.create_english_without_letters(banned_letters).accepts_string(text)
+    
+    @staticmethod
+    def warm_up():
+        """Xây dựng trước các automata tiếng Anh (ví dụ lúc khởi động chương trình)"""
+        RECOGNIZERS.warm_up(ENGLISH_EPSILON_NFA, ENGLISH_NFA, ENGLISH_DFA)
     
     @staticmethod
     def classify_strings(strings: List[str]) -> Tuple[List[str], List[str]]:
@@ -128,6 +175,13 @@ class EnglishRecognizer:
         english = []
         noise = []
         
+        # Có NumPy thì phân loại cả lô một lần
+        if HAS_NUMPY:
+            mask = EnglishRecognizer.match_batch(strings)
+            for s, is_english in zip(strings, mask.tolist()):
+                (english if is_english else noise).append(s)
+            return english, noise
+        
         for s in strings:
             if EnglishRecognizer.is_english(s):
                 english.append(s)
@@ -136,6 +190,40 @@ class EnglishRecognizer:
         
         return english, noise
     
+    @staticmethod
+    def match_batch(strings, chunk_size: int = 65536):
+        """
+        Phân loại cả lô chuỗi bằng NumPy (cần cài NumPy)
+        
+        Args:
+            strings: Danh sách hoặc mảng NumPy các chuỗi
+            chunk_size: Số chuỗi xử lý mỗi khối
+        
+        Returns:
+            Mảng boolean (mask): True nếu chuỗi là tiếng Anh
+        """
+        # BatchMatcher (bảng NumPy) được lưu cùng DFA đã biên dịch, dựng lại khi DFA thay đổi
+        compiled = RECOGNIZERS.get(ENGLISH_DFA).compile()
+        matcher = RECOGNIZERS.derived(ENGLISH_DFA, ('batch_matcher', compiled),
+                                      lambda dfa: BatchMatcher(compiled))
+        return matcher.match(strings, chunk_size)
+    
+    @staticmethod
+    def classify_parallel(strings, workers: int = None, chunksize: int = 4096):
+        """
+        Phân loại song song trên nhiều tiến trình (cho tập dữ liệu lớn)
+        
+        Args:
+            strings: Iterable các chuỗi (được đọc lười)
+            workers: Số tiến trình con (mặc định: số nhân CPU)
+            chunksize: Số chuỗi mỗi tác vụ
+        
+        Returns:
+            Iterator các giá trị True/False theo đúng thứ tự input
+        """
+        compiled = RECOGNIZERS.get(ENGLISH_DFA).compile()
+        return classify_parallel(strings, compiled, workers=workers, chunksize=chunksize)
+    
     @staticmethod
     def trace_english_recognition(text: str) -> Dict:
         """
@@ -146,8 +234,8 @@ class EnglishRecognizer:
         - Epsilon-closure ở mỗi bước
         - Kết quả cuối cùng
         """
-        e_nfa = EnglishRecognizer.create_english_epsilon_nfa()
-        dfa = EnglishRecognizer.create_english_dfa()
+        e_nfa = RECOGNIZERS.get(ENGLISH_EPSILON_NFA)
+        dfa = RECOGNIZERS.get(ENGLISH_DFA)
         
         result = {
             'text': text,
@@ -160,6 +248,14 @@ class EnglishRecognizer:
         return result
 
 
+# Đăng ký các automata tiếng Anh (chỉ được xây dựng khi dùng lần đầu)
+RECOGNIZERS.register(ENGLISH_EPSILON_NFA, EnglishRecognizer.create_english_epsilon_nfa)
+RECOGNIZERS.register(ENGLISH_NFA, EnglishRecognizer.create_english_nfa)
+RECOGNIZERS.register(ENGLISH_DFA, EnglishRecognizer.create_english_dfa)
+# DAWG đã tối thiểu sẵn, không cần chạy lại Hopcroft
+RECOGNIZERS.register(ENGLISH_WORDS_DFA, lambda: AdvancedEnglishRecognizer.dictionary().to_dfa(), minimize=False)
+
+
 class NoisyChannelSimulator:
     """
     Mô phỏng kênh tạp âm - sinh ra tiếng Anh và tạp âm hỗn hợp
@@ -339,7 +435,7 @@ class AdvancedEnglishRecognizer:
     - Loại bỏ được các từ không hợp lệ
     """
     
-    # Từ điển tiếng Anh phổ biến (có thể mở rộng)
+    # Các từ bổ sung cho từ điển trong Data/words.json (thuật ngữ chuyên ngành, ...)
     COMMON_WORDS = {
         "hello", "world", "python", "automata", "language", "machine",
         "learning", "theory", "computer", "science", "programming",
@@ -351,6 +447,21 @@ class AdvancedEnglishRecognizer:
         "or", "an", "will", "my", "one", "all", "would", "there", "their",
     }
     
+    _dictionary: Optional[DAWG] = None
+    
+    @staticmethod
+    def dictionary() -> DAWG:
+        """
+        Từ điển dạng DAWG (automata tối thiểu không chu trình), xây một lần từ
+        Data/words.json + COMMON_WORDS ở lần gọi đầu tiên
+        """
+        if AdvancedEnglishRecognizer._dictionary is None:
+            with open(WORDS_PATH, "r", encoding="utf-8") as f:
+                words = json.load(f)
+            words = {word.lower() for word in words} | AdvancedEnglishRecognizer.COMMON_WORDS
+            AdvancedEnglishRecognizer._dictionary = DAWG.from_words(words)
+        return AdvancedEnglishRecognizer._dictionary
+    
     @staticmethod
     def is_valid_english_word(word: str) -> bool:
         """Kiểm tra từ có phải tiếng Anh không"""
@@ -365,15 +476,14 @@ class AdvancedEnglishRecognizer:
         if not word:
             return False
         
-        # Kiểm tra từ đơn lẻ
-        words = word.split()
-        for w in words:
-            if w and w not in AdvancedEnglishRecognizer.COMMON_WORDS:
-                # Có thể thêm xử lý: từ không trong từ điển nhưng có thể là hợp lệ
-                # Ở đây cứng nhạc để demo
-                pass
-        
-        return True
+        # Kiểm tra từng từ đơn lẻ trong từ điển
+        dictionary = AdvancedEnglishRecognizer.dictionary()
+        return all(w in dictionary for w in word.split())
+    
+    @staticmethod
+    def suggest(prefix: str, limit: int = 10) -> List[str]:
+        """Gợi ý các từ trong từ điển bắt đầu bằng prefix"""
+        return list(AdvancedEnglishRecognizer.dictionary().completions(prefix.strip().lower(), limit))
     
     @staticmethod
     def is_english_advanced(text: str) -> bool:
@@ -0,0 +1,277 @@
+"""
+FA Instrument - Đo đạc bên trong các thuật toán automata (bật khi cần)
+
+Khi không dùng, mã chạy hoàn toàn như cũ (không có một phép kiểm tra nào thêm vào):
+chỉ trong khối `with instrument()` các phương thức mới bị thay tạm bằng phiên bản
+có đếm / đo giờ, và được trả lại nguyên trạng khi thoát khối
+
+Ví dụ:
+    with instrument() as stats:
+        FAConverter.epsilon_nfa_to_dfa(e_nfa)
+        dfa.accepts_string("hello")
+    print(stats.to_json())
+"""
+
+import inspect
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fa_models import CompiledDFA, CompiledNFA, NFA, EpsilonNFA
+from fa_converter import FAConverter, FAMinimizer, FAEquivalenceChecker
+
+# Các giai đoạn được đo thời gian: (lớp, tên phương thức, tên giai đoạn)
+TIMED_PHASES = [
+    (FAConverter, 'epsilon_nfa_to_nfa', 'convert.epsilon_nfa_to_nfa'),
+    (FAConverter, 'nfa_to_dfa', 'convert.nfa_to_dfa'),
+    (FAConverter, 'epsilon_nfa_to_dfa', 'convert.epsilon_nfa_to_dfa'),
+    (FAConverter, 'subset_construction', 'convert.subset_construction'),
+    (FAMinimizer, 'minimize_dfa', 'minimize_dfa'),
+    (FAEquivalenceChecker, 'are_dfa_equivalent', 'equivalence'),
+    # Đo hàm dựng thật sự (chỉ chạy khi cache trống), không đo DFA/NFA.compile() vốn thường chỉ trả về bản đã lưu
+    (CompiledDFA, 'from_dfa', 'compile.dfa'),
+    (CompiledNFA, 'from_automaton', 'compile.nfa'),
+    (EpsilonNFA, 'epsilon_closure_table', 'epsilon_closure_table'),
+]
+
+# Giai đoạn tự lưu kết quả trong fa._cache: chỉ ghi nhận lần gọi khi khóa cache chưa có (cache miss)
+CACHED_PHASES = {
+    'epsilon_closure_table': 'closure_table',
+}
+
+# Các phương thức trả về một set mới mỗi lần gọi
+SET_ALLOCATING = [
+    (NFA, 'get_transitions'),
+    (EpsilonNFA, 'get_transitions'),
+    (EpsilonNFA, 'epsilon_closure'),
+    (CompiledNFA, 'names_of'),
+]
+
+_active: Optional['Instrumentation'] = None
+
+
+class Instrumentation:
+    """
+    Bộ đếm và đồng hồ cho một phiên đo đạc
+
+    counters:
+        dfa.strings / dfa.steps             số chuỗi / số ký tự DFA (dạng bảng) đã xử lý
+        nfa.strings / nfa.steps             như trên, cho mô phỏng NFA / ε-NFA bằng bitset
+        nfa.live_states                     tổng số trạng thái sống qua mọi bước
+        nfa.peak_live_states                số trạng thái sống lớn nhất tại một bước
+        epsilon_closure.calls               số lần gọi EpsilonNFA.epsilon_closure
+        subset_construction.states          số trạng thái DFA tạo ra bởi xây dựng tập con
+        set_allocations                     số set mới được tạo (get_transitions, epsilon_closure, ...)
+    timings: tổng thời gian (giây) của mỗi giai đoạn, tính cả các giai đoạn con bên trong
+    calls: số lần gọi mỗi giai đoạn (compile.* và epsilon_closure_table chỉ tính lần dựng thật, không tính lần lấy từ cache)
+    """
+
+    def __init__(self, dump_to: Optional[str] = None):
+        """
+        Args:
+            dump_to: Đường dẫn file JSON để ghi kết quả khi thoát khối with (tùy chọn)
+        """
+        self.dump_to = dump_to
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._originals: List[Tuple[type, str, object]] = []
+        self.skipped: List[str] = []  # Các móc không tìm thấy khi enable() (ví dụ phương thức đã bị đổi tên)
+
+    # ==================== BẬT / TẮT ====================
+
+    def enable(self):
+        """Thay các phương thức bằng phiên bản có đo đạc"""
+        global _active
+        if _active is not None:
+            raise RuntimeError("Instrumentation is already enabled")
+        _active = self
+        self.skipped = []
+
+        try:
+            for owner, name, phase in TIMED_PHASES:
+                after = self._count_subset_states if phase == 'convert.subset_construction' else None
+                self._wrap(owner, name, self._timed(phase, after, CACHED_PHASES.get(phase)))
+            for owner, name in SET_ALLOCATING:
+                self._wrap(owner, name, self._allocating)
+            self._patch(CompiledDFA, 'accepts_string', _instrumented_dfa_accepts(self))
+            self._patch(CompiledNFA, 'accepts_string', _instrumented_nfa_accepts(self))
+        except BaseException:
+            # Không để lại các phương thức đã bọc dở dang
+            self.disable()
+            raise
+
+    def disable(self):
+        """Trả lại các phương thức gốc"""
+        global _active
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            setattr(owner, name, original)
+        if _active is self:
+            _active = None
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.disable()
+        if self.dump_to:
+            with open(self.dump_to, "w", encoding="utf-8") as f:
+                f.write(self.to_json())
+        return False
+
+    def _patch(self, owner: type, name: str, replacement):
+        self._originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, replacement)
+
+    def _wrap(self, owner: type, name: str, make_wrapper: Callable[[Callable], Callable]):
+        """
+        Bọc phương thức owner.name (giữ nguyên kiểu staticmethod nếu có)
+        Chỉ bọc khi chính owner định nghĩa phương thức (bọc bản kế thừa sẽ đếm trùng / đếm sai lớp);
+        móc không tìm thấy được ghi vào self.skipped thay vì làm hỏng enable()
+        """
+        original = inspect.getattr_static(owner, name, None)
+        if original is None or name not in owner.__dict__:
+            self.skipped.append(f"{owner.__name__}.{name}")
+            return
+        if isinstance(original, staticmethod):
+            self._patch(owner, name, staticmethod(make_wrapper(original.__func__)))
+        else:
+            self._patch(owner, name, make_wrapper(original))
+
+    # ==================== CÁC LỚP BỌC ====================
+
+    def _timed(self, phase: str, after: Optional[Callable[[object], None]] = None,
+               cache_key: Optional[str] = None):
+        def make_wrapper(func):
+            def timed(*args, **kwargs):
+                if cache_key is not None and cache_key in args[0]._cache:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    self.timings[phase] += time.perf_counter() - start
+                    self.calls[phase] += 1
+                if after is not None:
+                    after(result)
+                return result
+            timed.__wrapped__ = func
+            return timed
+        return make_wrapper
+
+    def _count_subset_states(self, compiled: CompiledDFA):
+        self.counters['subset_construction.states'] += compiled.num_states
+
+    def _allocating(self, func):
+        counters = self.counters
+        is_closure = func.__name__ == 'epsilon_closure'
+
+        def allocating(*args, **kwargs):
+            counters['set_allocations'] += 1
+            if is_closure:
+                counters['epsilon_closure.calls'] += 1
+            return func(*args, **kwargs)
+        allocating.__wrapped__ = func
+        return allocating
+
+    # ==================== KẾT QUẢ ====================
+
+    def reset(self):
+        """Xóa toàn bộ số liệu (vẫn giữ trạng thái bật / tắt)"""
+        self.counters.clear()
+        self.timings.clear()
+        self.calls.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            'counters': dict(sorted(self.counters.items())),
+            'timings': dict(sorted(self.timings.items())),
+            'calls': dict(sorted(self.calls.items())),
+            'skipped': list(self.skipped),
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def __repr__(self):
+        return f"Instrumentation(counters={dict(self.counters)})"
+
+
+def _instrumented_dfa_accepts(stats: Instrumentation):
+    counters = stats.counters
+
+    def accepts_string(self: CompiledDFA, string: str) -> bool:
+        """CompiledDFA.accepts_string có đếm số bước"""
+        counters['dfa.strings'] += 1
+        table = self.table
+        symbol_index = self.symbol_index
+        num_columns = self.num_columns
+        dead = self.dead
+        state = self.start
+        steps = 0
+        try:
+            for symbol in string:
+                steps += 1
+                column = symbol_index.get(symbol)
+                if column is None:
+                    return False
+                state = table[state * num_columns + column]
+                if state == dead:
+                    return False
+            return self.accepting[state] == 1
+        finally:
+            counters['dfa.steps'] += steps
+    return accepts_string
+
+
+def _instrumented_nfa_accepts(stats: Instrumentation):
+    counters = stats.counters
+
+    def accepts_string(self: CompiledNFA, string: str) -> bool:
+        """CompiledNFA.accepts_string có đếm số bước và số trạng thái sống"""
+        counters['nfa.strings'] += 1
+        symbol_index = self.symbol_index
+        successors = self.successors
+        mask = self.start_mask
+        steps = 0
+        live_total = 0
+        peak = bin(mask).count("1")
+        try:
+            for symbol in string:
+                steps += 1
+                column = symbol_index.get(symbol)
+                if column is None:
+                    return False
+                row = successors[column]
+                next_mask = 0
+                while mask:
+                    low = mask & -mask
+                    next_mask |= row[low.bit_length() - 1]
+                    mask ^= low
+                if not next_mask:
+                    return False
+                mask = next_mask
+                live = bin(mask).count("1")
+                live_total += live
+                if live > peak:
+                    peak = live
+            return bool(mask & self.accept_mask)
+        finally:
+            counters['nfa.steps'] += steps
+            counters['nfa.live_states'] += live_total
+            if peak > counters['nfa.peak_live_states']:
+                counters['nfa.peak_live_states'] = peak
+    return accepts_string
+
+
+def instrument(dump_to: Optional[str] = None) -> Instrumentation:
+    """
+    Tạo một phiên đo đạc để dùng với `with`
+
+    Args:
+        dump_to: Ghi kết quả dạng JSON ra file này khi thoát khối with
+    """
+    return Instrumentation(dump_to)
@@ -0,0 +1,157 @@
+"""
+FA Lazy - Xác định hóa "lười" (on-the-fly determinization) cho NFA / ε-NFA
+Trạng thái DFA (tập trạng thái NFA) chỉ được tạo khi chuỗi đầu vào thực sự đi tới,
+và được lưu trong một bộ nhớ đệm có giới hạn (tương tự cách RE2 làm)
+"""
+
+from typing import Dict, List, Optional
+from fa_models import CompiledNFA
+
+UNKNOWN = -1  # Ô chuyển tiếp chưa được tính
+
+
+class LazyDFA:
+    """
+    DFA được xây dựng dần trong lúc so khớp
+
+    - Mỗi trạng thái DFA là một bitmask trạng thái NFA (xem CompiledNFA)
+    - Ô chuyển tiếp (trạng thái, ký tự) chỉ được tính ở lần đầu tiên đi qua
+    - Khi số trạng thái vượt quá max_states: xóa toàn bộ bộ nhớ đệm (flush) và xây lại
+    - Nếu flush liên tục mà mỗi lần chỉ xử lý được ít ký tự (thrashing),
+      chuyển hẳn sang mô phỏng NFA bằng bitset để tránh tốn công vô ích
+    """
+
+    def __init__(self, fa, max_states: int = 4096, min_chars_per_state: int = 10,
+                 max_thrash_flushes: int = 3):
+        """
+        Args:
+            fa: NFA, EpsilonNFA (hoặc CompiledNFA đã biên dịch)
+            max_states: Số trạng thái DFA tối đa trong bộ nhớ đệm
+            min_chars_per_state: Số ký tự tối thiểu phải xử lý cho mỗi trạng thái được tạo
+                                 giữa hai lần flush; thấp hơn thì lần flush đó bị coi là thrashing
+            max_thrash_flushes: Số lần thrashing liên tiếp trước khi chuyển sang mô phỏng NFA
+        """
+        self.nfa: CompiledNFA = fa if isinstance(fa, CompiledNFA) else fa.compile()
+        self.max_states = max(2, max_states)
+        self.min_chars_per_state = min_chars_per_state
+        self.max_thrash_flushes = max_thrash_flushes
+        self.reset()
+
+    def reset(self):
+        """Xóa bộ nhớ đệm, thống kê và thoát khỏi chế độ mô phỏng NFA"""
+        self.fallback = False
+        self.stats = {'chars': 0, 'states_built': 0, 'flushes': 0, 'misses': 0}
+        self._thrash_flushes = 0
+        self._flush()
+
+    def _flush(self):
+        """Xóa toàn bộ trạng thái DFA đã xây (giữ lại trạng thái chết và trạng thái khởi đầu)"""
+        self._ids: Dict[int, int] = {}
+        self._masks: List[int] = []
+        self._accepting: List[bool] = []
+        self._rows: List[List[int]] = []
+        self._chars_since_flush = 0
+        self.dead = self._intern(0)
+        self.start = self._intern(self.nfa.start_mask)
+
+    def _intern(self, mask: int) -> int:
+        """Lấy id của trạng thái DFA ứng với bitmask (tạo mới nếu chưa có)"""
+        state = self._ids.get(mask)
+        if state is None:
+            state = len(self._masks)
+            self._ids[mask] = state
+            self._masks.append(mask)
+            self._accepting.append(bool(mask & self.nfa.accept_mask))
+            self._rows.append([UNKNOWN] * self.nfa.num_columns)
+            self.stats['states_built'] += 1
+        return state
+
+    def _compute(self, state: int, column: int) -> Optional[int]:
+        """
+        Tính ô chuyển tiếp còn thiếu
+
+        Returns:
+            id trạng thái tiếp theo (có thể sau khi flush), hoặc None nếu phải chuyển sang mô phỏng NFA
+        """
+        self.stats['misses'] += 1
+        mask = self._masks[state]
+        row = self.nfa.successors[column]
+        next_mask = 0
+        while mask:
+            low = mask & -mask
+            next_mask |= row[low.bit_length() - 1]
+            mask ^= low
+
+        if next_mask not in self._ids and len(self._masks) >= self.max_states:
+            # Bộ nhớ đệm đầy: đánh giá xem lần flush này có phải thrashing không
+            if self._chars_since_flush < self.min_chars_per_state * len(self._masks):
+                self._thrash_flushes += 1
+            else:
+                self._thrash_flushes = 0
+            self.stats['flushes'] += 1
+            self._flush()
+            if self._thrash_flushes >= self.max_thrash_flushes:
+                self.fallback = True
+                return None
+            return self._intern(next_mask)
+
+        next_state = self._intern(next_mask)
+        self._rows[state][column] = next_state
+        return next_state
+
+    def accepts_string(self, string: str) -> bool:
+        """Kiểm tra xem automata chấp nhận chuỗi"""
+        if self.fallback:
+            return self.nfa.accepts_string(string)
+
+        symbol_index = self.nfa.symbol_index
+        rows = self._rows
+        dead = self.dead
+        state = self.start
+        counted = 0
+
+        for position, symbol in enumerate(string):
+            column = symbol_index.get(symbol)
+            if column is None:
+                return False
+
+            next_state = rows[state][column]
+            if next_state == UNKNOWN:
+                self._count_chars(position - counted)
+                counted = position
+                mask = self._masks[state]
+                next_state = self._compute(state, column)
+                if next_state is None:
+                    # Chuyển sang mô phỏng NFA cho phần còn lại của chuỗi
+                    return self._finish_with_nfa(mask, string[position:])
+                rows = self._rows
+                dead = self.dead
+
+            if next_state == dead:
+                self._count_chars(position + 1 - counted)
+                return False
+            state = next_state
+
+        self._count_chars(len(string) - counted)
+        return self._accepting[state]
+
+    def _count_chars(self, count: int):
+        self._chars_since_flush += count
+        self.stats['chars'] += count
+
+    def _finish_with_nfa(self, mask: int, rest: str) -> bool:
+        nfa = self.nfa
+        for symbol in rest:
+            mask = nfa.step(mask, symbol)
+            if not mask:
+                return False
+        return bool(mask & nfa.accept_mask)
+
+    @property
+    def num_states(self) -> int:
+        """Số trạng thái DFA hiện có trong bộ nhớ đệm"""
+        return len(self._masks)
+
+    def __repr__(self):
+        mode = "NFA fallback" if self.fallback else f"states={self.num_states}/{self.max_states}"
+        return f"LazyDFA({mode}, flushes={self.stats['flushes']})"
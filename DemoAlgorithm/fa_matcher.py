@@ -0,0 +1,253 @@
+"""
+FA Matcher - Bộ so khớp tăng dần (incremental) cho DFA / NFA / ε-NFA
+Chuỗi được đưa vào từng phần bằng feed() thay vì chạy lại accepts_string() từ đầu
+mỗi khi có thêm ký tự (người chơi gõ thêm một phím, dữ liệu mạng đến từng gói, ...)
+
+    matcher = dfa.matcher()
+    matcher.feed("hel")
+    saved = matcher.snapshot()
+    matcher.feed("lo")
+    matcher.is_accepting()   # True
+    matcher.restore(saved)   # quay lại ngay sau "hel" (ví dụ khi người chơi xóa ký tự)
+
+Trạng thái không còn đường tới trạng thái chấp nhận bị coi là chết ngay lập tức,
+nên is_dead() báo từ chối sớm nhất có thể
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List, Tuple
+
+from fa_models import CompiledDFA, CompiledNFA
+
+
+class Matcher(ABC):
+    """
+    Giao diện chung của các bộ so khớp tăng dần
+
+    - feed(chunk): đọc thêm một đoạn chuỗi, trả về False nếu đã rơi vào trạng thái chết
+    - is_accepting(): phần đã đọc có được chấp nhận không
+    - is_dead(): không phần mở rộng nào còn được chấp nhận -> có thể từ chối ngay
+    - snapshot() / restore(): lưu / khôi phục vị trí hiện tại dưới dạng (vị trí, consumed).
+      "Vị trí" phụ thuộc lớp con: chỉ số trạng thái với DFAMatcher, bitmask các trạng thái
+      (số nguyên không giới hạn, bit i = trạng thái i) với NFAMatcher. Chỉ truyền snapshot
+      lại cho matcher cùng loại trên cùng automata
+    - consumed: số ký tự đã đọc (dừng tăng ở ký tự làm matcher chết)
+    """
+
+    @abstractmethod
+    def reset(self):
+        """Quay về trạng thái khởi đầu"""
+
+    @abstractmethod
+    def feed(self, chunk: str) -> bool:
+        """Đọc thêm chunk, trả về False nếu matcher đã chết"""
+
+    @abstractmethod
+    def is_accepting(self) -> bool:
+        """Phần đã đọc có được chấp nhận không"""
+
+    @abstractmethod
+    def is_dead(self) -> bool:
+        """Không phần mở rộng nào của chuỗi đã đọc còn được chấp nhận"""
+
+    @abstractmethod
+    def snapshot(self) -> Tuple[int, int]:
+        """(vị trí, consumed) - vị trí là chỉ số trạng thái hoặc bitmask tùy lớp con"""
+
+    @abstractmethod
+    def restore(self, snapshot: Tuple[int, int]):
+        """Khôi phục vị trí từ snapshot() của matcher cùng loại"""
+
+    @abstractmethod
+    def copy(self) -> 'Matcher':
+        """Matcher mới ở cùng vị trí, dùng chung bảng đã biên dịch"""
+
+
+class DFAMatcher(Matcher):
+    """Bộ so khớp tăng dần trên bảng chuyển tiếp của CompiledDFA (vị trí là một số nguyên)"""
+
+    def __init__(self, compiled: CompiledDFA, live: bytes = None):
+        """
+        Args:
+            compiled: DFA đã biên dịch
+            live: live[state] = 1 nếu state còn tới được trạng thái chấp nhận
+                  (tính bằng live_states() nếu không truyền vào)
+        """
+        self.compiled = compiled
+        self.live = live if live is not None else DFAMatcher.live_states(compiled)
+        self.reset()
+
+    @staticmethod
+    def live_states(compiled: CompiledDFA) -> bytes:
+        """Các trạng thái tới được trạng thái chấp nhận (BFS ngược từ các trạng thái chấp nhận)"""
+        n = compiled.dead
+        num_columns = compiled.num_columns
+        table = compiled.table
+        predecessors: List[List[int]] = [[] for _ in range(n + 1)]
+        for state in range(n):
+            row = state * num_columns
+            for column in range(num_columns):
+                predecessors[table[row + column]].append(state)
+
+        live = bytearray(n + 1)
+        queue = deque(state for state in range(n) if compiled.accepting[state])
+        for state in queue:
+            live[state] = 1
+        while queue:
+            for previous in predecessors[queue.popleft()]:
+                if not live[previous]:
+                    live[previous] = 1
+                    queue.append(previous)
+        return bytes(live)
+
+    def reset(self):
+        start = self.compiled.start
+        self.state = start if self.live[start] else self.compiled.dead
+        self.consumed = 0
+
+    def feed(self, chunk: str) -> bool:
+        compiled = self.compiled
+        table = compiled.table
+        symbol_index = compiled.symbol_index
+        num_columns = compiled.num_columns
+        dead = compiled.dead
+        live = self.live
+        state = self.state
+        consumed = self.consumed
+
+        for symbol in chunk:
+            if state == dead:
+                break
+            column = symbol_index.get(symbol)
+            state = dead if column is None else table[state * num_columns + column]
+            if not live[state]:
+                state = dead
+            consumed += 1
+
+        self.state = state
+        self.consumed = consumed
+        return state != dead
+
+    def is_accepting(self) -> bool:
+        return self.compiled.accepting[self.state] == 1
+
+    def is_dead(self) -> bool:
+        return self.state == self.compiled.dead
+
+    def snapshot(self) -> Tuple[int, int]:
+        """(chỉ số trạng thái trong bảng đã biên dịch, consumed)"""
+        return self.state, self.consumed
+
+    def restore(self, snapshot: Tuple[int, int]):
+        self.state, self.consumed = snapshot
+
+    def copy(self) -> 'DFAMatcher':
+        clone = DFAMatcher(self.compiled, self.live)
+        clone.restore(self.snapshot())
+        return clone
+
+    def current_state(self):
+        """Tên trạng thái hiện tại (None nếu đã chết)"""
+        return None if self.is_dead() else self.compiled.state_names[self.state]
+
+    def __repr__(self):
+        return f"DFAMatcher(state={self.current_state()!r}, consumed={self.consumed})"
+
+
+class NFAMatcher(Matcher):
+    """
+    Bộ so khớp tăng dần trên dạng bitset của CompiledNFA (vị trí là một bitmask)
+    Dùng được cho cả ε-NFA vì epsilon-closure đã được gộp sẵn khi biên dịch
+    """
+
+    def __init__(self, compiled: CompiledNFA, live_mask: int = None):
+        """
+        Args:
+            compiled: NFA / ε-NFA đã biên dịch
+            live_mask: Bitmask các trạng thái còn tới được trạng thái chấp nhận
+                       (tính bằng live_mask_of() nếu không truyền vào)
+        """
+        self.compiled = compiled
+        self.live_mask = live_mask if live_mask is not None else NFAMatcher.live_mask_of(compiled)
+        self.reset()
+
+    @staticmethod
+    def live_mask_of(compiled: CompiledNFA) -> int:
+        """Bitmask các trạng thái tới được trạng thái chấp nhận (BFS ngược)"""
+        n = compiled.num_states
+        predecessors: List[List[int]] = [[] for _ in range(n)]
+        for row in compiled.successors:
+            for state, targets in enumerate(row):
+                while targets:
+                    low = targets & -targets
+                    predecessors[low.bit_length() - 1].append(state)
+                    targets ^= low
+
+        live = compiled.accept_mask
+        queue = deque(state for state in range(n) if live >> state & 1)
+        while queue:
+            for previous in predecessors[queue.popleft()]:
+                if not live >> previous & 1:
+                    live |= 1 << previous
+                    queue.append(previous)
+        return live
+
+    def reset(self):
+        self.mask = self.compiled.start_mask & self.live_mask
+        self.consumed = 0
+
+    def feed(self, chunk: str) -> bool:
+        compiled = self.compiled
+        symbol_index = compiled.symbol_index
+        successors = compiled.successors
+        live_mask = self.live_mask
+        mask = self.mask
+        consumed = self.consumed
+
+        for symbol in chunk:
+            if not mask:
+                break
+            column = symbol_index.get(symbol)
+            next_mask = 0
+            if column is not None:
+                row = successors[column]
+                while mask:
+                    low = mask & -mask
+                    next_mask |= row[low.bit_length() - 1]
+                    mask ^= low
+            mask = next_mask & live_mask
+            consumed += 1
+
+        self.mask = mask
+        self.consumed = consumed
+        return mask != 0
+
+    def is_accepting(self) -> bool:
+        return bool(self.mask & self.compiled.accept_mask)
+
+    def is_dead(self) -> bool:
+        return self.mask == 0
+
+    def snapshot(self) -> Tuple[int, int]:
+        """
+        (bitmask các trạng thái đang sống, consumed)
+        Phần tử đầu không phải chỉ số trạng thái: bit i bật nếu trạng thái i đang sống,
+        là số nguyên Python không giới hạn số bit (có thể lớn hơn 64 bit)
+        """
+        return self.mask, self.consumed
+
+    def restore(self, snapshot: Tuple[int, int]):
+        self.mask, self.consumed = snapshot
+
+    def copy(self) -> 'NFAMatcher':
+        clone = NFAMatcher(self.compiled, self.live_mask)
+        clone.restore(self.snapshot())
+        return clone
+
+    def current_states(self):
+        """Tên các trạng thái NFA đang sống"""
+        return self.compiled.names_of(self.mask)
+
+    def __repr__(self):
+        return f"NFAMatcher(states={sorted(self.current_states())}, consumed={self.consumed})"
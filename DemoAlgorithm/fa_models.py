@@ -2,17 +2,55 @@
 FA Models - Định nghĩa các lớp đại diện cho DFA, NFA, ε-NFA
 """
 
-from typing import Set, Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
+import json
+from typing import Set, Dict, List, Tuple, Optional, Iterator, Iterable, Union
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Mapping, MutableMapping, MutableSet
+
+
+# Mỗi cạnh (ký tự, đích) được mã hóa thành một số nguyên 64 bit: id_ký_tự << 32 | id_đích
+_TARGET_BITS = 32
+_TARGET_MASK = (1 << _TARGET_BITS) - 1
+
+# Giá trị trường 'layout' của dạng cột gọn (to_dict(compact=True))
+COLUMNAR_LAYOUT = "columnar"
 
 
-@dataclass
 class State:
-    """Đại diện cho một trạng thái trong automata"""
-    name: str
-    is_start: bool = False
-    is_accept: bool = False
+    """
+    Đại diện cho một trạng thái trong automata
+    State lấy từ khung nhìn FiniteAutomata.states gắn với automata đó:
+    gán is_start / is_accept sẽ ghi thẳng vào automata (tên trạng thái không đổi được)
+    """
+    
+    __slots__ = ('name', 'is_start', 'is_accept', '_fa')
+    
+    def __init__(self, name: str, is_start: bool = False, is_accept: bool = False,
+                 _fa: Optional['FiniteAutomata'] = None):
+        set_slot = super().__setattr__
+        set_slot('name', name)
+        set_slot('is_start', is_start)
+        set_slot('is_accept', is_accept)
+        set_slot('_fa', _fa)
+    
+    def __setattr__(self, name, value):
+        if name not in ('is_start', 'is_accept'):
+            raise AttributeError(f"{self.__class__.__name__}.{name} is read-only")
+        fa = self._fa
+        if fa is not None:
+            fa._invalidate_cache()
+            state = fa._state_id(self.name)
+            if name == 'is_accept':
+                fa._accepting[state] = 1 if value else 0
+            elif value:
+                fa._start = state
+            elif fa._start == state:
+                fa._start = -1
+        super().__setattr__(name, value)
+    
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.is_start, self.is_accept))
     
     def __hash__(self):
         return hash(self.name)
@@ -32,70 +70,612 @@ class State:
         return f"State({self.name}{markers_str})"
 
 
-@dataclass
 class Transition:
-    """Đại diện cho một chuyển tiếp"""
-    from_state: str
-    symbol: str
-    to_states: Set[str]  # Có thể có nhiều trạng thái (cho NFA)
+    """Đại diện cho một chuyển tiếp (bất biến)"""
+    
+    __slots__ = ('from_state', 'symbol', 'to_states')
+    
+    def __init__(self, from_state: str, symbol: str, to_states: Iterable[str]):
+        set_slot = super().__setattr__
+        set_slot('from_state', from_state)
+        set_slot('symbol', symbol)
+        set_slot('to_states', frozenset(to_states))  # Có thể có nhiều trạng thái (cho NFA)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+    
+    def __reduce__(self):
+        return (self.__class__, (self.from_state, self.symbol, self.to_states))
+    
+    def __eq__(self, other):
+        if isinstance(other, Transition):
+            return (self.from_state, self.symbol, self.to_states) == (other.from_state, other.symbol, other.to_states)
+        return False
+    
+    def __hash__(self):
+        return hash((self.from_state, self.symbol, self.to_states))
     
     def __repr__(self):
         to_str = ','.join(sorted(self.to_states))
         return f"{self.from_state} --{self.symbol}--> {{{to_str}}}"
 
 
+def _group_edges(edges) -> Dict[int, List[int]]:
+    """Gom các cạnh đã mã hóa của một trạng thái theo id ký tự: {id_ký_tự: [id_đích, ...]}"""
+    by_symbol: Dict[int, List[int]] = {}
+    for edge in edges:
+        by_symbol.setdefault(edge >> _TARGET_BITS, []).append(edge & _TARGET_MASK)
+    return by_symbol
+
+
+def _discard(rows: List[Optional[array]], state: int, value: int) -> bool:
+    """Xóa value khỏi danh sách kề rows[state] (hàng rỗng trở thành None), trả về True nếu có xóa"""
+    row = rows[state]
+    if not row or value not in row:
+        return False
+    row.remove(value)
+    if not row:
+        rows[state] = None
+    return True
+
+
+_set_add = set.add
+
+
+class AlphabetSet(set):
+    """
+    Alphabet của automata: một set thông thường, nhưng mọi thao tác sửa tại chỗ
+    (add, discard, update, |=, ...) đều xóa các dạng biên dịch đã lưu của automata
+    Gán fa.alphabet = một set khác sẽ chép set đó vào một AlphabetSet mới
+    """
+    
+    __slots__ = ('_fa',)
+    
+    def __init__(self, fa: 'FiniteAutomata', symbols: Iterable[str] = ()):
+        super().__init__(symbols)
+        self._fa = fa
+    
+    def __reduce__(self):
+        return (self.__class__, (self._fa, list(self)))
+
+
+def _invalidating(method):
+    def invalidating(self, *args):
+        self._fa._invalidate_cache()
+        return method(self, *args)
+    invalidating.__name__ = method.__name__
+    invalidating.__doc__ = method.__doc__
+    return invalidating
+
+
+for _method in ('add', 'discard', 'remove', 'pop', 'clear', 'update', 'difference_update',
+                'intersection_update', 'symmetric_difference_update',
+                '__ior__', '__iand__', '__isub__', '__ixor__'):
+    setattr(AlphabetSet, _method, _invalidating(getattr(set, _method)))
+del _method
+
+
+class StatesView(MutableMapping):
+    """
+    Khung nhìn {tên: State} trên bảng trạng thái số nguyên (chỉ gồm các trạng thái đã add_state)
+    Ghi xuyên: fa.states[tên] = State(...) khai báo trạng thái theo cờ của State,
+    del fa.states[tên] bỏ khai báo (các chuyển tiếp của trạng thái vẫn giữ nguyên)
+    """
+    
+    __slots__ = ('_fa',)
+    
+    def __init__(self, fa: 'FiniteAutomata'):
+        self._fa = fa
+    
+    def __getitem__(self, name: str) -> State:
+        fa = self._fa
+        state = fa._ids.get(name)
+        if state is None or not fa._declared[state]:
+            raise KeyError(name)
+        return State(name, state == fa._start, fa._accepting[state] == 1, fa)
+    
+    def __setitem__(self, name: str, state: State):
+        fa = self._fa
+        fa.add_state(name)
+        state_id = fa._ids[name]
+        fa._accepting[state_id] = 1 if state.is_accept else 0
+        if state.is_start:
+            fa._start = state_id
+        elif fa._start == state_id:
+            fa._start = -1
+    
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        fa = self._fa
+        fa._invalidate_cache()
+        state = fa._ids[name]
+        fa._declared[state] = 0
+        fa._num_declared -= 1
+        fa._accepting[state] = 0
+        if fa._start == state:
+            fa._start = -1
+    
+    def __contains__(self, name) -> bool:
+        state = self._fa._ids.get(name)
+        return state is not None and self._fa._declared[state] == 1
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self._fa._names
+        for state, declared in enumerate(self._fa._declared):
+            if declared:
+                yield names[state]
+    
+    def __len__(self) -> int:
+        return self._fa._num_declared
+    
+    def __repr__(self):
+        return f"StatesView({list(self)})"
+
+
+class AcceptStatesView(MutableSet):
+    """Khung nhìn {tên trạng thái chấp nhận} trên mảng _accepting; add / discard ghi thẳng vào automata"""
+    
+    __slots__ = ('_fa',)
+    
+    def __init__(self, fa: 'FiniteAutomata'):
+        self._fa = fa
+    
+    @classmethod
+    def _from_iterable(cls, iterable) -> Set[str]:
+        # Kết quả của &, |, -, ^ là set thông thường
+        return set(iterable)
+    
+    def __contains__(self, name) -> bool:
+        state = self._fa._ids.get(name)
+        return state is not None and self._fa._accepting[state] == 1
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self._fa._names
+        for state, accepting in enumerate(self._fa._accepting):
+            if accepting:
+                yield names[state]
+    
+    def __len__(self) -> int:
+        return self._fa._accepting.count(1)
+    
+    def add(self, name: str):
+        fa = self._fa
+        fa._invalidate_cache()
+        fa._accepting[fa._state_id(name)] = 1
+    
+    def discard(self, name: str):
+        if name in self:
+            fa = self._fa
+            fa._invalidate_cache()
+            fa._accepting[fa._ids[name]] = 0
+    
+    def copy(self) -> Set[str]:
+        return set(self)
+    
+    def __repr__(self):
+        return f"AcceptStatesView({set(self)})"
+
+
+class TargetsView(MutableSet):
+    """
+    Khung nhìn {to_state, ...} của một cặp (trạng thái, ký tự); symbol=None là các đích ε
+    add / discard thêm / xóa chuyển tiếp tương ứng của automata
+    """
+    
+    __slots__ = ('_fa', '_state', '_symbol')
+    
+    def __init__(self, fa: 'FiniteAutomata', state: int, symbol: Optional[str]):
+        self._fa = fa
+        self._state = state
+        self._symbol = symbol
+    
+    @classmethod
+    def _from_iterable(cls, iterable) -> Set[str]:
+        return set(iterable)
+    
+    def _targets(self) -> List[int]:
+        fa = self._fa
+        if self._symbol is None:
+            return list(fa._epsilon[self._state] or ())
+        symbol_id = fa._symbol_ids.get(self._symbol)
+        edges = fa._edges[self._state]
+        if symbol_id is None or not edges:
+            return []
+        return [edge & _TARGET_MASK for edge in edges if edge >> _TARGET_BITS == symbol_id]
+    
+    def __contains__(self, name) -> bool:
+        target = self._fa._ids.get(name)
+        return target is not None and target in self._targets()
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self._fa._names
+        for target in self._targets():
+            yield names[target]
+    
+    def __len__(self) -> int:
+        return len(self._targets())
+    
+    def add(self, name: str):
+        fa = self._fa
+        if self._symbol is None:
+            fa.add_epsilon_transition(fa._names[self._state], name)
+        else:
+            fa.add_transition(fa._names[self._state], self._symbol, name)
+    
+    def discard(self, name: str):
+        fa = self._fa
+        target = fa._ids.get(name)
+        if target is None:
+            return
+        if self._symbol is None:
+            removed = _discard(fa._epsilon, self._state, target)
+        else:
+            symbol_id = fa._symbol_ids.get(self._symbol)
+            removed = symbol_id is not None and _discard(fa._edges, self._state,
+                                                          symbol_id << _TARGET_BITS | target)
+        if removed:
+            fa._invalidate_cache()
+    
+    def copy(self) -> Set[str]:
+        return set(self)
+    
+    def __repr__(self):
+        return repr(set(self))
+
+
+class TransitionRowView(MutableMapping):
+    """Khung nhìn {symbol: {to_state, ...}} các chuyển tiếp đi ra của một trạng thái"""
+    
+    __slots__ = ('_fa', '_state')
+    
+    def __init__(self, fa: 'FiniteAutomata', state: int):
+        self._fa = fa
+        self._state = state
+    
+    def __getitem__(self, symbol: str) -> TargetsView:
+        if symbol not in self:
+            raise KeyError(symbol)
+        return TargetsView(self._fa, self._state, symbol)
+    
+    def __setitem__(self, symbol: str, targets: Iterable[str]):
+        targets = list(targets)  # targets có thể chính là khung nhìn của ô này
+        self.pop(symbol, None)
+        row = TargetsView(self._fa, self._state, symbol)
+        for target in targets:
+            row.add(target)
+    
+    def __delitem__(self, symbol: str):
+        fa = self._fa
+        symbol_id = fa._symbol_ids.get(symbol)
+        edges = fa._edges[self._state]
+        if symbol_id is None or not edges:
+            raise KeyError(symbol)
+        kept = array('q', (edge for edge in edges if edge >> _TARGET_BITS != symbol_id))
+        if len(kept) == len(edges):
+            raise KeyError(symbol)
+        fa._invalidate_cache()
+        fa._edges[self._state] = kept or None
+    
+    def __contains__(self, symbol) -> bool:
+        fa = self._fa
+        symbol_id = fa._symbol_ids.get(symbol)
+        edges = fa._edges[self._state]
+        return symbol_id is not None and bool(edges) and any(edge >> _TARGET_BITS == symbol_id for edge in edges)
+    
+    def __iter__(self) -> Iterator[str]:
+        symbols = self._fa._symbols
+        for symbol_id in _group_edges(self._fa._edges[self._state] or ()):
+            yield symbols[symbol_id]
+    
+    def __len__(self) -> int:
+        return len(_group_edges(self._fa._edges[self._state] or ()))
+    
+    def __repr__(self):
+        return repr({symbol: set(targets) for symbol, targets in self.items()})
+
+
+class TransitionsView(MutableMapping):
+    """
+    Khung nhìn {from_state: {symbol: {to_state, ...}}} trên danh sách kề số nguyên
+    (chỉ gồm các trạng thái có chuyển tiếp đi ra). Ghi xuyên ở mọi cấp:
+    fa.transitions[s][a].add(t), fa.transitions[s][a] = {...}, del fa.transitions[s], ...
+    """
+    
+    __slots__ = ('_fa',)
+    
+    def __init__(self, fa: 'FiniteAutomata'):
+        self._fa = fa
+    
+    def __getitem__(self, name: str) -> TransitionRowView:
+        state = self._fa._ids.get(name)
+        if state is None or not self._fa._edges[state]:
+            raise KeyError(name)
+        return TransitionRowView(self._fa, state)
+    
+    def __setitem__(self, name: str, row: Mapping):
+        row = {symbol: list(targets) for symbol, targets in row.items()}
+        self.pop(name, None)
+        fa = self._fa
+        for symbol, targets in row.items():
+            for target in targets:
+                fa.add_transition(name, symbol, target)
+    
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        self._fa._invalidate_cache()
+        self._fa._edges[self._fa._ids[name]] = None
+    
+    def __contains__(self, name) -> bool:
+        state = self._fa._ids.get(name)
+        return state is not None and bool(self._fa._edges[state])
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self._fa._names
+        for state, edges in enumerate(self._fa._edges):
+            if edges:
+                yield names[state]
+    
+    def __len__(self) -> int:
+        return sum(1 for edges in self._fa._edges if edges)
+    
+    def __repr__(self):
+        return f"TransitionsView({dict(self.items())})"
+
+
+class EpsilonTransitionsView(MutableMapping):
+    """Khung nhìn {from_state: {to_state, ...}} trên danh sách kề epsilon số nguyên (ghi xuyên như TransitionsView)"""
+    
+    __slots__ = ('_fa',)
+    
+    def __init__(self, fa: 'EpsilonNFA'):
+        self._fa = fa
+    
+    def __getitem__(self, name: str) -> TargetsView:
+        state = self._fa._ids.get(name)
+        if state is None or not self._fa._epsilon[state]:
+            raise KeyError(name)
+        return TargetsView(self._fa, state, None)
+    
+    def __setitem__(self, name: str, targets: Iterable[str]):
+        targets = list(targets)
+        self.pop(name, None)
+        for target in targets:
+            self._fa.add_epsilon_transition(name, target)
+    
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        self._fa._invalidate_cache()
+        self._fa._epsilon[self._fa._ids[name]] = None
+    
+    def __contains__(self, name) -> bool:
+        state = self._fa._ids.get(name)
+        return state is not None and bool(self._fa._epsilon[state])
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self._fa._names
+        for state, targets in enumerate(self._fa._epsilon):
+            if targets:
+                yield names[state]
+    
+    def __len__(self) -> int:
+        return sum(1 for targets in self._fa._epsilon if targets)
+    
+    def __repr__(self):
+        return f"EpsilonTransitionsView({dict(self.items())})"
+
+
 class FiniteAutomata(ABC):
-    """Lớp cơ sở cho tất cả các loại automata"""
+    """
+    Lớp cơ sở cho tất cả các loại automata
+    
+    Biểu diễn bên trong là số nguyên:
+    - Mỗi tên trạng thái được gán một id liên tiếp 0..n-1 (_ids: tên -> id, _names: id -> tên)
+    - Mỗi ký tự được gán một id (_symbol_ids / _symbols)
+    - _edges[id] = array('q') các cạnh đi ra, mỗi cạnh là id_ký_tự << 32 | id_đích
+    - _accepting[id] = 1 nếu là trạng thái chấp nhận, _start = id trạng thái bắt đầu (-1 nếu chưa có)
+    
+    API theo tên (states, transitions, start_state, accept_states) là các khung nhìn ghi xuyên trên
+    biểu diễn này: sửa qua khung nhìn (fa.accept_states.add(...), fa.transitions[s][a].add(...), ...)
+    sửa thẳng các mảng số nguyên và xóa các dạng biên dịch đã lưu. alphabet là một AlphabetSet
+    """
     
     def __init__(self):
-        self.states: Dict[str, State] = {}
+        self._cache: Dict[str, object] = {}
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._declared = bytearray()  # 1 nếu trạng thái đã được add_state (có trong states)
+        self._num_declared = 0
+        self._accepting = bytearray()
+        self._start = -1
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._edges: List[Optional[array]] = []
         self.alphabet: Set[str] = set()
-        self.transitions: Dict[str, Dict[str, Set[str]]] = {}
-        self.start_state: Optional[str] = None
-        self.accept_states: Set[str] = set()
+    
+    def __setattr__(self, name, value):
+        # Gán lại một thuộc tính công khai (alphabet, accept_states, ...) làm dạng biên dịch cũ không còn đúng
+        if not name.startswith('_'):
+            self._invalidate_cache()
+            if name == 'alphabet' and not (isinstance(value, AlphabetSet) and value._fa is self):
+                value = AlphabetSet(self, value)
+        super().__setattr__(name, value)
+    
+    def _invalidate_cache(self):
+        """Xóa các dạng biên dịch đã lưu (gọi mỗi khi automata thay đổi)"""
+        cache = self.__dict__.get('_cache')
+        if cache:
+            cache.clear()
+    
+    def _state_id(self, name: str) -> int:
+        """Id của trạng thái (cấp id mới nếu tên chưa xuất hiện)"""
+        state = self._ids.get(name)
+        if state is None:
+            state = len(self._names)
+            self._ids[name] = state
+            self._names.append(name)
+            self._declared.append(0)
+            self._accepting.append(0)
+            self._edges.append(None)
+        return state
+    
+    # ==================== KHUNG NHÌN THEO TÊN ====================
+    
+    @property
+    def states(self) -> StatesView:
+        """{tên: State} của các trạng thái đã thêm bằng add_state"""
+        return StatesView(self)
+    
+    @property
+    def transitions(self) -> TransitionsView:
+        """{from_state: {symbol: {to_state, ...}}} (ghi xuyên, xem TransitionsView)"""
+        return TransitionsView(self)
+    
+    @property
+    def start_state(self) -> Optional[str]:
+        return self._names[self._start] if self._start >= 0 else None
+    
+    @start_state.setter
+    def start_state(self, name: Optional[str]):
+        self._start = -1 if name is None else self._state_id(name)
+    
+    @property
+    def accept_states(self) -> AcceptStatesView:
+        return AcceptStatesView(self)
+    
+    @accept_states.setter
+    def accept_states(self, names: Iterable[str]):
+        states = [self._state_id(name) for name in names]
+        accepting = bytearray(len(self._names))
+        for state in states:
+            accepting[state] = 1
+        self._accepting = accepting
+    
+    # ==================== XÂY DỰNG ====================
     
     def add_state(self, name: str, is_start: bool = False, is_accept: bool = False):
         """Thêm một trạng thái"""
-        if name not in self.states:
-            self.states[name] = State(name, is_start, is_accept)
+        self._invalidate_cache()
+        state = self._state_id(name)
+        if not self._declared[state]:
+            self._declared[state] = 1
+            self._num_declared += 1
             if is_start:
-                self.start_state = name
+                self._start = state
             if is_accept:
-                self.accept_states.add(name)
+                self._accepting[state] = 1
     
     def add_transition(self, from_state: str, symbol: str, to_state: str):
         """Thêm một chuyển tiếp"""
-        if from_state not in self.transitions:
-            self.transitions[from_state] = {}
-        if symbol not in self.transitions[from_state]:
-            self.transitions[from_state][symbol] = set()
+        if self._cache:
+            self._cache.clear()
+        ids = self._ids
+        source = ids.get(from_state)
+        if source is None:
+            source = self._state_id(from_state)
+        target = ids.get(to_state)
+        if target is None:
+            target = self._state_id(to_state)
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbols)
+            self._symbol_ids[symbol] = symbol_id
+            self._symbols.append(symbol)
         
-        self.transitions[from_state][symbol].add(to_state)
-        self.alphabet.add(symbol)
+        edge = symbol_id << _TARGET_BITS | target
+        edges = self._edges[source]
+        if edges is None:
+            self._edges[source] = array('q', (edge,))
+        elif edge not in edges:
+            edges.append(edge)
+        _set_add(self.alphabet, symbol)  # Cache đã được xóa ở trên
     
     def get_transitions(self, state: str, symbol: str) -> Set[str]:
         """Lấy tập hợp trạng thái tiếp theo từ một trạng thái với một ký tự"""
-        if state not in self.transitions:
+        source = self._ids.get(state)
+        symbol_id = self._symbol_ids.get(symbol)
+        if source is None or symbol_id is None or not self._edges[source]:
             return set()
-        if symbol not in self.transitions[state]:
-            return set()
-        return self.transitions[state][symbol].copy()
+        names = self._names
+        return {names[edge & _TARGET_MASK] for edge in self._edges[source] if edge >> _TARGET_BITS == symbol_id}
+    
+    def _assign_core(self, names: List[str], accepting, start: int, symbols: List[str],
+                     edges: List[Optional[array]]):
+        """
+        Gán thẳng biểu diễn số nguyên (dùng khi dựng automata hàng loạt, không qua add_transition)
+        Mọi trạng thái đều được coi là đã add_state; các cạnh phải không trùng nhau
+        """
+        self._invalidate_cache()
+        self._names = list(names)
+        self._ids = {name: state for state, name in enumerate(self._names)}
+        self._declared = bytearray(b'\x01') * len(self._names)
+        self._num_declared = len(self._names)
+        self._accepting = bytearray(accepting)
+        self._start = start
+        self._symbols = list(symbols)
+        self._symbol_ids = {symbol: i for i, symbol in enumerate(self._symbols)}
+        self._edges = list(edges)
+        self.alphabet = AlphabetSet(self, self._symbols)
+    
+    def copy(self, as_type: Optional[type] = None) -> 'FiniteAutomata':
+        """
+        Bản sao độc lập, chép thẳng các mảng số nguyên (không thêm lại từng chuyển tiếp)
+        
+        Args:
+            as_type: Loại automata của bản sao (mặc định: cùng loại), ví dụ DFA -> NFA / ε-NFA
+        """
+        result = (as_type or type(self))()
+        epsilon = getattr(self, '_epsilon', None)
+        if not isinstance(result, EpsilonNFA) and epsilon is not None and any(epsilon):
+            raise ValueError(f"Cannot copy epsilon transitions into {result.__class__.__name__}")
+        result._names = list(self._names)
+        result._ids = dict(self._ids)
+        result._declared = bytearray(self._declared)
+        result._num_declared = self._num_declared
+        result._accepting = bytearray(self._accepting)
+        result._start = self._start
+        result._symbols = list(self._symbols)
+        result._symbol_ids = dict(self._symbol_ids)
+        result._edges = [array('q', edges) if edges else None for edges in self._edges]
+        if isinstance(result, EpsilonNFA):
+            result._epsilon = ([array('i', targets) if targets else None for targets in epsilon]
+                               if epsilon is not None else [None] * len(self._names))
+        result.alphabet = AlphabetSet(result, self.alphabet)
+        return result
+    
+    def iter_transitions(self) -> Iterator[Tuple[str, str, str]]:
+        """Duyệt mọi chuyển tiếp dạng (from_state, symbol, to_state) theo tên, không dựng lại các hàng"""
+        names = self._names
+        symbols = self._symbols
+        for from_state, edges in enumerate(self._edges):
+            if edges:
+                name = names[from_state]
+                for edge in edges:
+                    yield name, symbols[edge >> _TARGET_BITS], names[edge & _TARGET_MASK]
     
     def accepts_string(self, string: str) -> bool:
         """Kiểm tra xem automata có chấp nhận chuỗi không"""
         raise NotImplementedError("Subclass must implement this method")
     
-    def to_dict(self) -> dict:
-        """Chuyển đổi automata thành dictionary"""
+    def to_dict(self, compact: bool = False) -> dict:
+        """
+        Chuyển đổi automata thành dictionary
+        
+        Args:
+            compact: True -> dạng cột gọn (xem _to_columnar), mặc định là dạng mỗi chuyển tiếp một dict
+        """
+        if compact:
+            return self._to_columnar()
+        
         transitions_list = []
-        for from_state in self.transitions:
-            for symbol in self.transitions[from_state]:
-                for to_state in self.transitions[from_state][symbol]:
-                    transitions_list.append({
-                        'from': from_state,
-                        'symbol': symbol,
-                        'to': to_state
-                    })
+        for from_state, symbol, to_state in self.iter_transitions():
+            transitions_list.append({
+                'from': from_state,
+                'symbol': symbol,
+                'to': to_state
+            })
         
         return {
             'states': [{'name': s.name, 'start': s.is_start, 'accept': s.is_accept} 
@@ -107,53 +687,551 @@ class FiniteAutomata(ABC):
             'type': self.__class__.__name__
         }
     
+    def _to_columnar(self) -> dict:
+        """
+        Dạng cột: trạng thái và ký tự được đánh số theo id, các chuyển tiếp là ba mảng song song
+        from[i] --symbol[i]--> to[i]; implicit_states = id các trạng thái chỉ xuất hiện trong chuyển tiếp
+        """
+        sources, symbols, targets = [], [], []
+        for from_state, edges in enumerate(self._edges):
+            if edges:
+                sources.extend([from_state] * len(edges))
+                symbols.extend(edge >> _TARGET_BITS for edge in edges)
+                targets.extend(edge & _TARGET_MASK for edge in edges)
+        
+        return {
+            'type': self.__class__.__name__,
+            'layout': COLUMNAR_LAYOUT,
+            'states': list(self._names),
+            'implicit_states': [state for state, declared in enumerate(self._declared) if not declared],
+            'alphabet': sorted(self.alphabet),
+            'symbols': list(self._symbols),
+            'start': self._start,
+            'accept': [state for state, accepting in enumerate(self._accepting) if accepting],
+            'from': sources,
+            'symbol': symbols,
+            'to': targets
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FiniteAutomata':
+        """
+        Dựng lại automata từ kết quả của to_dict() (cả hai dạng)
+        Gọi trên FiniteAutomata thì loại automata được lấy theo data['type']
+        """
+        fa_type = MODEL_TYPES.get(data.get('type', cls.__name__))
+        if fa_type is None:
+            raise ValueError(f"Unknown automaton type: {data.get('type')!r}")
+        if cls is not FiniteAutomata and fa_type is not cls:
+            raise ValueError(f"Cannot load {fa_type.__name__} data as {cls.__name__}")
+        
+        fa = fa_type()
+        if data.get('layout') == COLUMNAR_LAYOUT:
+            fa._load_columnar(data)
+        else:
+            fa._load_verbose(data)
+        return fa
+    
+    def _load_verbose(self, data: dict):
+        for state in data.get('states', ()):
+            self.add_state(state['name'])
+        for transition in data.get('transitions', ()):
+            self.add_transition(transition['from'], transition['symbol'], transition['to'])
+        self.start_state = data.get('start_state')
+        self.accept_states = data.get('accept_states', ())
+        if 'alphabet' in data:
+            self.alphabet = set(data['alphabet'])
+    
+    def _load_columnar(self, data: dict):
+        """Dựng thẳng các mảng số nguyên từ dạng cột (không qua add_transition)"""
+        names = data['states']
+        sources, symbols, targets = data['from'], data['symbol'], data['to']
+        if not len(sources) == len(symbols) == len(targets):
+            raise ValueError("Columns 'from', 'symbol' and 'to' must have the same length")
+        
+        buckets: List[Optional[list]] = [None] * len(names)
+        for source, symbol, target in zip(sources, symbols, targets):
+            bucket = buckets[source]
+            if bucket is None:
+                buckets[source] = [symbol << _TARGET_BITS | target]
+            else:
+                bucket.append(symbol << _TARGET_BITS | target)
+        # dict.fromkeys: bỏ cạnh trùng, giữ nguyên thứ tự
+        edges = [array('q', dict.fromkeys(bucket)) if bucket else None for bucket in buckets]
+        
+        accepting = bytearray(len(names))
+        for state in data.get('accept', ()):
+            accepting[state] = 1
+        
+        self._assign_core(names, accepting, data.get('start', -1), data.get('symbols', ()), edges)
+        for state in data.get('implicit_states', ()):
+            self._declared[state] = 0
+            self._num_declared -= 1
+        if 'alphabet' in data:
+            self.alphabet = set(data['alphabet'])
+    
+    def save(self, path: str, compact: bool = True):
+        """Ghi automata ra file JSON (mặc định dạng cột gọn)"""
+        with open(path, "w", encoding="utf-8") as f:
+            if compact:
+                json.dump(self.to_dict(compact=True), f, ensure_ascii=False, separators=(',', ':'))
+            else:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+    
+    @classmethod
+    def load(cls, path: str) -> 'FiniteAutomata':
+        """Đọc automata đã ghi bằng save() (một lần json.loads, nhận cả hai dạng)"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.loads(f.read()))
+    
+    def alphabet_partition(self) -> 'AlphabetPartition':
+        """Phân hoạch alphabet thành các lớp ký tự tương đương (được lưu lại cho tới khi automata thay đổi)"""
+        partition = self._cache.get('alphabet_partition')
+        if partition is None:
+            partition = AlphabetPartition.from_automaton(self)
+            self._cache['alphabet_partition'] = partition
+        return partition
+    
+    def matcher(self):
+        """
+        Bộ so khớp tăng dần (xem fa_matcher): feed() từng phần chuỗi, snapshot() / restore()
+        Bảng đã biên dịch và tập trạng thái sống được lưu lại, mỗi lần gọi chỉ tạo một matcher mới
+        """
+        prototype = self._cache.get('matcher')
+        if prototype is None:
+            from fa_matcher import DFAMatcher, NFAMatcher
+            compiled = self.compile()
+            prototype = DFAMatcher(compiled) if isinstance(compiled, CompiledDFA) else NFAMatcher(compiled)
+            self._cache['matcher'] = prototype
+        return prototype.copy()
+    
+    def _symbol_columns(self) -> List[int]:
+        """
+        Cột (lớp ký tự trong alphabet_partition) của mỗi id ký tự đại diện;
+        -1 cho các ký tự còn lại (cùng lớp thì cùng đích, chỉ cần đọc cạnh của ký tự đại diện)
+        """
+        columns = [-1] * len(self._symbols)
+        for column, symbols in enumerate(self.alphabet_partition().classes):
+            symbol = self._symbol_ids.get(symbols[0])
+            if symbol is not None:
+                columns[symbol] = column
+        return columns
+    
+    def _state_names(self) -> List[str]:
+        """Danh sách tên trạng thái theo id (kể cả trạng thái chỉ xuất hiện trong chuyển tiếp)"""
+        return list(self._names)
+    
     def __repr__(self):
-        return f"{self.__class__.__name__}(states={len(self.states)}, transitions={sum(len(v) for v in self.transitions.values())})"
+        pairs = sum(len({edge >> _TARGET_BITS for edge in edges}) for edges in self._edges if edges)
+        return f"{self.__class__.__name__}(states={len(self.states)}, transitions={pairs})"
 
 
-class DFA(FiniteAutomata):
+class AlphabetPartition:
     """
-    Deterministic Finite Automata (Automata Hữu hạn Xác định)
-    - Từ mỗi trạng thái, với mỗi ký tự có đúng 1 chuyển tiếp
+    Phân hoạch alphabet thành các lớp tương đương (nén alphabet)
+    
+    Hai ký tự cùng lớp nếu ở MỌI trạng thái chúng dẫn tới cùng một tập trạng thái.
+    Ví dụ ε-NFA tiếng Anh: 52 chữ cái chỉ tạo thành 1 lớp, khoảng trắng là 1 lớp khác.
+    Các thuật toán chỉ cần xử lý mỗi lớp một lần (qua ký tự đại diện - ký tự nhỏ nhất của lớp)
     """
     
-    def get_transitions(self, state: str, symbol: str) -> str:
-        """Trong DFA, trả về đúng 1 trạng thái (hoặc None)"""
-        if state not in self.transitions:
-            return None
-        if symbol not in self.transitions[state]:
-            return None
-        return next(iter(self.transitions[state][symbol]))
+    __slots__ = ('classes', 'class_of')
+    
+    def __init__(self, classes):
+        set_slot = super().__setattr__
+        set_slot('classes', tuple(tuple(symbols) for symbols in classes))
+        set_slot('class_of', {symbol: i for i, symbols in enumerate(self.classes) for symbol in symbols})
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+    
+    def __reduce__(self):
+        return (self.__class__, (self.classes,))
+    
+    @staticmethod
+    def from_automaton(fa: 'FiniteAutomata') -> 'AlphabetPartition':
+        """Gom các ký tự có "chữ ký" chuyển tiếp giống nhau ở mọi trạng thái"""
+        # Chữ ký của ký tự = dãy (trạng thái << 32 | đích) theo thứ tự trạng thái rồi đích:
+        # sắp xếp các cạnh của một trạng thái là gom chúng theo ký tự (id ký tự nằm ở các bit cao)
+        symbol_signatures = [[] if symbol in fa.alphabet else None for symbol in fa._symbols]
+        for from_state, edges in enumerate(fa._edges):
+            if not edges:
+                continue
+            offset = from_state << _TARGET_BITS
+            for edge in sorted(edges):
+                signature = symbol_signatures[edge >> _TARGET_BITS]
+                if signature is not None:
+                    signature.append(offset | edge & _TARGET_MASK)
+        
+        signatures = {symbol: () for symbol in fa.alphabet}
+        for symbol, signature in zip(fa._symbols, symbol_signatures):
+            if signature is not None:
+                signatures[symbol] = tuple(signature)
+        
+        groups = {}
+        for symbol in sorted(signatures):
+            groups.setdefault(tuple(signatures[symbol]), []).append(symbol)
+        return AlphabetPartition(sorted(groups.values()))
+    
+    @property
+    def num_classes(self) -> int:
+        return len(self.classes)
+    
+    def representatives(self) -> List[str]:
+        """Ký tự đại diện của mỗi lớp"""
+        return [symbols[0] for symbols in self.classes]
+    
+    def __repr__(self):
+        return f"AlphabetPartition(symbols={len(self.class_of)}, classes={self.num_classes})"
+
+
+class CompiledDFA:
+    """
+    Dạng biên dịch, bất biến của DFA - dùng để chạy nhanh trên nhiều chuỗi
+    
+    - Trạng thái là số nguyên 0..n-1, trạng thái chết (dead) là n
+    - Mỗi lớp ký tự tương đương (xem AlphabetPartition) là một cột của bảng chuyển tiếp
+      classes[column] = các ký tự của cột, symbol_index[ký tự] = cột
+    - Bảng chuyển tiếp là mảng phẳng array('i') kích thước (n+1) * số_cột:
+      table[state * num_columns + column] = trạng thái tiếp theo
+    - Ký tự không có chuyển tiếp (hoặc không thuộc alphabet) dẫn tới trạng thái chết
+    - table / accepting cũng có thể là memoryview trỏ vào file được mmap (xem fa_binary)
+    """
+    
+    __slots__ = ('state_names', 'classes', 'symbol_index', 'num_columns',
+                 'table', 'accepting', 'start', 'dead')
+    
+    def __init__(self, state_names, classes, table, accepting, start: int):
+        set_slot = super().__setattr__
+        set_slot('state_names', tuple(state_names))
+        set_slot('classes', tuple(tuple(symbols) for symbols in classes))
+        set_slot('symbol_index', {symbol: i for i, symbols in enumerate(self.classes) for symbol in symbols})
+        set_slot('num_columns', len(self.classes))
+        set_slot('table', table)
+        set_slot('accepting', accepting if isinstance(accepting, memoryview) else bytes(accepting))
+        set_slot('start', start)
+        set_slot('dead', len(self.state_names))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+    
+    def __reduce__(self):
+        return (self.__class__, (self.state_names, self.classes,
+                                 array('i', self.table), bytes(self.accepting), self.start))
+    
+    @staticmethod
+    def from_dfa(dfa: 'DFA') -> 'CompiledDFA':
+        """Biên dịch một DFA thành bảng chuyển tiếp số nguyên"""
+        state_names = dfa._state_names()
+        dead = len(state_names)
+        
+        classes = dfa.alphabet_partition().classes
+        num_columns = len(classes)
+        column_of = dfa._symbol_columns()
+        
+        # Mặc định mọi ô đều dẫn tới trạng thái chết (kể cả hàng của trạng thái chết)
+        table = array('i', [dead]) * ((dead + 1) * num_columns)
+        for from_state, edges in enumerate(dfa._edges):
+            if not edges:
+                continue
+            row = from_state * num_columns
+            for edge in edges:
+                column = column_of[edge >> _TARGET_BITS]
+                if column >= 0:
+                    table[row + column] = edge & _TARGET_MASK
+        
+        accepting = bytearray(dfa._accepting)
+        accepting.append(0)
+        
+        start = dfa._start if dfa._start >= 0 else dead
+        return CompiledDFA(state_names, classes, table, accepting, start)
+    
+    @property
+    def num_states(self) -> int:
+        """Số trạng thái thật (không tính trạng thái chết)"""
+        return self.dead
+    
+    def step(self, state: int, symbol: str) -> int:
+        """Một bước chuyển tiếp trên bảng"""
+        column = self.symbol_index.get(symbol)
+        if column is None:
+            return self.dead
+        return self.table[state * self.num_columns + column]
     
     def accepts_string(self, string: str) -> bool:
-        """Kiểm tra xem DFA chấp nhận chuỗi"""
-        current_state = self.start_state
+        """Kiểm tra xem DFA chấp nhận chuỗi (chỉ tra bảng, không tạo đối tượng mới)"""
+        table = self.table
+        symbol_index = self.symbol_index
+        num_columns = self.num_columns
+        dead = self.dead
+        state = self.start
         
         for symbol in string:
-            if symbol not in self.alphabet:
+            column = symbol_index.get(symbol)
+            if column is None:
                 return False
-            next_state = self.get_transitions(current_state, symbol)
-            if next_state is None:
+            state = table[state * num_columns + column]
+            if state == dead:
                 return False
-            current_state = next_state
         
-        return current_state in self.accept_states
+        return self.accepting[state] == 1
     
     def trace_string(self, string: str) -> List[Tuple[str, str, str]]:
-        """Theo dõi đường đi của chuỗi qua DFA - trả về danh sách (state, symbol, next_state)"""
+        """Theo dõi đường đi của chuỗi - trả về danh sách (state, symbol, next_state) theo tên"""
         trace = []
-        current_state = self.start_state
+        names = self.state_names
+        state = self.start
         
         for symbol in string:
-            if symbol not in self.alphabet:
+            if state == self.dead:
                 break
-            next_state = self.get_transitions(current_state, symbol)
-            if next_state is None:
+            next_state = self.step(state, symbol)
+            if next_state == self.dead:
                 break
-            trace.append((current_state, symbol, next_state))
-            current_state = next_state
+            trace.append((names[state], symbol, names[next_state]))
+            state = next_state
         
         return trace
+    
+    def to_dfa(self) -> 'DFA':
+        """Dựng lại DFA dạng tên trạng thái / ký tự (bỏ trạng thái chết)"""
+        # id ký tự đánh theo thứ tự cột, nên các cạnh được dựng thẳng từ bảng
+        symbols = []
+        column_symbols = []
+        for column_classes in self.classes:
+            column_symbols.append(range(len(symbols), len(symbols) + len(column_classes)))
+            symbols.extend(column_classes)
+        
+        table = self.table
+        dead = self.dead
+        num_columns = self.num_columns
+        edges = []
+        for state in range(dead):
+            row = state * num_columns
+            state_edges = array('q')
+            for column, symbol_ids in enumerate(column_symbols):
+                target = table[row + column]
+                if target != dead:
+                    state_edges.extend(symbol << _TARGET_BITS | target for symbol in symbol_ids)
+            edges.append(state_edges or None)
+        
+        dfa = DFA()
+        dfa._assign_core(self.state_names, self.accepting[:dead], self.start if self.start < dead else -1,
+                         symbols, edges)
+        return dfa
+    
+    def __repr__(self):
+        return f"CompiledDFA(states={self.num_states}, columns={self.num_columns})"
+
+
+class DFA(FiniteAutomata):
+    """
+    Deterministic Finite Automata (Automata Hữu hạn Xác định)
+    - Từ mỗi trạng thái, với mỗi ký tự có đúng 1 chuyển tiếp
+    """
+    
+    def get_transitions(self, state: str, symbol: str) -> str:
+        """Trong DFA, trả về đúng 1 trạng thái (hoặc None)"""
+        targets = super().get_transitions(state, symbol)
+        return next(iter(targets)) if targets else None
+    
+    def compile(self) -> CompiledDFA:
+        """
+        Biên dịch DFA thành bảng chuyển tiếp số nguyên (được lưu lại cho tới khi DFA thay đổi)
+        """
+        compiled = self._cache.get('compiled')
+        if compiled is None:
+            compiled = CompiledDFA.from_dfa(self)
+            self._cache['compiled'] = compiled
+        return compiled
+    
+    def accepts_string(self, string: str) -> bool:
+        """Kiểm tra xem DFA chấp nhận chuỗi (chạy trên bảng đã biên dịch)"""
+        return self.compile().accepts_string(string)
+    
+    def trace_string(self, string: str) -> List[Tuple[str, str, str]]:
+        """Theo dõi đường đi của chuỗi qua DFA - trả về danh sách (state, symbol, next_state)"""
+        return self.compile().trace_string(string)
+
+
+class CompiledNFA:
+    """
+    Dạng biên dịch của NFA / ε-NFA - mô phỏng bằng bitset
+    
+    - Trạng thái thứ i tương ứng với bit i của một số nguyên Python
+    - Một tập trạng thái là một số nguyên (bitmask), không cần tạo set mới
+    - Mỗi cột là một lớp ký tự tương đương (xem AlphabetPartition)
+    - successors[column][i] = bitmask các trạng thái tiếp theo của trạng thái i với ký tự column
+      (với ε-NFA, bitmask này đã bao gồm epsilon-closure)
+    - Một bước mô phỏng chỉ là phép OR các bitmask của những trạng thái đang sống
+    """
+    
+    __slots__ = ('state_names', 'classes', 'symbol_index', 'num_columns',
+                 'successors', 'start_mask', 'accept_mask')
+    
+    def __init__(self, state_names, classes, successors, start_mask: int, accept_mask: int):
+        set_slot = super().__setattr__
+        set_slot('state_names', tuple(state_names))
+        set_slot('classes', tuple(tuple(symbols) for symbols in classes))
+        set_slot('symbol_index', {symbol: i for i, symbols in enumerate(self.classes) for symbol in symbols})
+        set_slot('num_columns', len(self.classes))
+        set_slot('successors', tuple(tuple(row) for row in successors))
+        set_slot('start_mask', start_mask)
+        set_slot('accept_mask', accept_mask)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+    
+    def __reduce__(self):
+        return (self.__class__, (self.state_names, self.classes,
+                                 self.successors, self.start_mask, self.accept_mask))
+    
+    @staticmethod
+    def from_automaton(fa: 'FiniteAutomata', closures: Optional[List[int]] = None) -> 'CompiledNFA':
+        """
+        Biên dịch NFA (hoặc ε-NFA nếu truyền closures) thành các bitmask
+        
+        Args:
+            fa: Automata cần biên dịch
+            closures: closures[i] = bitmask epsilon-closure của trạng thái i (chỉ dùng cho ε-NFA)
+        """
+        state_names = fa._state_names()
+        
+        classes = fa.alphabet_partition().classes
+        column_of = fa._symbol_columns()
+        successors = [[0] * len(state_names) for _ in classes]
+        
+        for from_state, edges in enumerate(fa._edges):
+            if not edges:
+                continue
+            for edge in edges:
+                column = column_of[edge >> _TARGET_BITS]
+                if column >= 0:
+                    successors[column][from_state] |= 1 << (edge & _TARGET_MASK)
+        
+        start_mask = 0 if fa._start < 0 else 1 << fa._start
+        if closures is not None:
+            successors = [[CompiledNFA.close(mask, closures) for mask in row] for row in successors]
+            start_mask = CompiledNFA.close(start_mask, closures)
+        
+        accept_mask = 0
+        for state, accepting in enumerate(fa._accepting):
+            if accepting:
+                accept_mask |= 1 << state
+        
+        return CompiledNFA(state_names, classes, successors, start_mask, accept_mask)
+    
+    @staticmethod
+    def close(mask: int, closures: List[int]) -> int:
+        """Hợp các epsilon-closure của mọi trạng thái trong bitmask"""
+        closed = 0
+        while mask:
+            low = mask & -mask
+            closed |= closures[low.bit_length() - 1]
+            mask ^= low
+        return closed
+    
+    @property
+    def num_states(self) -> int:
+        return len(self.state_names)
+    
+    def step(self, mask: int, symbol: str) -> int:
+        """Một bước mô phỏng: bitmask các trạng thái tiếp theo (0 nếu không còn trạng thái nào)"""
+        column = self.symbol_index.get(symbol)
+        if column is None:
+            return 0
+        row = self.successors[column]
+        next_mask = 0
+        while mask:
+            low = mask & -mask
+            next_mask |= row[low.bit_length() - 1]
+            mask ^= low
+        return next_mask
+    
+    def accepts_string(self, string: str) -> bool:
+        """Kiểm tra xem NFA chấp nhận chuỗi (mỗi bước chỉ gồm các phép OR trên số nguyên)"""
+        symbol_index = self.symbol_index
+        successors = self.successors
+        mask = self.start_mask
+        
+        for symbol in string:
+            column = symbol_index.get(symbol)
+            if column is None:
+                return False
+            row = successors[column]
+            next_mask = 0
+            while mask:
+                low = mask & -mask
+                next_mask |= row[low.bit_length() - 1]
+                mask ^= low
+            if not next_mask:
+                return False
+            mask = next_mask
+        
+        return bool(mask & self.accept_mask)
+    
+    def names_of(self, mask: int) -> Set[str]:
+        """Đổi bitmask thành tập tên trạng thái"""
+        names = set()
+        while mask:
+            low = mask & -mask
+            names.add(self.state_names[low.bit_length() - 1])
+            mask ^= low
+        return names
+    
+    def __repr__(self):
+        return f"CompiledNFA(states={self.num_states}, columns={self.num_columns})"
+
+
+class NFATrace(Mapping):
+    """
+    Kết quả NFA.trace_string: {trạng thái cuối: đường đi [(from_state, symbol, to_state), ...]}
+    
+    - Mỗi bước chỉ lưu một hàng con trỏ ngược trong một mảng phẳng duy nhất:
+      back[step * n + j] = trạng thái đứng trước j ở bước step (-1 nếu j không sống)
+    - Bộ nhớ O(số bước x số trạng thái) số nguyên nhỏ, thay vì sao chép cả đường đi ở mỗi bước
+    - Đường đi chỉ được dựng lại (đi ngược theo con trỏ) khi thực sự được truy cập
+    """
+    
+    def __init__(self, state_names, symbols: str, back: array, final_mask: int):
+        self.state_names = state_names
+        self.symbols = symbols
+        self.back = back
+        self.final_mask = final_mask
+        self._ids: Optional[Dict[str, int]] = None
+    
+    def _state_id(self, name: str) -> int:
+        if self._ids is None:
+            self._ids = {state: i for i, state in enumerate(self.state_names)}
+        i = self._ids.get(name)
+        if i is None or not self.final_mask >> i & 1:
+            raise KeyError(name)
+        return i
+    
+    def __getitem__(self, name: str) -> List[Tuple[str, str, str]]:
+        state = self._state_id(name)
+        names = self.state_names
+        num_states = len(names)
+        path = []
+        for step in range(len(self.symbols) - 1, -1, -1):
+            previous = self.back[step * num_states + state]
+            path.append((names[previous], self.symbols[step], names[state]))
+            state = previous
+        path.reverse()
+        return path
+    
+    def __iter__(self) -> Iterator[str]:
+        mask = self.final_mask
+        while mask:
+            low = mask & -mask
+            yield self.state_names[low.bit_length() - 1]
+            mask ^= low
+    
+    def __len__(self) -> int:
+        return bin(self.final_mask).count("1")
+    
+    def __repr__(self):
+        return f"NFATrace(steps={len(self.symbols)}, states={sorted(self)})"
 
 
 class NFA(FiniteAutomata):
@@ -164,51 +1242,106 @@ class NFA(FiniteAutomata):
     
     def get_transitions(self, state: str, symbol: str) -> Set[str]:
         """Trong NFA, trả về tập hợp các trạng thái"""
-        if state not in self.transitions:
-            return set()
-        if symbol not in self.transitions[state]:
-            return set()
-        return self.transitions[state][symbol].copy()
+        return super().get_transitions(state, symbol)
+    
+    def compile(self) -> CompiledNFA:
+        """Biên dịch NFA thành dạng bitset (được lưu lại cho tới khi NFA thay đổi)"""
+        compiled = self._cache.get('compiled')
+        if compiled is None:
+            compiled = CompiledNFA.from_automaton(self)
+            self._cache['compiled'] = compiled
+        return compiled
     
     def accepts_string(self, string: str) -> bool:
-        """Kiểm tra xem NFA chấp nhận chuỗi (sử dụng BFS/DFS)"""
-        current_states = {self.start_state}
+        """Kiểm tra xem NFA chấp nhận chuỗi (mô phỏng bằng bitset)"""
+        return self.compile().accepts_string(string)
+    
+    def trace_string(self, string: str, stream: bool = False
+                     ) -> Union[NFATrace, Iterator[Tuple[int, str, str, str]]]:
+        """
+        Theo dõi tất cả các đường đi của chuỗi qua NFA
         
-        for symbol in string:
-            if symbol not in self.alphabet:
-                return False
-            
-            next_states = set()
-            for state in current_states:
-                next_states.update(self.get_transitions(state, symbol))
-            
-            if not next_states:
-                return False
-            current_states = next_states
+        Args:
+            string: Chuỗi cần theo dõi (dừng lại ở ký tự đầu tiên không thuộc alphabet)
+            stream: True -> trả về generator các sự kiện (bước, from_state, symbol, to_state)
+                    cho mọi chuyển tiếp của các trạng thái đang sống, không lưu gì lại
         
-        # Kiểm tra xem có bất kỳ trạng thái kết thúc nào trong current_states
-        return bool(current_states & self.accept_states)
-    
-    def trace_string(self, string: str) -> Dict[str, List[Tuple[str, str, str]]]:
-        """Theo dõi tất cả các đường đi của chuỗi qua NFA"""
-        all_traces = {self.start_state: []}
+        Returns:
+            NFATrace: {trạng thái cuối: đường đi tới nó}, đường đi được dựng lại khi truy cập
+        """
+        if stream:
+            return self._iter_trace(string)
+        
+        compiled = self.compile()
+        if self.start_state is None:
+            return NFATrace(compiled.state_names, "", array('b'), 0)
+        
+        num_states = compiled.num_states
+        typecode = 'b' if num_states < 128 else 'h' if num_states < 32768 else 'i'
+        empty_row = array(typecode, [-1]) * num_states
+        back = array(typecode)
+        steps = 0
+        live = compiled.start_mask
         
         for symbol in string:
             if symbol not in self.alphabet:
                 break
+            column = compiled.symbol_index.get(symbol)
+            row = compiled.successors[column] if column is not None else None
             
-            next_traces = {}
-            for from_state, trace in all_traces.items():
-                for to_state in self.get_transitions(from_state, symbol):
-                    new_trace = trace + [(from_state, symbol, to_state)]
-                    if to_state not in next_traces:
-                        next_traces[to_state] = new_trace
-                    else:
-                        next_traces[to_state] = new_trace
+            offset = len(back)
+            back.extend(empty_row)
+            next_mask = 0
+            mask = live
+            while mask and row is not None:
+                low = mask & -mask
+                state = low.bit_length() - 1
+                mask ^= low
+                # Chỉ ghi con trỏ cho trạng thái lần đầu được tới ở bước này
+                new = row[state] & ~next_mask
+                next_mask |= new
+                while new:
+                    target = new & -new
+                    back[offset + target.bit_length() - 1] = state
+                    new ^= target
             
-            all_traces = next_traces
+            steps += 1
+            live = next_mask
+            if not live:
+                break
+        
+        return NFATrace(compiled.state_names, string[:steps], back, live)
+    
+    def _iter_trace(self, string: str) -> Iterator[Tuple[int, str, str, str]]:
+        """Generator sự kiện chuyển tiếp, bộ nhớ chỉ gồm bitmask trạng thái đang sống"""
+        compiled = self.compile()
+        if self.start_state is None:
+            return
+        names = compiled.state_names
+        live = compiled.start_mask
         
-        return all_traces
+        for step, symbol in enumerate(string):
+            if symbol not in self.alphabet:
+                return
+            column = compiled.symbol_index.get(symbol)
+            if column is None:
+                return
+            row = compiled.successors[column]
+            next_mask = 0
+            mask = live
+            while mask:
+                low = mask & -mask
+                state = low.bit_length() - 1
+                mask ^= low
+                targets = row[state]
+                next_mask |= targets
+                while targets:
+                    target = targets & -targets
+                    yield step, names[state], symbol, names[target.bit_length() - 1]
+                    targets ^= target
+            live = next_mask
+            if not live:
+                return
 
 
 class EpsilonNFA(FiniteAutomata):
@@ -219,72 +1352,189 @@ class EpsilonNFA(FiniteAutomata):
     
     def __init__(self):
         super().__init__()
-        self.epsilon_transitions: Dict[str, Set[str]] = {}
+        self._epsilon: List[Optional[array]] = []  # _epsilon[id] = array('i') các id đích của ε-chuyển tiếp
+    
+    def _state_id(self, name: str) -> int:
+        state = super()._state_id(name)
+        if state == len(self._epsilon):
+            self._epsilon.append(None)
+        return state
+    
+    def _assign_core(self, names, accepting, start, symbols, edges):
+        super()._assign_core(names, accepting, start, symbols, edges)
+        self._epsilon = [None] * len(self._names)
+    
+    @property
+    def epsilon_transitions(self) -> EpsilonTransitionsView:
+        """{from_state: {to_state, ...}} (ghi xuyên, xem EpsilonTransitionsView)"""
+        return EpsilonTransitionsView(self)
     
     def add_epsilon_transition(self, from_state: str, to_state: str):
         """Thêm một chuyển tiếp epsilon"""
-        if from_state not in self.epsilon_transitions:
-            self.epsilon_transitions[from_state] = set()
-        self.epsilon_transitions[from_state].add(to_state)
+        self._invalidate_cache()
+        source = self._state_id(from_state)
+        target = self._state_id(to_state)
+        targets = self._epsilon[source]
+        if targets is None:
+            self._epsilon[source] = array('i', (target,))
+        elif target not in targets:
+            targets.append(target)
     
     def epsilon_closure(self, states: Set[str]) -> Set[str]:
-        """Tính epsilon-closure (bao đóng epsilon) của một tập hợp trạng thái"""
-        closure = set(states)
-        stack = list(states)
-        
-        while stack:
-            state = stack.pop()
-            if state in self.epsilon_transitions:
-                for next_state in self.epsilon_transitions[state]:
-                    if next_state not in closure:
-                        closure.add(next_state)
-                        stack.append(next_state)
+        """Tính epsilon-closure (bao đóng epsilon) của một tập hợp trạng thái (tra bảng closure)"""
+        state_names, state_ids, closures = self.epsilon_closure_table()
+        closure = set()
+        mask = 0
+        for state in states:
+            i = state_ids.get(state)
+            if i is None:
+                closure.add(state)
+            else:
+                mask |= closures[i]
+        
+        while mask:
+            low = mask & -mask
+            closure.add(state_names[low.bit_length() - 1])
+            mask ^= low
         
         return closure
     
-    def get_transitions(self, state: str, symbol: str) -> Set[str]:
-        """Lấy tất cả các trạng thái có thể đạt được với ký tự (tính epsilon-closure)"""
-        if state not in self.transitions:
-            direct_transitions = set()
-        else:
-            if symbol not in self.transitions[state]:
-                direct_transitions = set()
-            else:
-                direct_transitions = self.transitions[state][symbol].copy()
+    def epsilon_closure_table(self) -> Tuple[List[str], Dict[str, int], List[int]]:
+        """
+        Bảng epsilon-closure của mọi trạng thái, tính một lần và lưu lại
+        (bị xóa khi automata thay đổi, ví dụ khi gọi add_epsilon_transition)
+        
+        Phương pháp:
+        1. Tarjan: tìm các thành phần liên thông mạnh (SCC) của đồ thị epsilon.
+           Mọi trạng thái trong cùng một SCC có cùng epsilon-closure
+        2. Tarjan trả về các SCC theo thứ tự topo ngược (SCC "đích" trước),
+           nên closure(SCC) = các bit của SCC ∪ closure của các SCC kế tiếp (đã tính)
+        
+        Returns:
+            (state_names, state_ids, closures) với closures[i] là bitmask closure của trạng thái i
+        """
+        cached = self._cache.get('closure_table')
+        if cached is not None:
+            return cached
         
-        return direct_transitions
+        state_names = self._state_names()
+        state_ids = dict(self._ids)
+        count = len(state_names)
+        graph = [targets.tolist() if targets else [] for targets in self._epsilon]
+        
+        # Tarjan (không đệ quy)
+        index_of = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        component_of = [-1] * count
+        component_masks = []
+        scc_stack = []
+        counter = 0
+        
+        for root in range(count):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, edge = work[-1]
+                if edge == 0:
+                    index_of[v] = lowlink[v] = counter
+                    counter += 1
+                    scc_stack.append(v)
+                    on_stack[v] = True
+                if edge < len(graph[v]):
+                    work[-1] = (v, edge + 1)
+                    w = graph[v][edge]
+                    if index_of[w] == -1:
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        lowlink[v] = min(lowlink[v], index_of[w])
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[v])
+                
+                if lowlink[v] == index_of[v]:
+                    # v là gốc của một SCC: các SCC kế tiếp đều đã có closure
+                    component = len(component_masks)
+                    members = []
+                    while True:
+                        w = scc_stack.pop()
+                        on_stack[w] = False
+                        component_of[w] = component
+                        members.append(w)
+                        if w == v:
+                            break
+                    mask = 0
+                    for w in members:
+                        mask |= 1 << w
+                    for w in members:
+                        for u in graph[w]:
+                            if component_of[u] != component:
+                                mask |= component_masks[component_of[u]]
+                    component_masks.append(mask)
+        
+        closures = [component_masks[component_of[i]] for i in range(count)]
+        table = (state_names, state_ids, closures)
+        self._cache['closure_table'] = table
+        return table
+    
+    def get_transitions(self, state: str, symbol: str) -> Set[str]:
+        """Các trạng thái tới được trực tiếp với ký tự (không tính epsilon-closure)"""
+        return super().get_transitions(state, symbol)
+    
+    def compile(self) -> CompiledNFA:
+        """
+        Biên dịch ε-NFA thành dạng bitset (epsilon-closure được gộp sẵn vào các bitmask)
+        """
+        compiled = self._cache.get('compiled')
+        if compiled is None:
+            _, _, closures = self.epsilon_closure_table()
+            compiled = CompiledNFA.from_automaton(self, closures)
+            self._cache['compiled'] = compiled
+        return compiled
     
     def accepts_string(self, string: str) -> bool:
-        """Kiểm tra xem ε-NFA chấp nhận chuỗi"""
-        # Bắt đầu từ epsilon-closure của trạng thái khởi đầu
-        current_states = self.epsilon_closure({self.start_state})
+        """Kiểm tra xem ε-NFA chấp nhận chuỗi (mô phỏng bằng bitset)"""
+        return self.compile().accepts_string(string)
+    
+    def to_dict(self, compact: bool = False) -> dict:
+        """Chuyển đổi ε-NFA thành dictionary (kèm các chuyển tiếp epsilon)"""
+        result = super().to_dict(compact)
+        names = self._names
+        epsilon_from, epsilon_to = [], []
+        for from_state, targets in enumerate(self._epsilon):
+            if targets:
+                epsilon_from.extend([from_state] * len(targets))
+                epsilon_to.extend(targets)
         
-        for symbol in string:
-            if symbol not in self.alphabet:
-                return False
-            
-            next_states = set()
-            for state in current_states:
-                next_states.update(self.get_transitions(state, symbol))
-            
-            if not next_states:
-                return False
-            
-            # Tính epsilon-closure của các trạng thái tiếp theo
-            current_states = self.epsilon_closure(next_states)
-        
-        # Kiểm tra xem có bất kỳ trạng thái kết thúc nào trong current_states
-        return bool(current_states & self.accept_states)
-    
-    def to_dict(self) -> dict:
-        """Chuyển đổi ε-NFA thành dictionary"""
-        result = super().to_dict()
-        epsilon_trans = []
-        for from_state in self.epsilon_transitions:
-            for to_state in self.epsilon_transitions[from_state]:
-                epsilon_trans.append({
-                    'from': from_state,
-                    'to': to_state
-                })
-        result['epsilon_transitions'] = epsilon_trans
+        if compact:
+            result['epsilon_from'] = epsilon_from
+            result['epsilon_to'] = epsilon_to
+        else:
+            result['epsilon_transitions'] = [{'from': names[from_state], 'to': names[to_state]}
+                                             for from_state, to_state in zip(epsilon_from, epsilon_to)]
         return result
+    
+    def _load_verbose(self, data: dict):
+        super()._load_verbose(data)
+        for transition in data.get('epsilon_transitions', ()):
+            self.add_epsilon_transition(transition['from'], transition['to'])
+    
+    def _load_columnar(self, data: dict):
+        super()._load_columnar(data)
+        sources, targets = data.get('epsilon_from', ()), data.get('epsilon_to', ())
+        if len(sources) != len(targets):
+            raise ValueError("Columns 'epsilon_from' and 'epsilon_to' must have the same length")
+        for source, target in zip(sources, targets):
+            epsilon = self._epsilon[source]
+            if epsilon is None:
+                self._epsilon[source] = array('i', (target,))
+            elif target not in epsilon:
+                epsilon.append(target)
+
+
+# Tên loại (trường 'type' của to_dict) -> lớp automata
+MODEL_TYPES: Dict[str, type] = {'DFA': DFA, 'NFA': NFA, 'EpsilonNFA': EpsilonNFA}
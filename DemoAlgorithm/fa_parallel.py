@@ -0,0 +1,80 @@
+"""
+FA Parallel - Phân loại song song trên nhiều tiến trình (ProcessPoolExecutor)
+DFA đã biên dịch chỉ được gửi tới mỗi tiến trình con đúng một lần (qua initializer),
+sau đó mỗi tác vụ chỉ mang theo một khối chuỗi.
+Nếu truyền đường dẫn file nhị phân (xem fa_binary), mỗi tiến trình con tự mmap file
+thay vì nhận bản sao pickle của bảng chuyển tiếp
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Union
+
+from fa_models import CompiledDFA
+from fa_batch import BatchMatcher, HAS_NUMPY
+
+# Trạng thái riêng của mỗi tiến trình con (được gán trong initializer)
+_worker_dfa: Optional[CompiledDFA] = None
+_worker_matcher = None
+
+
+def _init_worker(compiled: Union[CompiledDFA, str]):
+    """Chạy một lần trong mỗi tiến trình con: nhận DFA (hoặc mmap file) và chuẩn bị bộ so khớp"""
+    global _worker_dfa, _worker_matcher
+    if isinstance(compiled, str):
+        from fa_binary import load_compiled
+        compiled = load_compiled(compiled)
+    _worker_dfa = compiled
+    _worker_matcher = BatchMatcher(compiled) if HAS_NUMPY else None
+
+
+def _classify_chunk(chunk: List[str]) -> List[bool]:
+    """Phân loại một khối chuỗi trong tiến trình con"""
+    if _worker_matcher is not None:
+        return _worker_matcher.match(chunk).tolist()
+    accepts = _worker_dfa.accepts_string
+    return [accepts(s) for s in chunk]
+
+
+def _chunks(strings: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    chunk = []
+    for s in strings:
+        chunk.append(s)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def classify_parallel(strings: Iterable[str], compiled: Union[CompiledDFA, str], workers: Optional[int] = None,
+                      chunksize: int = 4096, max_pending: Optional[int] = None) -> Iterator[bool]:
+    """
+    Phân loại song song, trả về kết quả (True/False) theo đúng thứ tự input
+
+    Input được đọc lười theo từng khối; số khối đang chờ xử lý bị giới hạn
+    nên có thể dùng với iterable rất lớn (ví dụ đọc từ file) mà bộ nhớ không tăng
+
+    Args:
+        strings: Iterable các chuỗi cần phân loại
+        compiled: DFA đã biên dịch (gửi tới mỗi tiến trình con một lần),
+                  hoặc đường dẫn file nhị phân do fa_binary.save_compiled ghi ra
+        workers: Số tiến trình con (mặc định: số nhân CPU)
+        chunksize: Số chuỗi mỗi tác vụ
+        max_pending: Số khối tối đa đang chờ (mặc định: 4 x số tiến trình)
+    """
+    workers = workers or os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 4 * workers
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(compiled,)) as executor:
+        pending = deque()
+        for chunk in _chunks(strings, chunksize):
+            pending.append(executor.submit(_classify_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,188 @@
+"""
+FA Product - Các phép toán trên ngôn ngữ bằng automata tích (product construction)
+Giao, hợp, hiệu, phần bù của nhiều DFA được gộp thành MỘT automata: mỗi chuỗi chỉ
+cần duyệt một lần thay vì chạy lần lượt từng automata
+
+Trạng thái tích (bộ trạng thái của các DFA thành phần) chỉ được tạo khi chuỗi đầu vào
+thực sự đi tới (giống fa_lazy); materialize() / to_dfa() xây toàn bộ phần đạt được
+và (tùy chọn) tối thiểu hóa
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fa_models import CompiledDFA, DFA, NFA, EpsilonNFA
+from fa_converter import FAConverter, FAMinimizer
+
+UNKNOWN = -1  # Ô chuyển tiếp chưa được tính
+
+
+def as_compiled_dfa(fa) -> CompiledDFA:
+    """Đưa automata bất kỳ (DFA, NFA, ε-NFA, CompiledDFA) về dạng CompiledDFA"""
+    if isinstance(fa, CompiledDFA):
+        return fa
+    if isinstance(fa, DFA):
+        return fa.compile()
+    if isinstance(fa, (NFA, EpsilonNFA)):
+        return FAConverter.subset_construction(fa.compile())
+    raise TypeError(f"Cannot build a product from {type(fa).__name__}")
+
+
+class ProductDFA:
+    """
+    DFA tích của nhiều automata, xây dựng lười
+
+    - Trạng thái tích là bộ (s1, ..., sk) trạng thái của các DFA thành phần
+    - Bảng chữ cái là hợp các bảng chữ cái; các cột được gom theo bộ cột của
+      từng thành phần (ký tự có cùng hành vi ở mọi thành phần dùng chung một cột)
+    - accept(bộ True/False của từng thành phần) quyết định trạng thái tích có được chấp nhận
+    - required: các thành phần bắt buộc phải chấp nhận; khi một thành phần bắt buộc rơi vào
+      trạng thái chết thì cả bộ được gộp về trạng thái chết chung để dừng sớm
+    """
+
+    def __init__(self, operands: Sequence, accept: Callable[[Tuple[bool, ...]], bool],
+                 alphabet: Optional[Iterable[str]] = None, required: Sequence[int] = ()):
+        """
+        Args:
+            operands: Các automata thành phần
+            accept: Hàm nhận bộ kết quả chấp nhận của các thành phần, trả về True/False
+            alphabet: Các ký tự bổ sung vào bảng chữ cái (cần cho phần bù)
+            required: Chỉ số các thành phần bắt buộc phải chấp nhận
+        """
+        if not operands:
+            raise ValueError("A product needs at least one automaton")
+        self.operands: List[CompiledDFA] = [as_compiled_dfa(fa) for fa in operands]
+        self.accept = accept
+        self.required = tuple(required)
+
+        symbols = set(alphabet or ())
+        for operand in self.operands:
+            symbols.update(operand.symbol_index)
+        groups: Dict[Tuple[int, ...], List[str]] = {}
+        for symbol in sorted(symbols):
+            key = tuple(operand.symbol_index.get(symbol, UNKNOWN) for operand in self.operands)
+            groups.setdefault(key, []).append(symbol)
+        self.column_keys: List[Tuple[int, ...]] = list(groups)
+        self.classes: List[Tuple[str, ...]] = [tuple(groups[key]) for key in self.column_keys]
+        self.symbol_index: Dict[str, int] = {symbol: column for column, symbols in enumerate(self.classes)
+                                             for symbol in symbols}
+        self.num_columns = len(self.classes)
+
+        self._ids: Dict[Tuple[int, ...], int] = {}
+        self._tuples: List[Tuple[int, ...]] = []
+        self._accepting: List[bool] = []
+        self._rows: List[List[int]] = []
+        self._dead_tuple = tuple(operand.dead for operand in self.operands)
+        self.start = self._intern(tuple(operand.start for operand in self.operands))
+        self.dead = self._intern(self._dead_tuple)
+
+    def _intern(self, states: Tuple[int, ...]) -> int:
+        """Lấy id của trạng thái tích (tạo mới nếu chưa có)"""
+        for i in self.required:
+            if states[i] == self.operands[i].dead:
+                states = self._dead_tuple
+                break
+
+        state = self._ids.get(states)
+        if state is None:
+            state = len(self._tuples)
+            self._ids[states] = state
+            self._tuples.append(states)
+            self._accepting.append(bool(self.accept(tuple(
+                operand.accepting[s] == 1 for operand, s in zip(self.operands, states)))))
+            self._rows.append([UNKNOWN] * self.num_columns)
+        return state
+
+    def _compute(self, state: int, column: int) -> int:
+        """Tính ô chuyển tiếp còn thiếu"""
+        next_states = tuple(
+            operand.table[s * operand.num_columns + c] if c != UNKNOWN else operand.dead
+            for operand, s, c in zip(self.operands, self._tuples[state], self.column_keys[column]))
+        next_state = self._intern(next_states)
+        self._rows[state][column] = next_state
+        return next_state
+
+    def accepts_string(self, string: str) -> bool:
+        """Kiểm tra chuỗi - một lần duyệt cho tất cả automata thành phần"""
+        symbol_index = self.symbol_index
+        rows = self._rows
+        dead = self.dead if not self._accepting[self.dead] else None
+        state = self.start
+
+        for symbol in string:
+            column = symbol_index.get(symbol)
+            if column is None:
+                return False
+            next_state = rows[state][column]
+            if next_state == UNKNOWN:
+                next_state = self._compute(state, column)
+            if next_state == dead:
+                return False
+            state = next_state
+
+        return self._accepting[state]
+
+    @property
+    def num_states(self) -> int:
+        """Số trạng thái tích đã được tạo"""
+        return len(self._tuples)
+
+    def materialize(self) -> CompiledDFA:
+        """Xây toàn bộ các trạng thái tích đạt được, trả về CompiledDFA"""
+        state = 0
+        while state < len(self._tuples):
+            row = self._rows[state]
+            for column in range(self.num_columns):
+                if row[column] == UNKNOWN:
+                    self._compute(state, column)
+            state += 1
+
+        # Trạng thái chết (nếu không được chấp nhận) trở thành trạng thái chết của bảng
+        dead_accepting = self._accepting[self.dead]
+        order = [s for s in range(len(self._tuples)) if dead_accepting or s != self.dead]
+        new_ids = {old: new for new, old in enumerate(order)}
+        dead = len(order)
+        if not dead_accepting:
+            new_ids[self.dead] = dead
+
+        table = []
+        for old in order:
+            table.extend(new_ids[target] for target in self._rows[old])
+        table.extend([dead] * self.num_columns)
+        accepting = bytearray(1 if self._accepting[old] else 0 for old in order)
+        accepting.append(0)
+
+        return CompiledDFA([f"q{i}" for i in range(dead)], self.classes, array('i', table),
+                           accepting, new_ids[self.start])
+
+    def to_dfa(self, minimize: bool = True) -> DFA:
+        """Xây DFA tích đầy đủ (tối thiểu hóa nếu cần)"""
+        dfa = self.materialize().to_dfa()
+        return FAMinimizer.minimize_dfa(dfa) if minimize else dfa
+
+    def __repr__(self):
+        return f"ProductDFA(operands={len(self.operands)}, states={self.num_states})"
+
+
+def intersection(*automata, alphabet: Optional[Iterable[str]] = None) -> ProductDFA:
+    """Giao: chuỗi được chấp nhận bởi TẤT CẢ automata"""
+    return ProductDFA(automata, all, alphabet, required=range(len(automata)))
+
+
+def union(*automata, alphabet: Optional[Iterable[str]] = None) -> ProductDFA:
+    """Hợp: chuỗi được chấp nhận bởi ÍT NHẤT MỘT automata"""
+    return ProductDFA(automata, any, alphabet)
+
+
+def difference(first, *others, alphabet: Optional[Iterable[str]] = None) -> ProductDFA:
+    """Hiệu: chuỗi được first chấp nhận nhưng không được automata nào trong others chấp nhận"""
+    return ProductDFA((first,) + others, lambda accepted: accepted[0] and not any(accepted[1:]),
+                      alphabet, required=(0,))
+
+
+def complement(fa, alphabet: Optional[Iterable[str]] = None) -> ProductDFA:
+    """
+    Phần bù trên bảng chữ cái alphabet (mặc định: bảng chữ cái của fa)
+    Chuỗi chứa ký tự ngoài bảng chữ cái luôn bị từ chối
+    """
+    return ProductDFA((fa,), lambda accepted: not accepted[0], alphabet)
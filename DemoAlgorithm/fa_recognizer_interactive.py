@@ -3,8 +3,16 @@ FA English Recognizer - Interactive CLI
 Nhập chuỗi và xác định xem có phải tiếng Anh không (sử dụng FA)
 """
 
-from fa_english_recognizer import EnglishRecognizer, AdvancedEnglishRecognizer
+import argparse
+import csv
+import sys
+import time
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from fa_english_recognizer import EnglishRecognizer, AdvancedEnglishRecognizer, ENGLISH_DFA
 from fa_converter import FAConverter
+from fa_registry import RECOGNIZERS
+from fa_batch import HAS_NUMPY
 
 
 def print_header():
@@ -157,6 +165,85 @@ def option_check_list():
     print("\n" + "-"*80 + "\n")
 
 
+def read_lines(stream: TextIO) -> Iterator[str]:
+    """Đọc lười từng dòng (bỏ ký tự xuống dòng), không giữ cả file trong bộ nhớ"""
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+def iter_chunks(lines: Iterator[str], chunk_size: int) -> Iterator[List[str]]:
+    """Gom các dòng thành từng khối có kích thước cố định"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def classify_chunk(chunk: List[str]) -> List[bool]:
+    """Phân loại một khối chuỗi (dùng NumPy nếu có, ngược lại dùng bảng DFA đã biên dịch)"""
+    if HAS_NUMPY:
+        return EnglishRecognizer.match_batch(chunk).tolist()
+    accepts = RECOGNIZERS.get(ENGLISH_DFA).compile().accepts_string
+    return [accepts(s) for s in chunk]
+
+
+def stream_classify(source: TextIO, output: TextIO, chunk_size: int = 4096,
+                    as_csv: bool = False) -> Tuple[int, float]:
+    """
+    Phân loại luồng chuỗi (mỗi dòng một chuỗi) không tương tác
+    
+    Dòng được đọc lười và xử lý theo từng khối, kết quả ghi ra ngay sau mỗi khối
+    nên bộ nhớ sử dụng không phụ thuộc vào kích thước input
+    
+    Args:
+        source: Luồng input (stdin hoặc file)
+        output: Luồng output (stdout hoặc file)
+        chunk_size: Số dòng mỗi khối
+        as_csv: Ghi kết quả dạng CSV (text,is_english) thay vì dạng nhãn
+    
+    Returns:
+        (số dòng đã xử lý, thời gian chạy tính bằng giây)
+    """
+    RECOGNIZERS.warm_up(ENGLISH_DFA)
+    writer = csv.writer(output) if as_csv else None
+    if writer:
+        writer.writerow(["text", "is_english"])
+    
+    count = 0
+    start_time = time.perf_counter()
+    for chunk in iter_chunks(read_lines(source), chunk_size):
+        labels = classify_chunk(chunk)
+        if writer:
+            writer.writerows(zip(chunk, labels))
+        else:
+            output.writelines(f"{'ENGLISH' if label else 'NOISE'}\t{text}\n"
+                              for text, label in zip(chunk, labels))
+        count += len(chunk)
+    elapsed = time.perf_counter() - start_time
+    
+    return count, elapsed
+
+
+def run_stream_mode(input_path: Optional[str], csv_path: Optional[str], chunk_size: int):
+    """Chế độ streaming: đọc từ file/stdin, ghi ra stdout/CSV, báo cáo tốc độ ra stderr"""
+    source = open(input_path, "r", encoding="utf-8", newline="") if input_path else sys.stdin
+    output = open(csv_path, "w", encoding="utf-8", newline="") if csv_path else sys.stdout
+    try:
+        count, elapsed = stream_classify(source, output, chunk_size, as_csv=csv_path is not None)
+    finally:
+        if input_path:
+            source.close()
+        if csv_path:
+            output.close()
+    
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"✓ Đã phân loại {count} dòng trong {elapsed:.3f}s ({rate:,.0f} dòng/giây)", file=sys.stderr)
+
+
 def option_view_automata():
     """Xem chi tiết automata"""
     print("\n" + "="*80)
@@ -384,5 +471,23 @@ def main():
             print("\n❌ Lựa chọn không hợp lệ! Vui lòng chọn 1-6.\n")
 
 
+def parse_args(argv=None):
+    """Đọc tham số dòng lệnh"""
+    parser = argparse.ArgumentParser(description="Máy nhận diện tiếng Anh sử dụng Finite Automata")
+    parser.add_argument("--stream", action="store_true",
+                        help="chế độ không tương tác: phân loại từng dòng của file/stdin")
+    parser.add_argument("input", nargs="?", default=None,
+                        help="file input cho chế độ --stream (mặc định: stdin)")
+    parser.add_argument("--csv", metavar="OUTPUT", default=None,
+                        help="ghi kết quả ra file CSV thay vì stdout")
+    parser.add_argument("--chunk-size", type=int, default=4096,
+                        help="số dòng mỗi khối khi phân loại (mặc định: 4096)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.stream:
+        run_stream_mode(args.input, args.csv, args.chunk_size)
+    else:
+        main()
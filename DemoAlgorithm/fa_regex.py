@@ -0,0 +1,305 @@
+"""
+FA Regex - Biên dịch biểu thức chính quy thành automata
+Hai cách xây dựng:
+- Thompson: regex -> ε-NFA (mỗi toán tử thêm một cặp trạng thái + các ε-chuyển tiếp)
+- Glushkov (position automaton): regex -> NFA không có ε, đúng n+1 trạng thái
+  (n = số vị trí ký tự trong regex), không cần bước epsilon_nfa_to_nfa
+
+Cú pháp hỗ trợ:
+    ab      nối            a|b     hợp          ()      chuỗi rỗng / nhóm
+    a*      lặp 0+ lần     a+      lặp 1+ lần   a?      0 hoặc 1 lần
+    [a-z]   lớp ký tự      \\d \\w \\s  lớp ký tự viết tắt   \\x   ký tự x (thoát)
+    .  [^...]  cần truyền alphabet (automata không có khái niệm "mọi ký tự")
+"""
+
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from fa_models import DFA, NFA, EpsilonNFA
+from fa_converter import FAConverter, FAMinimizer
+
+# Cây cú pháp là các tuple (bất biến, băm được nên cache được):
+#   ('empty',)                  chuỗi rỗng ε
+#   ('chars', frozenset)        một ký tự thuộc tập
+#   ('cat', (con, ...))         nối
+#   ('alt', (con, ...))         hợp
+#   ('star' | 'plus' | 'opt', con)
+EMPTY = ('empty',)
+
+SPECIAL = set("()|*+?[].\\")
+SHORTHANDS = {
+    'd': frozenset("0123456789"),
+    'w': frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"),
+    's': frozenset(" \t\n\r\f\v"),
+}
+
+
+class _Parser:
+    """Phân tích cú pháp đệ quy xuống (recursive descent)"""
+
+    def __init__(self, pattern: str, alphabet: Optional[FrozenSet[str]]):
+        self.pattern = pattern
+        self.alphabet = alphabet
+        self.pos = 0
+
+    def parse(self) -> tuple:
+        node = self._alternation()
+        if self.pos < len(self.pattern):
+            raise ValueError(f"Unexpected '{self.pattern[self.pos]}' at position {self.pos} in {self.pattern!r}")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _alternation(self) -> tuple:
+        branches = [self._concatenation()]
+        while self._peek() == '|':
+            self.pos += 1
+            branches.append(self._concatenation())
+        return branches[0] if len(branches) == 1 else ('alt', tuple(branches))
+
+    def _concatenation(self) -> tuple:
+        items = []
+        while self._peek() not in (None, '|', ')'):
+            items.append(self._repetition())
+        if not items:
+            return EMPTY
+        return items[0] if len(items) == 1 else ('cat', tuple(items))
+
+    def _repetition(self) -> tuple:
+        node = self._atom()
+        while self._peek() in ('*', '+', '?'):
+            op = {'*': 'star', '+': 'plus', '?': 'opt'}[self._peek()]
+            self.pos += 1
+            if node[0] == 'star' or (node[0] in ('plus', 'opt') and op != node[0]):
+                # a** = a*, a+? = a?+ = a*
+                node = ('star', node[1])
+            elif node[0] != op:
+                node = (op, node)
+        return node
+
+    def _atom(self) -> tuple:
+        char = self._peek()
+        if char is None:
+            raise ValueError(f"Unexpected end of pattern {self.pattern!r}")
+        self.pos += 1
+
+        if char == '(':
+            node = self._alternation()
+            if self._peek() != ')':
+                raise ValueError(f"Missing ')' at position {self.pos} in {self.pattern!r}")
+            self.pos += 1
+            return node
+        if char == '[':
+            return ('chars', self._char_class())
+        if char == '.':
+            return ('chars', self._require_alphabet("'.'"))
+        if char == '\\':
+            return ('chars', self._escape())
+        if char in ('*', '+', '?', ')'):
+            raise ValueError(f"Unexpected '{char}' at position {self.pos - 1} in {self.pattern!r}")
+        return ('chars', frozenset(char))
+
+    def _escape(self) -> FrozenSet[str]:
+        char = self._peek()
+        if char is None:
+            raise ValueError(f"Dangling '\\' at end of pattern {self.pattern!r}")
+        self.pos += 1
+        return SHORTHANDS.get(char, frozenset(char))
+
+    def _char_class(self) -> FrozenSet[str]:
+        negate = self._peek() == '^'
+        if negate:
+            self.pos += 1
+
+        chars: Set[str] = set()
+        first = True
+        while True:
+            char = self._peek()
+            if char is None:
+                raise ValueError(f"Unterminated character class in {self.pattern!r}")
+            if char == ']' and not first:
+                self.pos += 1
+                break
+            first = False
+            self.pos += 1
+
+            if char == '\\':
+                chars |= self._escape()
+                continue
+            if self._peek() == '-' and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != ']':
+                end = self.pattern[self.pos + 1]
+                if end == '\\':
+                    raise ValueError(f"Escaped range end at position {self.pos + 1} in {self.pattern!r}")
+                if ord(end) < ord(char):
+                    raise ValueError(f"Invalid range '{char}-{end}' in {self.pattern!r}")
+                chars.update(chr(code) for code in range(ord(char), ord(end) + 1))
+                self.pos += 2
+            else:
+                chars.add(char)
+
+        if negate:
+            return self._require_alphabet("'[^...]'") - chars
+        return frozenset(chars)
+
+    def _require_alphabet(self, what: str) -> FrozenSet[str]:
+        if self.alphabet is None:
+            raise ValueError(f"{what} requires an explicit alphabet in {self.pattern!r}")
+        return self.alphabet
+
+
+@lru_cache(maxsize=1024)
+def _parse(pattern: str, alphabet: Optional[FrozenSet[str]]) -> tuple:
+    return _Parser(pattern, alphabet).parse()
+
+
+@lru_cache(maxsize=1024)
+def _positions(tree: tuple) -> Tuple[Tuple[FrozenSet[str], ...], bool, FrozenSet[int], FrozenSet[int],
+                                    Tuple[FrozenSet[int], ...]]:
+    """
+    Tuyến tính hóa cây cú pháp cho cấu trúc Glushkov
+    Kết quả được cache và dùng chung giữa các lần gọi nên chỉ gồm tuple / frozenset (bất biến)
+
+    Returns:
+        (chars, nullable, first, last, follow):
+        chars[p] = tập ký tự ở vị trí p (vị trí đánh số từ 1, chars[0] bỏ trống)
+        first / last = các vị trí có thể đứng đầu / cuối một chuỗi khớp
+        follow[p] = các vị trí có thể đứng ngay sau vị trí p
+    """
+    chars: List[FrozenSet[str]] = [frozenset()]
+    follow: List[Set[int]] = [set()]
+
+    def visit(node) -> Tuple[bool, Set[int], Set[int]]:
+        kind = node[0]
+        if kind == 'empty':
+            return True, set(), set()
+        if kind == 'chars':
+            chars.append(node[1])
+            follow.append(set())
+            position = len(chars) - 1
+            return False, {position}, {position}
+        if kind == 'alt':
+            nullable, first, last = False, set(), set()
+            for child in node[1]:
+                child_nullable, child_first, child_last = visit(child)
+                nullable |= child_nullable
+                first |= child_first
+                last |= child_last
+            return nullable, first, last
+        if kind == 'cat':
+            nullable, first, last = True, set(), set()
+            for child in node[1]:
+                child_nullable, child_first, child_last = visit(child)
+                for position in last:
+                    follow[position] |= child_first
+                if nullable:
+                    first |= child_first
+                last = last | child_last if child_nullable else child_last
+                nullable &= child_nullable
+            return nullable, first, last
+
+        # star / plus / opt
+        child_nullable, first, last = visit(node[1])
+        if kind != 'opt':
+            for position in last:
+                follow[position] |= first
+        return (kind != 'plus') or child_nullable, first, last
+
+    nullable, first, last = visit(tree)
+    return tuple(chars), nullable, frozenset(first), frozenset(last), tuple(frozenset(f) for f in follow)
+
+
+class RegexCompiler:
+    """Biên dịch regex thành ε-NFA (Thompson), NFA (Glushkov) hoặc DFA tối thiểu"""
+
+    @staticmethod
+    def parse(pattern: str, alphabet: Optional[Iterable[str]] = None) -> tuple:
+        """
+        Phân tích regex thành cây cú pháp (kết quả được cache theo pattern và alphabet)
+
+        Args:
+            pattern: Biểu thức chính quy
+            alphabet: Bảng chữ cái, chỉ cần khi dùng '.' hoặc '[^...]'
+        """
+        return _parse(pattern, frozenset(alphabet) if alphabet is not None else None)
+
+    @staticmethod
+    def thompson(pattern: str, alphabet: Optional[Iterable[str]] = None) -> EpsilonNFA:
+        """Xây dựng ε-NFA theo cấu trúc Thompson"""
+        tree = RegexCompiler.parse(pattern, alphabet)
+        e_nfa = EpsilonNFA()
+
+        def new_state() -> str:
+            name = f"q{len(e_nfa.states)}"
+            e_nfa.add_state(name)
+            return name
+
+        def build(node) -> Tuple[str, str]:
+            kind = node[0]
+            if kind == 'cat':
+                start, end = build(node[1][0])
+                for child in node[1][1:]:
+                    child_start, child_end = build(child)
+                    e_nfa.add_epsilon_transition(end, child_start)
+                    end = child_end
+                return start, end
+
+            start = new_state()
+            if kind == 'chars':
+                end = new_state()
+                for symbol in sorted(node[1]):
+                    e_nfa.add_transition(start, symbol, end)
+            elif kind == 'empty':
+                end = new_state()
+                e_nfa.add_epsilon_transition(start, end)
+            elif kind == 'alt':
+                branches = [build(child) for child in node[1]]
+                end = new_state()
+                for child_start, child_end in branches:
+                    e_nfa.add_epsilon_transition(start, child_start)
+                    e_nfa.add_epsilon_transition(child_end, end)
+            else:
+                child_start, child_end = build(node[1])
+                end = new_state()
+                e_nfa.add_epsilon_transition(start, child_start)
+                e_nfa.add_epsilon_transition(child_end, end)
+                if kind != 'opt':
+                    e_nfa.add_epsilon_transition(child_end, child_start)
+                if kind != 'plus':
+                    e_nfa.add_epsilon_transition(start, end)
+            return start, end
+
+        start, end = build(tree)
+        e_nfa.start_state = start
+        e_nfa.accept_states = {end}
+        if alphabet is not None:
+            e_nfa.alphabet = e_nfa.alphabet | set(alphabet)
+        return e_nfa
+
+    @staticmethod
+    def glushkov(pattern: str, alphabet: Optional[Iterable[str]] = None) -> NFA:
+        """
+        Xây dựng NFA không có ε theo cấu trúc Glushkov
+        Trạng thái q0 là trạng thái khởi đầu, q1..qn ứng với các vị trí ký tự;
+        mọi chuyển tiếp vào qp đều mang ký tự của vị trí p
+        """
+        chars, nullable, first, last, follow = _positions(RegexCompiler.parse(pattern, alphabet))
+        nfa = NFA()
+        nfa.add_state("q0", is_start=True, is_accept=nullable)
+        for position in range(1, len(chars)):
+            nfa.add_state(f"q{position}", is_accept=position in last)
+
+        for source, targets in [(0, first)] + [(p, follow[p]) for p in range(1, len(chars))]:
+            for target in sorted(targets):
+                for symbol in sorted(chars[target]):
+                    nfa.add_transition(f"q{source}", symbol, f"q{target}")
+
+        if alphabet is not None:
+            nfa.alphabet = nfa.alphabet | set(alphabet)
+        return nfa
+
+    @staticmethod
+    def to_dfa(pattern: str, alphabet: Optional[Iterable[str]] = None, minimize: bool = True) -> DFA:
+        """Regex -> NFA (Glushkov) -> DFA (xây dựng tập con), tối thiểu hóa nếu cần"""
+        dfa = FAConverter.nfa_to_dfa(RegexCompiler.glushkov(pattern, alphabet))
+        return FAMinimizer.minimize_dfa(dfa) if minimize else dfa
@@ -0,0 +1,142 @@
+"""
+FA Registry - Bộ nhớ đệm cấp module cho các automata nhận diện
+Mỗi automata chỉ được xây dựng (và tối thiểu hóa nếu là DFA) đúng một lần,
+sau đó mọi lần kiểm tra chuỗi chỉ còn là bước so khớp
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+from fa_models import FiniteAutomata, DFA
+from fa_converter import FAMinimizer
+from fa_regex import RegexCompiler
+
+
+class RecognizerRegistry:
+    """
+    Sổ đăng ký các automata nhận diện
+
+    - register(): khai báo cách xây dựng một automata (chưa xây dựng ngay)
+    - register_pattern(): khai báo automata bằng biểu thức chính quy (xem fa_regex)
+    - get(): xây dựng ở lần gọi đầu tiên, các lần sau trả về bản đã lưu
+    - warm_up(): xây dựng trước (ví dụ lúc khởi động chương trình)
+    - derived(): đối tượng dẫn xuất từ một automata (ví dụ automata tích), lưu kèm automata đó
+    - invalidate(): xóa bản đã lưu (và mọi đối tượng dẫn xuất) khi định nghĩa automata thay đổi
+
+    Lưu ý: automata trả về được dùng chung, không được sửa đổi trực tiếp
+    """
+
+    def __init__(self, max_derived: int = 64):
+        """
+        Args:
+            max_derived: Số đối tượng dẫn xuất tối đa được lưu cho mỗi automata (bỏ cái ít dùng nhất)
+        """
+        self._builders: Dict[str, Callable[[], FiniteAutomata]] = {}
+        self._minimize: Dict[str, bool] = {}
+        self._built: Dict[str, FiniteAutomata] = {}
+        self._derived: Dict[str, OrderedDict] = {}
+        self.max_derived = max_derived
+
+    def register(self, name: str, builder: Callable[[], FiniteAutomata], minimize: bool = True):
+        """
+        Đăng ký (hoặc thay thế) cách xây dựng một automata
+
+        Args:
+            name: Tên automata trong registry
+            builder: Hàm không tham số trả về automata
+            minimize: Tối thiểu hóa kết quả nếu là DFA
+        """
+        self._builders[name] = builder
+        self._minimize[name] = minimize
+        self.invalidate(name)
+
+    def register_pattern(self, name: str, pattern: str, alphabet: Optional[Iterable[str]] = None,
+                         deterministic: bool = True):
+        """
+        Đăng ký automata nhận diện một biểu thức chính quy
+
+        Args:
+            name: Tên automata trong registry
+            pattern: Biểu thức chính quy
+            alphabet: Bảng chữ cái (cần khi pattern dùng '.' hoặc '[^...]')
+            deterministic: True -> DFA tối thiểu, False -> NFA Glushkov (không xác định hóa)
+        """
+        alphabet = frozenset(alphabet) if alphabet is not None else None
+        if deterministic:
+            # Registry tự tối thiểu hóa DFA khi xây dựng
+            self.register(name, lambda: RegexCompiler.to_dfa(pattern, alphabet, minimize=False))
+        else:
+            self.register(name, lambda: RegexCompiler.glushkov(pattern, alphabet))
+
+    def get(self, name: str) -> FiniteAutomata:
+        """Lấy automata đã xây dựng (xây dựng ở lần gọi đầu tiên)"""
+        fa = self._built.get(name)
+        if fa is None:
+            fa = self._build(name)
+            self._built[name] = fa
+        return fa
+
+    def _build(self, name: str) -> FiniteAutomata:
+        if name not in self._builders:
+            raise KeyError(f"Recognizer '{name}' is not registered")
+
+        fa = self._builders[name]()
+        if isinstance(fa, DFA):
+            if self._minimize[name]:
+                fa = FAMinimizer.minimize_dfa(fa)
+            # Biên dịch luôn bảng chuyển tiếp để lần so khớp đầu tiên không phải trả chi phí
+            fa.compile()
+        return fa
+
+    def derived(self, name: str, key: Hashable, build: Callable[[FiniteAutomata], object]) -> object:
+        """
+        Đối tượng dẫn xuất từ automata name, lưu theo key (LRU, tối đa max_derived cho mỗi automata)
+        và bị xóa cùng automata khi gọi invalidate(name)
+
+        Args:
+            name: Tên automata gốc trong registry
+            key: Khóa phân biệt các đối tượng dẫn xuất của cùng một automata
+            build: Hàm nhận automata gốc, trả về đối tượng dẫn xuất
+        """
+        cache = self._derived.setdefault(name, OrderedDict())
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        value = build(self.get(name))
+        cache[key] = value
+        if len(cache) > self.max_derived:
+            cache.popitem(last=False)
+        return value
+
+    def warm_up(self, *names: str) -> List[str]:
+        """
+        Xây dựng trước các automata (mặc định: tất cả automata đã đăng ký)
+
+        Returns:
+            Danh sách tên đã được xây dựng
+        """
+        targets = names or tuple(self._builders)
+        for name in targets:
+            self.get(name)
+        return list(targets)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Xóa bản đã xây dựng và các đối tượng dẫn xuất của một automata (hoặc tất cả nếu name=None)"""
+        if name is None:
+            self._built.clear()
+            self._derived.clear()
+        else:
+            self._built.pop(name, None)
+            self._derived.pop(name, None)
+
+    def is_built(self, name: str) -> bool:
+        """Automata đã được xây dựng và lưu lại chưa"""
+        return name in self._built
+
+    def names(self) -> List[str]:
+        """Tên các automata đã đăng ký"""
+        return list(self._builders)
+
+
+# Registry dùng chung cho toàn chương trình
+RECOGNIZERS = RecognizerRegistry()
@@ -0,0 +1,98 @@
+"""Kiểm tra fa_antichain: bao hàm, phổ quát và phản ví dụ so với duyệt vét cạn"""
+
+import itertools
+
+import pytest
+
+from fa_antichain import AntichainChecker, as_compiled_nfa
+from fa_benchmark import random_epsilon_nfa, random_nfa
+from fa_converter import FAConverter
+from fa_regex import RegexCompiler
+
+
+def _words(alphabet: str, max_length: int):
+    for length in range(max_length + 1):
+        for letters in itertools.product(alphabet, repeat=length):
+            yield "".join(letters)
+
+
+def _brute_inclusion(a, b, alphabet: str, max_length: int):
+    """Chuỗi ngắn nhất (độ dài <= max_length) thuộc L(A) nhưng không thuộc L(B)"""
+    for word in _words(alphabet, max_length):
+        if a.accepts_string(word) and not b.accepts_string(word):
+            return word
+    return None
+
+
+def test_inclusion_on_regex_nfas():
+    star_a = RegexCompiler.glushkov("a*", "ab")
+    anything = RegexCompiler.thompson("(a|b)*", "ab")
+    assert AntichainChecker.is_included(star_a, anything)
+    assert AntichainChecker.inclusion_counterexample(star_a, anything) is None
+
+    counterexample = AntichainChecker.inclusion_counterexample(anything, star_a)
+    assert counterexample == "b"
+    assert not AntichainChecker.is_included(anything, star_a)
+
+    # Chuỗi rỗng là phản ví dụ khi A nhận ε còn B thì không
+    plus_a = RegexCompiler.glushkov("a+", "ab")
+    assert AntichainChecker.inclusion_counterexample(star_a, plus_a) == ""
+    assert AntichainChecker.is_included(plus_a, star_a)
+
+
+def test_inclusion_counterexamples_match_brute_force():
+    for seed in range(12):
+        a = random_nfa(6, width=2, seed=seed)
+        b = random_epsilon_nfa(6, width=2, epsilon_ratio=0.4, seed=seed + 100)
+        for left, right in ((a, b), (b, a), (a, a)):
+            counterexample = AntichainChecker.inclusion_counterexample(left, right)
+            expected = _brute_inclusion(left, right, "ab", 6)
+            if counterexample is None:
+                assert expected is None, (seed, expected)
+            else:
+                assert left.accepts_string(counterexample), (seed, counterexample)
+                assert not right.accepts_string(counterexample), (seed, counterexample)
+                assert expected is None or len(expected) <= len(counterexample)
+
+
+def test_inclusion_accepts_dfa_and_compiled_inputs():
+    nfa = RegexCompiler.glushkov("(a|b)*abb", "ab")
+    dfa = RegexCompiler.to_dfa("(a|b)*abb", "ab")
+    assert AntichainChecker.are_equivalent(nfa, dfa)
+    assert AntichainChecker.are_equivalent(nfa.compile(), FAConverter.nfa_to_dfa(nfa))
+
+    other = RegexCompiler.to_dfa("(a|b)*ab", "ab")
+    counterexample = AntichainChecker.equivalence_counterexample(nfa, other)
+    assert counterexample is not None
+    assert nfa.accepts_string(counterexample) != other.accepts_string(counterexample)
+
+    with pytest.raises(TypeError):
+        as_compiled_nfa("(a|b)*")
+
+
+def test_universality_and_shortest_counterexample():
+    assert AntichainChecker.is_universal(RegexCompiler.thompson("(a|b)*", "ab"))
+    assert AntichainChecker.is_universal(RegexCompiler.glushkov("(a*b*)*", "ab"))
+
+    ends_with_a = RegexCompiler.glushkov("(a|b)*a", "ab")
+    assert AntichainChecker.universality_counterexample(ends_with_a) == ""
+    almost = RegexCompiler.glushkov("()|(a|b)*a", "ab")
+    assert AntichainChecker.universality_counterexample(almost) == "b"
+
+    # Bảng chữ cái rộng hơn: ký tự lạ luôn bị từ chối
+    everything = RegexCompiler.glushkov("(a|b)*", "ab")
+    assert AntichainChecker.universality_counterexample(everything, "abc") == "c"
+    assert AntichainChecker.is_universal(everything, "a")
+
+
+def test_universality_matches_brute_force():
+    for seed in range(12):
+        fa = random_nfa(5, width=3, accept_ratio=0.7, seed=seed)
+        counterexample = AntichainChecker.universality_counterexample(fa, "ab")
+        expected = next((word for word in _words("ab", 7) if not fa.accepts_string(word)), None)
+        if counterexample is None:
+            assert expected is None, (seed, expected)
+        else:
+            # BFS theo độ dài: phản ví dụ là chuỗi bị từ chối ngắn nhất
+            assert not fa.accepts_string(counterexample), (seed, counterexample)
+            assert expected is None or len(counterexample) == len(expected), (seed, counterexample, expected)
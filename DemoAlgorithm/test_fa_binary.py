@@ -0,0 +1,113 @@
+"""Kiểm tra fa_binary: mã hóa / giải mã DFA đã biên dịch và nạp bằng mmap"""
+
+import pickle
+import struct
+
+import pytest
+
+import fa_binary
+
+from fa_benchmark import random_dfa, random_strings
+from fa_binary import FORMAT_VERSION, HEADER, dumps, load_compiled, loads, save_compiled
+from fa_models import CompiledDFA
+from fa_regex import RegexCompiler
+
+
+def _assert_same(loaded: CompiledDFA, compiled: CompiledDFA, strings):
+    assert loaded.state_names == compiled.state_names
+    assert loaded.classes == compiled.classes
+    assert loaded.start == compiled.start
+    assert list(loaded.table) == list(compiled.table)
+    assert bytes(loaded.accepting) == bytes(compiled.accepting)
+    for string in strings:
+        assert loaded.accepts_string(string) == compiled.accepts_string(string)
+
+
+def test_dumps_loads_round_trip():
+    strings = random_strings(200, "abc", 0, 10, seed=0)
+    for dfa in (random_dfa(50, seed=1), RegexCompiler.to_dfa("(a|b)*abb"), RegexCompiler.to_dfa("ç[à-ã]+")):
+        compiled = dfa.compile()
+        _assert_same(loads(dumps(dfa)), compiled, strings + ["çà", "çãã", "ç"])
+        _assert_same(loads(bytearray(dumps(compiled))), compiled, strings)
+
+
+def test_load_compiled_round_trip(tmp_path):
+    dfa = RegexCompiler.to_dfa("(ab|ba)*c?")
+    path = str(tmp_path / "dfa.bin")
+    save_compiled(dfa, path)
+    loaded = load_compiled(path)
+    _assert_same(loaded, dfa.compile(), ["", "ab", "abbac", "abc", "ca", "aab"])
+
+    # Pickle chép bảng ra khỏi vùng nhớ mmap
+    clone = pickle.loads(pickle.dumps(loaded))
+    assert type(clone.table) is not memoryview
+    assert clone.accepts_string("baabc")
+
+
+def test_bad_magic_is_rejected():
+    data = bytearray(dumps(RegexCompiler.to_dfa("ab")))
+    data[:4] = b"NOPE"
+    with pytest.raises(ValueError, match="bad magic"):
+        loads(data)
+    with pytest.raises(ValueError, match="too small"):
+        loads(b"FADF")
+
+
+def test_bad_version_is_rejected():
+    data = bytearray(dumps(RegexCompiler.to_dfa("ab")))
+    struct.pack_into("<H", data, 4, FORMAT_VERSION + 1)
+    with pytest.raises(ValueError, match="version"):
+        loads(data)
+    assert HEADER.size == 32
+
+
+def test_truncated_buffer_is_rejected_at_every_section():
+    data = dumps(RegexCompiler.to_dfa("(a|b)*abb"))
+    _, _, _, num_states, num_columns, _, symbols_size, names_size, _ = HEADER.unpack_from(data)
+    # Cắt ngay trong từng phần: ký hiệu, tên trạng thái, accepting, bảng chuyển tiếp
+    names_start = HEADER.size + symbols_size + (-symbols_size % 4)
+    accepting_start = names_start + names_size + (-names_size % 4)
+    cuts = [HEADER.size + 1, names_start + 1, accepting_start + 1, len(data) - 1]
+    for cut, section in zip(cuts, ["symbols", "names", "accepting", "table"]):
+        with pytest.raises(ValueError, match=f"truncated: {section} section"):
+            loads(data[:cut])
+
+
+def test_corrupted_sections_are_rejected():
+    data = bytearray(dumps(RegexCompiler.to_dfa("ab")))
+    # Hỏng JSON bảng ký hiệu
+    corrupted = bytearray(data)
+    corrupted[HEADER.size] = ord("{")
+    with pytest.raises(ValueError, match="Corrupted"):
+        loads(corrupted)
+    # num_states trong header không khớp với bảng tên
+    corrupted = bytearray(data)
+    num_states = struct.unpack_from("<I", corrupted, 8)[0]
+    struct.pack_into("<I", corrupted, 8, num_states - 1)
+    with pytest.raises(ValueError, match="Corrupted"):
+        loads(corrupted)
+
+
+def test_load_compiled_closes_mapping(tmp_path, monkeypatch):
+    path = str(tmp_path / "dfa.bin")
+    save_compiled(RegexCompiler.to_dfa("ab*"), path)
+
+    with load_compiled(path) as compiled:
+        assert compiled.accepts_string("abbb")
+        assert not compiled.closed
+    assert compiled.closed
+    compiled.close()  # gọi lại không lỗi
+
+    # File hỏng: vùng nhớ đã mở phải được đóng trước khi báo lỗi
+    with open(path, "r+b") as f:
+        f.write(b"NOPE")
+    mappings = []
+    original_mmap = fa_binary.mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        mappings.append(original_mmap(*args, **kwargs))
+        return mappings[-1]
+    monkeypatch.setattr(fa_binary.mmap, "mmap", recording_mmap)
+    with pytest.raises(ValueError, match="bad magic"):
+        load_compiled(path)
+    assert len(mappings) == 1 and mappings[0].closed
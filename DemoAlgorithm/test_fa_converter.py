@@ -0,0 +1,133 @@
+"""Kiểm tra fa_converter: chuyển đổi, tối thiểu hóa và kiểm tra tương đương"""
+
+from fa_benchmark import random_epsilon_nfa, random_nfa, random_strings
+from fa_converter import FAConverter, FAEquivalenceChecker, FAMinimizer
+from fa_models import DFA, NFA
+from fa_regex import RegexCompiler
+
+
+def _ends_with_ab(complete: bool) -> DFA:
+    """DFA nhận các chuỗi trên {a, b} bắt đầu bằng a và kết thúc bằng b"""
+    dfa = DFA()
+    dfa.add_state("s", is_start=True)
+    dfa.add_state("x")
+    dfa.add_state("y", is_accept=True)
+    dfa.add_transition("s", "a", "x")
+    dfa.add_transition("x", "a", "x")
+    dfa.add_transition("x", "b", "y")
+    dfa.add_transition("y", "a", "x")
+    dfa.add_transition("y", "b", "y")
+    if complete:
+        # Trạng thái bẫy tường minh
+        dfa.add_state("trap")
+        dfa.add_transition("s", "b", "trap")
+        dfa.add_transition("trap", "a", "trap")
+        dfa.add_transition("trap", "b", "trap")
+    return dfa
+
+
+def test_complete_and_partial_minimize_to_same_size():
+    complete = FAMinimizer.minimize_dfa(_ends_with_ab(complete=True))
+    partial = FAMinimizer.minimize_dfa(_ends_with_ab(complete=False))
+
+    assert len(complete.states) == len(partial.states) == 3
+    assert len(complete.transitions) == len(partial.transitions)
+    for word in ["ab", "aab", "abab", "", "b", "ba", "aba", "bab"]:
+        assert complete.accepts_string(word) == partial.accepts_string(word)
+
+
+def test_empty_language_minimizes_to_single_state():
+    dfa = DFA()
+    dfa.add_state("q0", is_start=True)
+    dfa.add_state("q1")
+    dfa.add_transition("q0", "a", "q1")
+    dfa.add_transition("q1", "a", "q0")
+
+    minimized = FAMinimizer.minimize_dfa(dfa)
+    assert len(minimized.states) == 1
+    assert not minimized.accepts_string("aa")
+
+
+def test_equivalent_dfas():
+    dfa = _ends_with_ab(complete=True)
+    assert FAEquivalenceChecker.are_dfa_equivalent(dfa, _ends_with_ab(complete=False))
+    assert FAEquivalenceChecker.are_dfa_equivalent(dfa, FAMinimizer.minimize_dfa(dfa))
+    assert FAEquivalenceChecker.are_dfa_equivalent(dfa, RegexCompiler.to_dfa("a(a|b)*b"))
+    assert FAEquivalenceChecker.find_distinguishing_string(dfa, RegexCompiler.to_dfa("a(a|b)*b")) is None
+
+
+def test_non_equivalent_dfas_and_shortest_counterexample():
+    dfa = _ends_with_ab(complete=False)
+    cases = [
+        ("a(a|b)*", "a"),       # khác nhau ngay ở chuỗi "a"
+        ("a(a|b)*bb", "ab"),    # "ab" thuộc L1 nhưng không thuộc L2
+        ("(a|b)*b", "b"),       # L2 nhận cả chuỗi bắt đầu bằng b
+        ("a(a|b)*b|aaa", "aaa"),
+    ]
+    for pattern, expected in cases:
+        other = RegexCompiler.to_dfa(pattern)
+        assert not FAEquivalenceChecker.are_dfa_equivalent(dfa, other)
+        word = FAEquivalenceChecker.find_distinguishing_string(dfa, other)
+        assert word == expected, pattern
+        assert dfa.accepts_string(word) != other.accepts_string(word)
+
+
+def test_counterexample_uses_symbols_outside_common_alphabet():
+    only_a = RegexCompiler.to_dfa("a*")
+    with_c = RegexCompiler.to_dfa("a*|c")
+    assert not FAEquivalenceChecker.are_dfa_equivalent(only_a, with_c)
+    assert FAEquivalenceChecker.find_distinguishing_string(only_a, with_c) == "c"
+
+
+def test_subset_construction_third_symbol_from_end():
+    # Ngôn ngữ "ký tự thứ ba từ cuối là a": NFA 4 trạng thái, DFA cần đúng 2^3 = 8 trạng thái
+    nfa = NFA()
+    nfa.add_state("p0", is_start=True)
+    nfa.add_state("p1")
+    nfa.add_state("p2")
+    nfa.add_state("p3", is_accept=True)
+    for symbol in "ab":
+        nfa.add_transition("p0", symbol, "p0")
+        nfa.add_transition("p1", symbol, "p2")
+        nfa.add_transition("p2", symbol, "p3")
+    nfa.add_transition("p0", "a", "p1")
+    compiled = FAConverter.subset_construction(nfa.compile())
+    assert compiled.num_states == 8
+
+    dfa = compiled.to_dfa()
+    assert len(dfa.states) == 8
+    assert FAEquivalenceChecker.are_dfa_equivalent(dfa, RegexCompiler.to_dfa("(a|b)*a(a|b)(a|b)"))
+    assert len(FAMinimizer.minimize_dfa(dfa).states) == 8
+    for string in ["abb", "aab", "babb", "bbb", "ab", ""]:
+        assert dfa.accepts_string(string) == nfa.accepts_string(string)
+
+
+def test_subset_construction_skips_empty_subset():
+    nfa = RegexCompiler.glushkov("ab")
+    compiled = FAConverter.subset_construction(nfa.compile())
+    assert compiled.num_states == 3  # {start}, {a}, {b} - tập rỗng là trạng thái chết của bảng
+    assert compiled.step(compiled.start, "b") == compiled.dead
+
+    empty = NFA()
+    empty.add_state("s")
+    assert FAConverter.subset_construction(empty.compile()).num_states == 0
+    assert not FAConverter.nfa_to_dfa(empty).accepts_string("")
+
+
+def test_subset_construction_matches_nfa_on_random_automata():
+    strings = random_strings(150, "ab", 0, 12, seed=5)
+    for seed in range(5):
+        nfa = random_nfa(60, seed=seed)
+        e_nfa = random_epsilon_nfa(60, seed=seed)
+        dfa = FAConverter.nfa_to_dfa(nfa)
+        e_dfa = FAConverter.epsilon_nfa_to_dfa(e_nfa)
+        for string in strings:
+            assert dfa.accepts_string(string) == nfa.accepts_string(string)
+            assert e_dfa.accepts_string(string) == e_nfa.accepts_string(string)
+
+
+def test_subset_construction_scales_linearly_on_layered_nfas():
+    # NFA dạng tầng rộng 3: mỗi tập con nằm trong một tầng, tối đa 2^3 - 1 tập khác rỗng mỗi tầng
+    for size in (30, 300, 3000):
+        compiled = FAConverter.subset_construction(random_nfa(size).compile())
+        assert compiled.num_states <= 7 * (size // 3)
@@ -0,0 +1,60 @@
+"""Kiểm tra fa_dawg: thành viên, tiền tố và tính tối thiểu của DAWG"""
+
+import random
+
+import pytest
+
+from fa_converter import FAMinimizer
+from fa_dawg import DAWG
+
+WORDS = ["car", "card", "cards", "care", "cared", "cares", "cat", "cats", "do", "dog", "dogs", "dot", "dots"]
+
+
+def test_membership():
+    dawg = DAWG(WORDS)
+    assert len(dawg) == len(WORDS)
+    for word in WORDS:
+        assert word in dawg
+    for word in ["", "ca", "cart", "dogss", "x", "cards "]:
+        assert word not in dawg
+
+
+def test_prefixes_and_completions():
+    dawg = DAWG.from_words(reversed(WORDS))
+    assert dawg.has_prefix("") and dawg.has_prefix("car") and dawg.has_prefix("do")
+    assert not dawg.has_prefix("cb") and not dawg.has_prefix("dogsx")
+    assert list(dawg.completions("car")) == ["car", "card", "cards", "care", "cared", "cares"]
+    assert list(dawg.completions("do", limit=2)) == ["do", "dog"]
+    assert list(dawg.completions("z")) == []
+    assert list(dawg.completions("")) == sorted(WORDS)
+
+
+def test_dawg_is_minimal():
+    # Đã tối thiểu: Hopcroft không gộp thêm được trạng thái nào
+    dawg = DAWG(WORDS)
+    dfa = dawg.to_dfa()
+    assert len(FAMinimizer.minimize_dfa(dfa).states) == dawg.num_states
+
+    rng = random.Random(0)
+    for _ in range(20):
+        words = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 6))) for _ in range(40)}
+        dawg = DAWG.from_words(words)
+        assert len(FAMinimizer.minimize_dfa(dawg.to_dfa()).states) == dawg.num_states
+        compiled = dawg.compile()
+        for word in words:
+            assert word in dawg and compiled.accepts_string(word)
+        assert list(dawg.completions("")) == sorted(words)
+
+
+def test_unsorted_input_is_rejected():
+    with pytest.raises(ValueError, match="sorted order"):
+        DAWG(["b", "a"])
+    assert len(DAWG(["a", "a", "b"])) == 2  # từ trùng liên tiếp bị bỏ qua
+
+
+def test_load_words_file(tmp_path):
+    path = tmp_path / "words.json"
+    path.write_text('["Hello", "help", "HELD"]', encoding="utf-8")
+    dawg = DAWG.load(str(path))
+    assert list(dawg.completions("hel")) == ["held", "hello", "help"]
+    assert "Hello" not in dawg
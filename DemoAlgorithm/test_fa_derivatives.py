@@ -0,0 +1,26 @@
+"""Kiểm tra fa_derivatives: đạo hàm Brzozowski so với re.fullmatch"""
+
+import itertools
+import re
+
+from fa_derivatives import DerivativeMatcher
+
+
+def test_matches_re_fullmatch():
+    for pattern in ["(a|b)*abb", "a?b+c*", "(ab|a)(bc|c)?", "()", "[a-c]+b"]:
+        matcher = DerivativeMatcher(pattern)
+        for length in range(6):
+            for letters in itertools.product("abc", repeat=length):
+                word = "".join(letters)
+                assert matcher.accepts_string(word) == bool(re.fullmatch(pattern, word)), (pattern, word)
+
+
+def test_long_chain_of_nullable_operands_does_not_recurse():
+    matcher = DerivativeMatcher("a?" * 600)
+    assert matcher.accepts_string("a" * 600)
+    assert matcher.accepts_string("a" * 300)
+    assert not matcher.accepts_string("a" * 601)
+
+    grouped = DerivativeMatcher("(" + "a?" * 600 + ")b")
+    assert grouped.accepts_string("a" * 600 + "b")
+    assert not grouped.accepts_string("a" * 600)
@@ -0,0 +1,86 @@
+"""Kiểm tra fa_instrument: bật / tắt không làm hỏng các lớp automata"""
+
+import pytest
+
+import fa_instrument
+from fa_benchmark import random_dfa, random_epsilon_nfa, random_nfa, random_strings
+from fa_converter import FAConverter
+from fa_instrument import SET_ALLOCATING, TIMED_PHASES, instrument
+from fa_models import CompiledDFA, DFA, EpsilonNFA
+from fa_regex import RegexCompiler
+
+
+def test_instrument_enter_exit_restores_methods():
+    hooks = [(owner, name) for owner, name, _ in TIMED_PHASES] + list(SET_ALLOCATING)
+    originals = {(owner, name): owner.__dict__.get(name) for owner, name in hooks}
+
+    e_nfa = RegexCompiler.thompson("(a|b)*abb")
+    with instrument() as stats:
+        assert e_nfa.accepts_string("aabb")
+        e_nfa.get_transitions("q0", "a")
+    assert stats.counters['nfa.strings'] == 1
+
+    for (owner, name), original in originals.items():
+        assert owner.__dict__.get(name) is original
+    assert e_nfa.accepts_string("abb")
+
+
+def test_instrument_can_be_reentered():
+    with instrument():
+        pass
+    with instrument():
+        pass
+
+
+def test_missing_hook_is_skipped_and_reported(monkeypatch):
+    monkeypatch.setattr(fa_instrument, 'SET_ALLOCATING',
+                        SET_ALLOCATING + [(EpsilonNFA, 'no_such_method'), (DFA, 'alphabet_partition')])
+    with instrument() as stats:
+        pass
+    assert stats.skipped == ['EpsilonNFA.no_such_method', 'DFA.alphabet_partition']
+    assert 'alphabet_partition' not in DFA.__dict__
+
+
+def test_failed_enable_restores_wrapped_methods(monkeypatch):
+    # Các móc này đã được thay trước khi lỗi xảy ra ở _instrumented_nfa_accepts
+    hooks = [(CompiledDFA, 'accepts_string'), (CompiledDFA, 'from_dfa'), (FAConverter, 'subset_construction')]
+    originals = {hook: hook[0].__dict__[hook[1]] for hook in hooks}
+
+    def broken(stats):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(fa_instrument, '_instrumented_nfa_accepts', broken)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        instrument().enable()
+    for (owner, name), original in originals.items():
+        assert owner.__dict__[name] is original
+    assert fa_instrument._active is None
+
+
+def test_instrumented_accepts_matches_plain():
+    # Thêm vài chuỗi chứa 'c' (không thuộc alphabet) để thử nhánh ký tự lạ
+    strings = random_strings(300, "ab", 0, 12, seed=1) + random_strings(50, "abc", 0, 6, seed=2)
+    compiled = []
+    for seed in range(5):
+        compiled.append(random_dfa(20, seed=seed).compile())
+        compiled.append(random_nfa(20, seed=seed).compile())
+        compiled.append(random_epsilon_nfa(20, seed=seed).compile())
+
+    plain = [[fa.accepts_string(s) for s in strings] for fa in compiled]
+    with instrument() as stats:
+        instrumented = [[fa.accepts_string(s) for s in strings] for fa in compiled]
+    assert instrumented == plain
+    assert stats.counters['dfa.strings'] == stats.counters['nfa.strings'] // 2 == 5 * len(strings)
+
+
+def test_compile_phases_count_only_cache_misses():
+    e_nfa = RegexCompiler.thompson("(a|b)*abb")
+    dfa = RegexCompiler.to_dfa("(a|b)*abb")
+    with instrument() as stats:
+        for string in ("abb", "aabb", "ba", ""):
+            e_nfa.accepts_string(string)
+            dfa.accepts_string(string)
+        e_nfa.epsilon_closure({"q0"})
+    assert stats.calls['compile.nfa'] == 1
+    assert stats.calls['compile.dfa'] == 1
+    assert stats.calls['epsilon_closure_table'] == 1
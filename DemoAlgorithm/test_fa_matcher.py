@@ -0,0 +1,35 @@
+"""Kiểm tra fa_matcher: giao diện trừu tượng và snapshot / restore"""
+
+import pytest
+
+from fa_matcher import DFAMatcher, Matcher, NFAMatcher
+from fa_regex import RegexCompiler
+
+
+def test_matcher_is_abstract():
+    with pytest.raises(TypeError):
+        Matcher()
+
+    class Partial(Matcher):
+        def reset(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.parametrize("automata", [RegexCompiler.to_dfa("(ab)*c"), RegexCompiler.glushkov("(ab)*c"),
+                                       RegexCompiler.thompson("(ab)*c")])
+def test_snapshot_restore(automata):
+    matcher = automata.matcher()
+    assert isinstance(matcher, (DFAMatcher, NFAMatcher))
+    matcher.feed("ab")
+    saved = matcher.snapshot()
+    matcher.feed("abc")
+    assert matcher.is_accepting()
+    matcher.feed("x")
+    assert matcher.is_dead()
+    matcher.restore(saved)
+    assert not matcher.is_dead() and matcher.consumed == 2
+    matcher.feed("c")
+    assert matcher.is_accepting()
@@ -0,0 +1,341 @@
+"""Kiểm tra fa_models: API theo tên (ghi xuyên) và các dạng biên dịch"""
+
+import copy
+import pickle
+
+import pytest
+
+from fa_benchmark import random_epsilon_nfa, random_nfa, random_strings
+from fa_converter import FAConverter, FAMinimizer
+from fa_english_recognizer import EnglishRecognizer
+from fa_models import DFA, NFA, EpsilonNFA, FiniteAutomata, State
+
+
+def _ab_dfa() -> DFA:
+    """DFA nhận các chuỗi trên {a, b} kết thúc bằng a"""
+    dfa = DFA()
+    dfa.add_state("q0", is_start=True)
+    dfa.add_state("q1", is_accept=True)
+    for state in ("q0", "q1"):
+        dfa.add_transition(state, "a", "q1")
+        dfa.add_transition(state, "b", "q0")
+    return dfa
+
+
+def test_accept_states_write_through():
+    dfa = _ab_dfa()
+    assert dfa.accepts_string("ba")
+    dfa.accept_states.add("q0")
+    assert dfa.accepts_string("ab")
+    dfa.accept_states.discard("q1")
+    assert not dfa.accepts_string("ba")
+    assert dfa.accept_states == {"q0"}
+    assert dfa.accept_states.copy() == {"q0"}
+    assert {"q0", "q1"} & dfa.accept_states == {"q0"}
+    assert dfa.states["q1"].is_accept is False
+
+
+def test_state_flags_write_through():
+    dfa = _ab_dfa()
+    dfa.states["q0"].is_accept = True
+    assert dfa.accepts_string("b")
+    assert "q0" in dfa.accept_states
+    dfa.states["q1"].is_start = True
+    assert dfa.start_state == "q1"
+
+    dfa.states["q2"] = State("q2", is_accept=True)
+    assert "q2" in dfa.accept_states
+    del dfa.states["q2"]
+    assert "q2" not in dfa.states and "q2" not in dfa.accept_states
+
+
+def test_transitions_write_through():
+    dfa = _ab_dfa()
+    assert dfa.transitions["q0"]["a"] == {"q1"}
+    assert dict(dfa.transitions["q0"]) == {"a": {"q1"}, "b": {"q0"}}
+
+    dfa.transitions["q0"]["a"] = {"q0"}
+    assert not dfa.accepts_string("a")
+    del dfa.transitions["q1"]["b"]
+    assert not dfa.accepts_string("ab")
+
+    nfa = NFA()
+    nfa.add_state("s", is_start=True)
+    nfa.add_state("t", is_accept=True)
+    nfa.add_transition("s", "a", "s")
+    nfa.transitions["s"]["a"].add("t")
+    assert nfa.accepts_string("aa")
+    nfa.transitions["s"]["a"].discard("t")
+    assert not nfa.accepts_string("aa")
+    nfa.transitions["s"] = {"b": ["t"]}
+    assert nfa.accepts_string("b") and not nfa.accepts_string("a")
+    del nfa.transitions["s"]
+    assert "s" not in nfa.transitions and not nfa.accepts_string("b")
+
+
+def test_epsilon_transitions_write_through():
+    e_nfa = EpsilonNFA()
+    e_nfa.add_state("s", is_start=True)
+    e_nfa.add_state("t", is_accept=True)
+    assert not e_nfa.accepts_string("")
+    e_nfa.add_epsilon_transition("s", "s")
+    e_nfa.epsilon_transitions["s"].add("t")
+    assert e_nfa.accepts_string("")
+    e_nfa.epsilon_transitions["s"].discard("t")
+    assert not e_nfa.accepts_string("")
+    e_nfa.epsilon_transitions["s"] = {"t"}
+    assert e_nfa.accepts_string("")
+    del e_nfa.epsilon_transitions["s"]
+    assert not e_nfa.accepts_string("")
+
+
+def test_alphabet_mutation_invalidates_compiled_form():
+    dfa = _ab_dfa()
+    assert dfa.accepts_string("ba")
+    dfa.alphabet.discard("b")
+    assert not dfa.accepts_string("ba")
+    dfa.alphabet.add("b")
+    assert dfa.accepts_string("ba")
+    dfa.alphabet -= {"b"}
+    assert not dfa.accepts_string("ba")
+
+    # Gán set mới: được chép vào alphabet riêng của automata
+    symbols = {"a", "b"}
+    dfa.alphabet = symbols
+    assert dfa.accepts_string("ba")
+    symbols.discard("b")
+    assert dfa.accepts_string("ba")
+
+
+def test_alphabet_survives_copy_and_pickle():
+    dfa = _ab_dfa()
+    for clone in (dfa.copy(), copy.deepcopy(dfa), pickle.loads(pickle.dumps(dfa))):
+        assert clone.accepts_string("ba")
+        clone.alphabet.discard("b")
+        assert not clone.accepts_string("ba")
+    assert dfa.accepts_string("ba")
+
+
+# ==================== MÔ PHỎNG THAM CHIẾU (tập hợp tên, không biên dịch) ====================
+
+def _reference_closure(fa, states):
+    """Epsilon-closure bằng DFS trên khung nhìn epsilon_transitions"""
+    closure = set(states)
+    stack = list(states)
+    epsilon = getattr(fa, 'epsilon_transitions', {})
+    while stack:
+        for target in epsilon.get(stack.pop(), ()):
+            if target not in closure:
+                closure.add(target)
+                stack.append(target)
+    return closure
+
+
+def _reference_accepts(fa, string):
+    current = _reference_closure(fa, {fa.start_state} if fa.start_state is not None else set())
+    for symbol in string:
+        if symbol not in fa.alphabet:
+            return False
+        current = _reference_closure(fa, {target for state in current
+                                          for target in fa.transitions.get(state, {}).get(symbol, ())})
+    return bool(current & fa.accept_states)
+
+
+def test_bitset_simulation_matches_reference():
+    strings = random_strings(200, "ab", 0, 10, seed=3) + ["c", "ac", "bca"]
+    for seed in range(6):
+        for fa in (random_nfa(15, seed=seed), random_epsilon_nfa(15, epsilon_ratio=0.6, seed=seed)):
+            compiled = fa.compile()
+            for string in strings:
+                assert compiled.accepts_string(string) == _reference_accepts(fa, string), (seed, string)
+
+
+def test_compiled_nfa_masks():
+    nfa = NFA()
+    nfa.add_state("s", is_start=True)
+    nfa.add_state("t", is_accept=True)
+    nfa.add_transition("s", "a", "s")
+    nfa.add_transition("s", "a", "t")
+    compiled = nfa.compile()
+    mask = compiled.step(compiled.start_mask, "a")
+    assert compiled.names_of(mask) == {"s", "t"}
+    assert compiled.step(mask, "b") == 0
+    assert nfa.compile() is compiled
+
+    nfa.add_transition("t", "b", "t")
+    assert nfa.compile() is not compiled
+    assert nfa.accepts_string("ab")
+
+
+def test_epsilon_transition_invalidates_compiled_nfa():
+    e_nfa = EpsilonNFA()
+    e_nfa.add_state("s", is_start=True)
+    e_nfa.add_state("t")
+    e_nfa.add_state("u", is_accept=True)
+    e_nfa.add_transition("t", "a", "u")
+    assert not e_nfa.accepts_string("a")
+    e_nfa.add_epsilon_transition("s", "t")
+    assert e_nfa.accepts_string("a")
+    assert e_nfa.compile().names_of(e_nfa.compile().start_mask) == {"s", "t"}
+
+
+def test_epsilon_closure_table_on_cycles():
+    e_nfa = EpsilonNFA()
+    for name in "abcdef":
+        e_nfa.add_state(name, is_start=(name == "a"))
+    # Chu trình a -> b -> c -> a, c -> d, d -> d (khuyên), e -> d; f cô lập
+    for source, target in [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "d"), ("e", "d")]:
+        e_nfa.add_epsilon_transition(source, target)
+
+    state_names, state_ids, closures = e_nfa.epsilon_closure_table()
+    expected = {"a": "abcd", "b": "abcd", "c": "abcd", "d": "d", "e": "de", "f": "f"}
+    for name, members in expected.items():
+        mask = closures[state_ids[name]]
+        assert {state_names[i] for i in range(len(state_names)) if mask >> i & 1} == set(members)
+
+    assert e_nfa.epsilon_closure({"e", "f"}) == {"d", "e", "f"}
+    assert e_nfa.epsilon_closure({"unknown"}) == {"unknown"}
+    assert e_nfa.epsilon_closure_table() is e_nfa.epsilon_closure_table()
+
+    e_nfa.add_epsilon_transition("d", "f")
+    assert e_nfa.epsilon_closure({"a"}) == set("abcdf")
+
+
+def test_epsilon_closure_table_matches_dfs():
+    for seed in range(8):
+        e_nfa = random_epsilon_nfa(30, width=5, epsilon_ratio=0.9, seed=seed)
+        for source in ("s0", "s7", "s12"):  # thêm các cạnh ε về trước để tạo chu trình
+            e_nfa.add_epsilon_transition(source, "s2")
+        for name in e_nfa.states:
+            assert e_nfa.epsilon_closure({name}) == _reference_closure(e_nfa, {name})
+
+
+def test_epsilon_nfa_to_nfa_keeps_paths_starting_with_epsilon():
+    e_nfa = EpsilonNFA()
+    e_nfa.add_state("s", is_start=True)
+    e_nfa.add_state("t")
+    e_nfa.add_state("u", is_accept=True)
+    e_nfa.add_epsilon_transition("s", "t")
+    e_nfa.add_transition("t", "a", "u")
+    nfa = FAConverter.epsilon_nfa_to_nfa(e_nfa)
+    for string in ["", "a", "aa", "b"]:
+        assert nfa.accepts_string(string) == e_nfa.accepts_string(string) == _reference_accepts(e_nfa, string)
+
+
+def test_epsilon_closure_table_long_chain_does_not_recurse():
+    e_nfa = EpsilonNFA()
+    e_nfa.add_state("q0", is_start=True)
+    for i in range(3000):
+        e_nfa.add_epsilon_transition(f"q{i}", f"q{i + 1}")
+    e_nfa.add_epsilon_transition("q3000", "q0")
+    assert len(e_nfa.epsilon_closure({"q1500"})) == 3001
+
+
+def test_alphabet_partition_groups_equivalent_symbols():
+    nfa = NFA()
+    nfa.add_state("s", is_start=True)
+    nfa.add_state("t", is_accept=True)
+    for symbol in "abc":
+        nfa.add_transition("s", symbol, "t")
+    nfa.add_transition("t", "c", "t")
+    nfa.alphabet.add("z")  # không có chuyển tiếp nào: lớp riêng
+
+    partition = nfa.alphabet_partition()
+    assert sorted(partition.classes) == [("a", "b"), ("c",), ("z",)]
+    assert partition.class_of["a"] == partition.class_of["b"] != partition.class_of["c"]
+    assert nfa.alphabet_partition() is partition
+
+    compiled = nfa.compile()
+    assert compiled.num_columns == 3
+    assert compiled.symbol_index["a"] == compiled.symbol_index["b"]
+    assert nfa.accepts_string("bc") and not nfa.accepts_string("cb") and not nfa.accepts_string("z")
+
+    nfa.add_transition("t", "a", "t")  # a tách khỏi b, nay tương đương với c
+    assert sorted(nfa.alphabet_partition().classes) == [("a", "c"), ("b",), ("z",)]
+
+
+def test_english_epsilon_nfa_has_two_symbol_classes():
+    e_nfa = EnglishRecognizer.create_english_epsilon_nfa()
+    partition = e_nfa.alphabet_partition()
+    assert len(partition.class_of) == 53
+    assert partition.num_classes == 2
+    assert e_nfa.compile().num_columns == 2
+
+
+def test_compressed_dfa_matches_reference():
+    strings = random_strings(200, "abc", 0, 8, seed=4)
+    for seed in range(4):
+        nfa = random_nfa(12, alphabet="abc", seed=seed)
+        dfa = FAConverter.nfa_to_dfa(nfa)
+        minimized = FAMinimizer.minimize_dfa(dfa)
+        for string in strings:
+            expected = _reference_accepts(nfa, string)
+            assert dfa.accepts_string(string) == minimized.accepts_string(string) == expected
+
+
+# ==================== TUẦN TỰ HÓA (to_dict / from_dict, cả hai dạng) ====================
+
+def _epsilon_nfa_with_implicit_state() -> EpsilonNFA:
+    """ε-NFA có chuyển tiếp epsilon và trạng thái "ngầm" (chỉ xuất hiện trong chuyển tiếp)"""
+    e_nfa = EpsilonNFA()
+    e_nfa.add_state("s", is_start=True)
+    e_nfa.add_state("t")
+    e_nfa.add_state("u", is_accept=True)
+    e_nfa.add_epsilon_transition("s", "t")
+    e_nfa.add_epsilon_transition("t", "s")
+    e_nfa.add_transition("t", "a", "u")
+    e_nfa.add_transition("u", "b", "hidden")  # "hidden" chưa được khai báo bằng add_state
+    e_nfa.add_epsilon_transition("hidden", "u")
+    e_nfa.alphabet.add("c")  # ký tự không có chuyển tiếp nào
+    return e_nfa
+
+
+def test_from_dict_round_trip_both_layouts():
+    strings = random_strings(100, "abc", 0, 6, seed=5)
+    automata = [_ab_dfa(), random_nfa(12, seed=1), random_epsilon_nfa(12, epsilon_ratio=0.5, seed=2),
+                _epsilon_nfa_with_implicit_state()]
+    for fa in automata:
+        for compact in (False, True):
+            data = fa.to_dict(compact=compact)
+            for loaded in (type(fa).from_dict(data), FiniteAutomata.from_dict(data)):
+                assert type(loaded) is type(fa)
+                assert loaded.to_dict() == fa.to_dict()
+                assert loaded.to_dict(compact=True) == fa.to_dict(compact=True)
+                for string in strings:
+                    assert loaded.accepts_string(string) == fa.accepts_string(string), (compact, string)
+
+
+def test_from_dict_keeps_epsilon_and_implicit_states():
+    e_nfa = _epsilon_nfa_with_implicit_state()
+    for compact in (False, True):
+        loaded = EpsilonNFA.from_dict(e_nfa.to_dict(compact=compact))
+        assert "hidden" not in loaded.states
+        assert loaded.epsilon_closure({"s"}) == {"s", "t"}
+        assert loaded.epsilon_closure({"hidden"}) == {"hidden", "u"}
+        assert loaded.alphabet == {"a", "b", "c"}
+        assert loaded.accepts_string("a") and loaded.accepts_string("ab") and loaded.accepts_string("abb")
+        assert not loaded.accepts_string("") and not loaded.accepts_string("ac")
+        # Khai báo sau khi nạp: trạng thái ngầm trở thành trạng thái thật
+        loaded.add_state("hidden")
+        assert "hidden" in loaded.states
+
+
+def test_save_and_load(tmp_path):
+    e_nfa = _epsilon_nfa_with_implicit_state()
+    for compact in (False, True):
+        path = str(tmp_path / f"fa_{compact}.json")
+        e_nfa.save(path, compact=compact)
+        loaded = FiniteAutomata.load(path)
+        assert isinstance(loaded, EpsilonNFA)
+        assert loaded.to_dict() == e_nfa.to_dict()
+
+
+def test_from_dict_rejects_bad_data():
+    with pytest.raises(ValueError, match="Unknown automaton type"):
+        FiniteAutomata.from_dict({'type': 'PDA'})
+    with pytest.raises(ValueError, match="Cannot load"):
+        DFA.from_dict(NFA().to_dict())
+    data = random_nfa(5, seed=0).to_dict(compact=True)
+    data['to'] = data['to'][:-1]
+    with pytest.raises(ValueError, match="same length"):
+        NFA.from_dict(data)
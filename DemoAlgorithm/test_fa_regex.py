@@ -0,0 +1,90 @@
+"""Kiểm tra fa_regex: Thompson, Glushkov và to_dfa so với re.fullmatch"""
+
+import itertools
+import random
+import re
+
+import pytest
+
+from fa_regex import RegexCompiler, _positions
+
+PATTERNS = [
+    "a", "ab", "a|b", "a*", "a+", "a?", "()", "(a|b)*abb", "(ab|ba)*", "a(b|c)*c?",
+    "[a-c]+b", "[^a]*", "(a|())b", "((a|b)c)+", "a.c", "(a*b*)*c", "\\*a",
+]
+OPERATORS = {"star": "*", "plus": "+", "opt": "?"}
+
+
+def _words(alphabet: str, max_length: int):
+    for length in range(max_length + 1):
+        for letters in itertools.product(alphabet, repeat=length):
+            yield "".join(letters)
+
+
+def _random_pattern(rng: random.Random, depth: int = 3) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(["a", "b", "c", "[ab]", "()"])
+    kind = rng.choice(["cat", "alt", "star", "plus", "opt"])
+    if kind == "cat":
+        return _random_pattern(rng, depth - 1) + _random_pattern(rng, depth - 1)
+    if kind == "alt":
+        return f"({_random_pattern(rng, depth - 1)}|{_random_pattern(rng, depth - 1)})"
+    return f"({_random_pattern(rng, depth - 1)}){OPERATORS[kind]}"
+
+
+def _check(pattern: str, alphabet: str = "abc", max_length: int = 5):
+    automata = [RegexCompiler.thompson(pattern, alphabet), RegexCompiler.glushkov(pattern, alphabet),
+                RegexCompiler.to_dfa(pattern, alphabet), RegexCompiler.to_dfa(pattern, alphabet, minimize=False)]
+    for word in _words(alphabet, max_length):
+        expected = re.fullmatch(pattern, word) is not None
+        for fa in automata:
+            assert fa.accepts_string(word) == expected, (pattern, type(fa).__name__, word)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_constructions_match_re_fullmatch(pattern):
+    _check(pattern)
+
+
+def test_random_patterns_match_re_fullmatch():
+    rng = random.Random(0)
+    for _ in range(60):
+        _check(_random_pattern(rng), max_length=4)
+
+
+def test_glushkov_has_one_state_per_position():
+    nfa = RegexCompiler.glushkov("(a|b)*a[bc]")
+    assert len(nfa.states) == 5  # q0 + 4 vị trí ký tự
+    assert not hasattr(nfa, "epsilon_transitions")
+
+
+def test_shorthands_and_escapes():
+    dfa = RegexCompiler.to_dfa("\\d+\\.\\d*")
+    assert dfa.accepts_string("3.14") and dfa.accepts_string("10.")
+    assert not dfa.accepts_string(".5") and not dfa.accepts_string("3,14")
+
+
+@pytest.mark.parametrize("pattern", ["(a", "a)", "*a", "[ab", "a\\", "[z-a]", "a|*"])
+def test_syntax_errors(pattern):
+    with pytest.raises(ValueError):
+        RegexCompiler.parse(pattern)
+
+
+def test_dot_and_negated_class_require_alphabet():
+    with pytest.raises(ValueError, match="alphabet"):
+        RegexCompiler.parse("a.")
+    with pytest.raises(ValueError, match="alphabet"):
+        RegexCompiler.parse("[^a]")
+
+
+def test_cached_positions_are_immutable():
+    tree = RegexCompiler.parse("(a|b)*abb")
+    chars, nullable, first, last, follow = _positions(tree)
+    assert _positions(tree)[0] is chars
+    assert isinstance(chars, tuple) and isinstance(follow, tuple)
+    assert all(isinstance(positions, frozenset) for positions in (first, last, *follow))
+
+    # Hai lần dựng Glushkov từ cùng kết quả cache cho cùng NFA
+    first_nfa = RegexCompiler.glushkov("(a|b)*abb")
+    second_nfa = RegexCompiler.glushkov("(a|b)*abb")
+    assert first_nfa.to_dict() == second_nfa.to_dict()
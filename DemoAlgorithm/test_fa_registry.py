@@ -0,0 +1,69 @@
+"""Kiểm tra fa_registry: đối tượng dẫn xuất được lưu có giới hạn và bị xóa cùng automata gốc"""
+
+import pytest
+
+import fa_english_recognizer
+
+from fa_english_recognizer import ENGLISH_DFA, EnglishRecognizer
+from fa_regex import RegexCompiler
+from fa_registry import RECOGNIZERS, RecognizerRegistry
+
+
+def test_derived_is_cached_and_bounded():
+    registry = RecognizerRegistry(max_derived=2)
+    registry.register_pattern("ab", "(a|b)*")
+    built = []
+
+    def build(key):
+        def builder(dfa):
+            built.append(key)
+            return (key, dfa)
+        return builder
+
+    assert registry.derived("ab", 1, build(1)) is registry.derived("ab", 1, build(1))
+    registry.derived("ab", 2, build(2))
+    registry.derived("ab", 3, build(3))  # bỏ khóa 1 (ít dùng nhất)
+    registry.derived("ab", 1, build(1))
+    assert built == [1, 2, 3, 1]
+
+
+def test_invalidate_drops_derived_products():
+    products = [EnglishRecognizer.create_english_without_letters("e")]
+    assert products[0] is EnglishRecognizer.create_english_without_letters("E")
+    assert not EnglishRecognizer.is_english_without_letters("hello", "e")
+
+    original = RECOGNIZERS._builders[ENGLISH_DFA]
+    try:
+        # Định nghĩa lại ENGLISH_DFA: chỉ nhận chuỗi "hello"
+        RECOGNIZERS.register(ENGLISH_DFA, lambda: RegexCompiler.to_dfa("hello"))
+        assert EnglishRecognizer.is_english_without_letters("hello", "z")
+        assert not EnglishRecognizer.is_english_without_letters("help", "z")
+        assert EnglishRecognizer.create_english_without_letters("e") is not products[0]
+    finally:
+        RECOGNIZERS.register(ENGLISH_DFA, original)
+    assert EnglishRecognizer.is_english_without_letters("world", "e")
+
+
+def test_batch_matcher_is_cached_with_compiled_dfa(monkeypatch):
+    pytest.importorskip("numpy")
+    matchers = []
+    original_matcher = fa_english_recognizer.BatchMatcher
+
+    def recording_matcher(compiled):
+        matchers.append(original_matcher(compiled))
+        return matchers[-1]
+    monkeypatch.setattr(fa_english_recognizer, "BatchMatcher", recording_matcher)
+
+    original = RECOGNIZERS._builders[ENGLISH_DFA]
+    try:
+        RECOGNIZERS.register(ENGLISH_DFA, lambda: RegexCompiler.to_dfa("hello|world"))
+        assert EnglishRecognizer.match_batch(["hello", "help"]).tolist() == [True, False]
+        assert EnglishRecognizer.match_batch(["world"]).tolist() == [True]
+        assert len(matchers) == 1
+
+        # Sửa DFA tại chỗ: bản biên dịch mới -> dựng lại BatchMatcher
+        RECOGNIZERS.get(ENGLISH_DFA).accept_states.clear()
+        assert EnglishRecognizer.match_batch(["hello"]).tolist() == [False]
+        assert len(matchers) == 2
+    finally:
+        RECOGNIZERS.register(ENGLISH_DFA, original)
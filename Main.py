@@ -8,6 +8,7 @@ from Codes.Scenes.MainGameplayScene import MainGamePlayScene
 from Codes.Scenes.PauseMenuScene import PauseMenuScene
 from Codes.Scenes.UILayerScene import UILayerScene
 from Codes.Mechanics.Score import Score
+from Codes.Mechanics.KeywordMatcher.KeywordMatcher import KeywordMatcher
 from Codes.Components.Audio import Audio
 
 class Game:
@@ -28,6 +29,8 @@ class Game:
         self.render_surface = pygame.Surface(self.base_size)
         self.score = None
         self.audio = Audio()
+        # Automata keyword được xây một lần, dùng chung cho mọi lần phân tích chatbox
+        self.keyword_matcher = KeywordMatcher.from_file("Data/keywords.json")
 
         pygame.init()
         self.screen = pygame.display.set_mode(self.window_size, pygame.RESIZABLE, 32)